@@ -1,6 +1,26 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_migrate
+
+
+def install_search_triggers(sender, using, **kwargs):
+    from django.db import connections
+    from Softdesk.search import ensure_search_triggers
+
+    ensure_search_triggers(connections[using])
 
 
 class SoftdeskConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'Softdesk'
+
+    def ready(self):
+        from Softdesk import signals  # noqa: F401
+        from Softdesk.db import configure_sqlite_connection
+        from Softdesk.instrumentation import install_query_recorder
+
+        connection_created.connect(configure_sqlite_connection)
+        connection_created.connect(install_query_recorder)
+
+        # Table rebuilds done by SQLite migrations drop the search triggers
+        post_migrate.connect(install_search_triggers, sender=self)
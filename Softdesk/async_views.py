@@ -0,0 +1,55 @@
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+
+from Softdesk.views import CommentViewSet, IssueViewSet, ProjectViewSet
+
+
+def _serve(view, request, args, kwargs):
+    """Run a DRF read view to completion, rendering included, on the calling worker thread."""
+    # Worker threads keep their database connection between requests, as if CONN_MAX_AGE applied
+    close_old_connections()
+    try:
+        response = view(request, *args, **kwargs)
+        if callable(getattr(response, "render", None)):
+            response.render()
+        return response
+    finally:
+        close_old_connections()
+
+
+def async_read_view(viewset_class, actions):
+    """
+    Return an async view serving the read actions of a viewset under ASGI.
+
+    Django 3.2 has no asynchronous ORM, and under ASGI its sync views all run on a single thread
+    (thread_sensitive=True), so concurrent reads are served one at a time. The returned coroutine
+    view runs authentication, permission checks, queries, serialization and rendering, unchanged, in
+    one hop to the default executor with thread_sensitive=False: the event loop is never blocked and
+    concurrent reads run on as many threads as the executor has.
+
+    Args:
+        viewset_class (class): The viewset whose actions are served.
+        actions (dict): The HTTP method to action mapping, e.g. {"get": "list"}. Only read
+            actions may be mapped, since their threads are not those of the request transaction.
+
+    Returns:
+        function: The async view.
+    """
+    view = viewset_class.as_view(actions)
+    serve = sync_to_async(_serve, thread_sensitive=False)
+
+    async def async_view(request, *args, **kwargs):
+        return await serve(view, request, args, kwargs)
+
+    async_view.__name__ = "async_%s" % view.__name__
+    # Set by hand: in Django 3.2 the csrf_exempt decorator hides that the view is a coroutine
+    async_view.csrf_exempt = True
+    return async_view
+
+
+project_list = async_read_view(ProjectViewSet, {"get": "list"})
+project_detail = async_read_view(ProjectViewSet, {"get": "retrieve"})
+issue_list = async_read_view(IssueViewSet, {"get": "list"})
+issue_detail = async_read_view(IssueViewSet, {"get": "retrieve"})
+comment_list = async_read_view(CommentViewSet, {"get": "list"})
+comment_detail = async_read_view(CommentViewSet, {"get": "retrieve"})
@@ -0,0 +1,334 @@
+import io
+import json
+import os
+import statistics
+import sys
+from importlib import import_module
+
+from django.conf import settings
+from django.core.management import call_command
+from django.test import Client, TransactionTestCase, override_settings
+from django.urls import URLResolver
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from accounts.authentication import user_cache
+from accounts.models import User
+from Softdesk.cache import detail_cache
+from Softdesk.instrumentation import measure
+from Softdesk.models import Change, Comment, Contributor, Issue, Project
+
+# The dataset every benchmark runs against, built by the generate_dataset command
+DATASET = {"users": 200, "projects": 20, "issues": 2000, "comments": 10000, "seed": 0}
+
+# Requests sent per endpoint
+REPEAT = int(os.environ.get("SOFTDESK_BENCHMARK_REPEAT", 10))
+# Latencies are compared with this file, and written to it with SOFTDESK_BENCHMARK_WRITE_BASELINE=1
+BASELINE_PATH = os.environ.get(
+    "SOFTDESK_BENCHMARK_BASELINE", str(settings.BASE_DIR / "benchmark_baseline.json")
+)
+WRITE_BASELINE = os.environ.get("SOFTDESK_BENCHMARK_WRITE_BASELINE") == "1"
+# On CI a missing baseline fails the benchmark instead of skipping the latency comparison
+REQUIRE_BASELINE = bool(os.environ.get("CI")) and not WRITE_BASELINE
+# The table of results is printed with SOFTDESK_BENCHMARK_REPORT=1, or when writing the baseline
+REPORT = os.environ.get("SOFTDESK_BENCHMARK_REPORT") == "1" or WRITE_BASELINE
+# Largest slowdown of the median latency accepted against the baseline, in percent
+TOLERANCE = float(os.environ.get("SOFTDESK_BENCHMARK_TOLERANCE", 25))
+# Slowdowns smaller than this, in milliseconds, are noise whatever their percentage
+MIN_REGRESSION_MS = 2.0
+
+JSON = "application/json"
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def route_names(urlpatterns):
+    """Return the names of the routes of a URL configuration, included ones too."""
+    names = set()
+    for pattern in urlpatterns:
+        if isinstance(pattern, URLResolver):
+            names |= route_names(pattern.url_patterns)
+        elif pattern.name:
+            names.add(pattern.name)
+    return names
+
+
+class Endpoint:
+    """
+    One benchmarked request and its query budget.
+
+    Attributes:
+        route (str): The name of the route, e.g. "issues-detail".
+        method (str): The HTTP method.
+        path (str): The path, formatted with the fixture values, the consumed id and `request`, the
+            number of the request, e.g. "/projects/{project}/issues/{issue}/".
+        budget (int): The largest number of queries the request may run.
+        data: The body, or a callable returning it from the values.
+        consumes (str): The fixture pool of objects the requests use up, one each, e.g. "new_issue"
+            for the issues deleted; the id of the object is formatted in as that value.
+        user (str): The fixture user sending the request, None for an anonymous request.
+        status (int): The expected status code.
+        label (str): Tells apart the endpoints of a route and method, e.g. "rollup".
+    """
+
+    def __init__(
+        self,
+        route,
+        method,
+        path,
+        budget,
+        data=None,
+        consumes=None,
+        user="author",
+        status=200,
+        label="",
+    ):
+        self.route = route
+        self.method = method
+        self.path = path
+        self.budget = budget
+        self.data = data
+        self.consumes = consumes
+        self.user = user
+        self.status = status
+        self.label = label
+
+    @property
+    def name(self):
+        return " ".join(filter(None, [self.method.upper(), self.route, self.label]))
+
+
+class Fixture:
+    """
+    The objects of the benchmark dataset that the endpoints address.
+
+    The project is the largest one and the issue its most commented one, so that the endpoints are
+    measured on their heaviest case; the author of the project, made the author of the issue and of a
+    comment, sends the requests. The objects that requests use up (deleted projects, issues, comments
+    and contributors, users added to the project) are created once, REPEAT of each, in `pools`.
+
+    Attributes:
+        values (dict): The ids and names formatted into the endpoint paths and bodies.
+        users (dict): The users sending the requests, by name.
+        pools (dict): The ids of the objects of each pool, one per request.
+    """
+
+    def __init__(self):
+        project = Project.objects.order_by("-issue_count", "id").first()
+        issue = (
+            Issue.objects.filter(project=project)
+            .order_by("-comment_count", "id")
+            .first()
+        )
+        author = project.author
+        # Only their author may edit an issue or a comment
+        Issue.objects.filter(id=issue.id).update(author=author)
+        comment = Comment.objects.create(
+            text="Benchmark comment", issue=issue, author=author
+        )
+        outsider = (
+            User.objects.exclude(
+                id__in=Contributor.objects.filter(project=project).values("user_id")
+            )
+            .order_by("id")
+            .first()
+        )
+        staff = User.objects.create(username="benchmark-staff", is_staff=True)
+        self.project = project
+        self.issue = issue
+        self.users = {"author": author, "staff": staff}
+        self.values = {
+            "project": project.id,
+            "issue": issue.id,
+            "comment": comment.id,
+            "contributor": Contributor.objects.get(project=project, user=author).id,
+            "author": author.id,
+            "author_username": author.username,
+            "refresh": str(RefreshToken.for_user(author)),
+            "outsider": outsider.id,
+        }
+        self.pools = {
+            "new_project": [],
+            "new_issue": [],
+            "new_comment": [],
+            "new_contributor": [],
+            "new_user": [],
+        }
+        for number in range(REPEAT):
+            new_project = Project.objects.create(
+                name="Benchmark project %d" % number,
+                description="Deleted by the benchmark",
+                project_type="BACKEND",
+                author=author,
+            )
+            Contributor.objects.create(user=author, project=new_project)
+            new_issue = Issue.objects.create(
+                title="Benchmark issue %d" % number,
+                priority="LOW",
+                tag="BUG",
+                project=project,
+                author=author,
+                assigned_to=author,
+            )
+            new_comment = Comment.objects.create(
+                text="Benchmark comment %d" % number, issue=issue, author=author
+            )
+            member = User.objects.create(username="benchmark-member-%d" % number)
+            new_contributor = Contributor.objects.create(user=member, project=project)
+            new_user = User.objects.create(username="benchmark-user-%d" % number)
+            self.pools["new_project"].append(new_project.id)
+            self.pools["new_issue"].append(new_issue.id)
+            self.pools["new_comment"].append(new_comment.id)
+            self.pools["new_contributor"].append(new_contributor.id)
+            self.pools["new_user"].append(new_user.id)
+        # The incremental sync reads the last 100 changes
+        self.values["since"] = Change.objects.order_by("-id").values_list(
+            "id", flat=True
+        )[100]
+
+
+@override_settings(SOFTDESK_INSTRUMENTATION_SAMPLE_RATE=0)
+class BenchmarkTestCase(TransactionTestCase):
+    """
+    Drives declared endpoints through the test client on a seeded dataset and checks their costs.
+
+    Every endpoint is requested REPEAT times, the first time with cold caches. A test fails when an
+    endpoint runs more queries than its budget, when its median latency regresses by more than
+    TOLERANCE percent against the stored baseline, or when a route of `urlconf` has no endpoint.
+    When REQUIRE_BASELINE is set (on CI), an endpoint without a baseline latency fails as well.
+    Query counts include the queries run on other threads, by the async views.
+    The data is committed (TransactionTestCase), for the async views run their queries on other
+    connections.
+
+    Attributes:
+        urlconf (str): The module whose routes must all be benchmarked.
+        endpoints (list): The benchmarked endpoints.
+    """
+
+    urlconf = None
+    endpoints = []
+
+    def test_routes_are_benchmarked(self):
+        benchmarked = {endpoint.route for endpoint in self.endpoints}
+        missing = route_names(import_module(self.urlconf).urlpatterns) - benchmarked
+        self.assertEqual(sorted(missing), [], "Routes without a benchmark")
+
+    def test_endpoints(self):
+        call_command("generate_dataset", stdout=io.StringIO(), **DATASET)
+        fixture = Fixture()
+        baseline = self.load_baseline()
+        results = {}
+        for endpoint in self.endpoints:
+            with self.subTest(endpoint.name):
+                result = results[endpoint.name] = self.run_endpoint(endpoint, fixture)
+                self.assertLessEqual(
+                    result["queries"],
+                    endpoint.budget,
+                    "%s runs %d queries (%d repeated), its budget is %d"
+                    % (
+                        endpoint.name,
+                        result["queries"],
+                        result["repeated_queries"],
+                        endpoint.budget,
+                    ),
+                )
+                if REQUIRE_BASELINE:
+                    self.assertIn(
+                        endpoint.name,
+                        baseline,
+                        "%s has no baseline in %s" % (endpoint.name, BASELINE_PATH),
+                    )
+                if endpoint.name in baseline and not WRITE_BASELINE:
+                    self.assert_no_regression(
+                        endpoint.name, result, baseline[endpoint.name]
+                    )
+        if REPORT:
+            self.report(results)
+        if WRITE_BASELINE:
+            baseline.update(results)
+            with open(BASELINE_PATH, "w") as baseline_file:
+                json.dump(baseline, baseline_file, indent=2, sort_keys=True)
+
+    def run_endpoint(self, endpoint, fixture):
+        detail_cache.backend.clear()
+        user_cache.clear()
+        client = Client()
+        user = fixture.users.get(endpoint.user)
+        if user is not None:
+            client = Client(
+                HTTP_AUTHORIZATION="Bearer %s"
+                % RefreshToken.for_user(user).access_token
+            )
+        latencies = []
+        queries = repeated_queries = 0
+        for number in range(REPEAT):
+            values = dict(fixture.values, request=number)
+            if endpoint.consumes is not None:
+                values[endpoint.consumes] = fixture.pools[endpoint.consumes][number]
+            path = endpoint.path.format(**values)
+            data = endpoint.data(values) if callable(endpoint.data) else endpoint.data
+            extra = {} if endpoint.method == "get" else {"content_type": JSON}
+            with measure() as metrics:
+                response = getattr(client, endpoint.method)(path, data, **extra)
+                # A streaming body is produced while it is read
+                body = b"".join(response) if response.streaming else response.content
+            self.assertEqual(
+                response.status_code,
+                endpoint.status,
+                "%s %s: %s" % (endpoint.method.upper(), path, body[:300]),
+            )
+            latencies.append(metrics.total * 1000)
+            queries = max(queries, metrics.queries)
+            repeated_queries = max(repeated_queries, metrics.repeated_queries())
+        return {
+            "queries": queries,
+            "repeated_queries": repeated_queries,
+            "p50_ms": round(statistics.median(latencies), 2),
+            "p95_ms": round(percentile(latencies, 0.95), 2),
+            "max_ms": round(max(latencies), 2),
+        }
+
+    def assert_no_regression(self, name, result, reference):
+        slowdown = result["p50_ms"] - reference["p50_ms"]
+        if slowdown < MIN_REGRESSION_MS:
+            return
+        self.assertLessEqual(
+            slowdown * 100 / reference["p50_ms"],
+            TOLERANCE,
+            "%s median latency %.1f ms, baseline %.1f ms"
+            % (name, result["p50_ms"], reference["p50_ms"]),
+        )
+
+    def load_baseline(self):
+        if not os.path.exists(BASELINE_PATH):
+            if REQUIRE_BASELINE:
+                self.fail(
+                    "No benchmark baseline at %s, write one with "
+                    "SOFTDESK_BENCHMARK_WRITE_BASELINE=1" % BASELINE_PATH
+                )
+            return {}
+        with open(BASELINE_PATH) as baseline_file:
+            return json.load(baseline_file)
+
+    @staticmethod
+    def report(results):
+        lines = [
+            "",
+            "%-42s %8s %8s %9s %9s %9s"
+            % ("endpoint", "queries", "repeated", "p50 ms", "p95 ms", "max ms"),
+        ]
+        for name, result in results.items():
+            lines.append(
+                "%-42s %8d %8d %9.1f %9.1f %9.1f"
+                % (
+                    name,
+                    result["queries"],
+                    result["repeated_queries"],
+                    result["p50_ms"],
+                    result["p95_ms"],
+                    result["max_ms"],
+                )
+            )
+        sys.stderr.write("\n".join(lines) + "\n")
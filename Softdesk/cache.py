@@ -0,0 +1,111 @@
+import threading
+from collections import OrderedDict, defaultdict
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+class DetailCache:
+    """
+    Cache of serialized detail payloads, stored through Django's cache framework.
+
+    Entries are keyed by serializer, object and version token, plus the representation variant (query
+    string, host and media type), so a changed object can never be served from a stale entry. The keys
+    stored by this process are also indexed per object, so that the model signals can delete them as
+    soon as the object or one of its embedded children changes.
+
+    Attributes:
+        alias (str): The alias of the Django cache backend holding the payloads.
+        timeout (int): The lifetime of an entry, in seconds.
+        max_tracked_keys (int): The number of stored keys remembered for invalidation and statistics.
+
+    Methods:
+        - get(serializer_class, instance, variant): Returns the cached payload or None.
+        - set(serializer_class, instance, variant, data): Stores a payload.
+        - invalidate(model, *pks): Deletes the payloads of the given objects.
+        - stats(): Returns the hit, miss, eviction and invalidation counters of this process.
+    """
+
+    def __init__(self, alias, timeout, max_tracked_keys=10000):
+        self.alias = alias
+        self.timeout = timeout
+        self.max_tracked_keys = max_tracked_keys
+        self._lock = threading.Lock()
+        self._keys = OrderedDict()
+        self._keys_by_object = defaultdict(set)
+        self._counters = dict.fromkeys(
+            ["hits", "misses", "evictions", "sets", "invalidations"], 0
+        )
+
+    @property
+    def backend(self):
+        return caches[self.alias]
+
+    @staticmethod
+    def object_ref(model, pk):
+        return "%s:%s" % (model._meta.label_lower, pk)
+
+    def make_key(self, serializer_class, instance, variant):
+        return "softdesk:detail:%s:%s:%s:%s" % (
+            serializer_class.__name__,
+            self.object_ref(type(instance), instance.pk),
+            instance.version.hex,
+            variant,
+        )
+
+    def get(self, serializer_class, instance, variant):
+        key = self.make_key(serializer_class, instance, variant)
+        data = self.backend.get(key)
+        with self._lock:
+            if data is not None:
+                self._counters["hits"] += 1
+                return data
+            self._counters["misses"] += 1
+            if key in self._keys:
+                # Stored by this process but dropped by the backend: culled or expired
+                self._counters["evictions"] += 1
+                self._forget(key)
+        return None
+
+    def set(self, serializer_class, instance, variant, data):
+        key = self.make_key(serializer_class, instance, variant)
+        self.backend.set(key, data, self.timeout)
+        ref = self.object_ref(type(instance), instance.pk)
+        with self._lock:
+            self._counters["sets"] += 1
+            self._keys[key] = ref
+            self._keys_by_object[ref].add(key)
+            while len(self._keys) > self.max_tracked_keys:
+                self._forget(next(iter(self._keys)))
+
+    def invalidate(self, model, *pks):
+        keys = []
+        with self._lock:
+            for pk in pks:
+                for key in self._keys_by_object.pop(self.object_ref(model, pk), ()):
+                    self._keys.pop(key, None)
+                    keys.append(key)
+            self._counters["invalidations"] += len(keys)
+        if keys:
+            self.backend.delete_many(keys)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._counters, tracked_keys=len(self._keys))
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_ratio"] = stats["hits"] / lookups if lookups else None
+        return stats
+
+    def _forget(self, key):
+        ref = self._keys.pop(key)
+        keys = self._keys_by_object[ref]
+        keys.discard(key)
+        if not keys:
+            del self._keys_by_object[ref]
+
+
+detail_cache = DetailCache(
+    settings.SOFTDESK_DETAIL_CACHE_ALIAS,
+    settings.SOFTDESK_DETAIL_CACHE_TIMEOUT,
+    settings.SOFTDESK_DETAIL_CACHE_TRACKED_KEYS,
+)
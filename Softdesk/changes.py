@@ -0,0 +1,167 @@
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from Softdesk.models import Change, Comment, Contributor, Issue, Project
+
+# Rows per DELETE / INSERT, below the SQLite limit on query parameters
+BATCH_SIZE = 500
+
+
+def record_changes(kind, project_id, object_ids, deleted=False, supersede=True):
+    """
+    Append a change per object to the feed, and drop the earlier changes of these objects.
+
+    Args:
+        kind (str): The kind of the objects, one of Change.KIND_CHOICES.
+        project_id: The id of the project of the objects, or an expression computing it.
+        object_ids (iterable): The ids of the objects, the user ids for contributors.
+        deleted (bool): Record tombstones instead of saves.
+        supersede (bool): False for objects that cannot have earlier changes, e.g. new rows.
+    """
+    now = timezone.now()
+    changes = [
+        Change(
+            kind=kind,
+            object_id=object_id,
+            project_id=project_id,
+            deleted=deleted,
+            time=now,
+        )
+        for object_id in object_ids
+    ]
+    if len(changes) == 1 and not supersede:
+        # One INSERT, without the transaction of bulk_create
+        changes[0].save()
+        return
+    with transaction.atomic(savepoint=False):
+        for start in range(0, len(changes), BATCH_SIZE):
+            end = start + BATCH_SIZE
+            batch = changes[start:end]
+            if supersede:
+                Change.objects.filter(
+                    kind=kind,
+                    object_id__in=[change.object_id for change in batch],
+                    project_id=project_id,
+                    user_id=None,
+                ).delete()
+            Change.objects.bulk_create(batch)
+
+
+def forget_changes(kind, project_id, object_ids):
+    """
+    Drop the changes of objects whose deletion is implied by another tombstone, e.g. the comments
+    deleted with their issue, so that the feed does not keep changes of objects that no longer exist.
+    """
+    object_ids = list(object_ids)
+    for start in range(0, len(object_ids), BATCH_SIZE):
+        end = start + BATCH_SIZE
+        Change.objects.filter(
+            kind=kind,
+            object_id__in=object_ids[start:end],
+            project_id=project_id,
+            user_id=None,
+        ).delete()
+
+
+def record_project_deleted(project_id):
+    """
+    Replace every change of a deleted project with the tombstone of the project.
+
+    The former members learn of the deletion from the tombstones recorded when their memberships were
+    deleted by cascade (see record_membership_lost); this one is for superusers.
+    """
+    with transaction.atomic(savepoint=False):
+        Change.objects.filter(project_id=project_id, user_id=None).delete()
+        record_changes(
+            "project", project_id, [project_id], deleted=True, supersede=False
+        )
+
+
+def record_membership_lost(project_id, user_id):
+    """Record, for the user only, the tombstone of a project they no longer contribute to."""
+    with transaction.atomic(savepoint=False):
+        Change.objects.filter(
+            kind="project", object_id=project_id, project_id=project_id, user_id=user_id
+        ).delete()
+        Change.objects.create(
+            kind="project",
+            object_id=project_id,
+            project_id=project_id,
+            user_id=user_id,
+            deleted=True,
+        )
+
+
+def read_changes(user_id, project_ids, since, limit):
+    """
+    Return the changes after a sequence number that a user may read, oldest first.
+
+    The changes are read by ascending id from `since`, so the cost of a page depends on the changes
+    made since, not on the size of the dataset.
+
+    Args:
+        user_id (int): The id of the reader.
+        project_ids (iterable): The projects the reader contributes to, None for every project.
+        since (int): The sequence number of the last change the reader has seen.
+        limit (int): The largest number of changes returned.
+
+    Returns:
+        tuple: The changes, and whether more changes follow them.
+    """
+    visible = Q(user_id=None)
+    if project_ids is not None:
+        visible &= Q(project_id__in=project_ids)
+    changes = list(
+        Change.objects.filter(visible | Q(user_id=user_id), id__gt=since).order_by(
+            "id"
+        )[: limit + 1]
+    )
+    return changes[:limit], len(changes) > limit
+
+
+def backfill_changes(using_connection=connection):
+    """
+    Record a change for every project, issue, comment and contributor without one, e.g. when the feed
+    is created or after a bulk load that bypassed the signals.
+
+    Each kind costs one INSERT ... SELECT; no row is loaded in Python.
+
+    Migration 0007 keeps its own copy, so changes here do not alter how old databases were filled.
+
+    Args:
+        using_connection: The connection of the database to fill.
+    """
+    quote = using_connection.ops.quote_name
+    tables = {
+        model.__name__: quote(model._meta.db_table)
+        for model in (Change, Project, Contributor, Issue, Comment)
+    }
+    # kind, object id, project id and FROM clause of the rows of each kind
+    sources = [
+        ("project", "t.id", "t.id", "%(Project)s t"),
+        ("contributor", "t.user_id", "t.project_id", "%(Contributor)s t"),
+        ("issue", "t.id", "t.project_id", "%(Issue)s t"),
+        (
+            "comment",
+            "t.id",
+            "i.project_id",
+            "%(Comment)s t INNER JOIN %(Issue)s i ON i.id = t.issue_id",
+        ),
+    ]
+    now = using_connection.ops.adapt_datetimefield_value(timezone.now())
+    # The unary plus keeps the lookup on the (kind, object_id) index: on the project index, SQLite
+    # would read every change of the project for each row
+    with using_connection.cursor() as cursor:
+        for kind, object_id, project_id, source in sources:
+            cursor.execute(
+                (
+                    "INSERT INTO %(Change)s (kind, object_id, project_id, deleted, time) "
+                    "SELECT %%s, {object_id}, {project_id}, %%s, %%s FROM {source} "
+                    "WHERE NOT EXISTS (SELECT 1 FROM %(Change)s c WHERE c.kind = %%s "
+                    "AND c.object_id = {object_id} AND +c.project_id = {project_id} "
+                    "AND c.user_id IS NULL) ORDER BY t.id"
+                ).format(object_id=object_id, project_id=project_id, source=source)
+                % tables,
+                [kind, False, now, kind],
+            )
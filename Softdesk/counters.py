@@ -0,0 +1,63 @@
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+from Softdesk.models import Comment, Issue, Project
+
+
+def _count_of(queryset, group_field):
+    """A correlated subquery counting the rows of queryset per group_field, 0 when there is none."""
+    counts = (
+        queryset.filter(**{group_field: OuterRef("pk")})
+        .order_by()
+        .values(group_field)
+        .annotate(count=Count("pk"))
+        .values("count")
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
+def counter_definitions():
+    """
+    Describe every denormalized counter.
+
+    Returns:
+        list: (model, field, expression) tuples, the expression computing the true value of the
+        counter for each row of the model.
+    """
+    issues = Issue.objects.all()
+    return [
+        (Project, "issue_count", _count_of(issues, "project")),
+        (
+            Project,
+            "open_issue_count",
+            _count_of(issues.exclude(status=Issue.FINISHED_STATUS), "project"),
+        ),
+        (Issue, "comment_count", _count_of(Comment.objects.all(), "issue")),
+    ]
+
+
+def reconcile_counters(dry_run=False):
+    """
+    Recompute the denormalized counters from the rows they count.
+
+    Each counter costs one query finding the rows that drifted and, when there are some, one UPDATE
+    rewriting only those rows with correlated COUNT subqueries; no row is loaded in Python.
+
+    Args:
+        dry_run (bool): Only count the drifted rows.
+
+    Returns:
+        dict: The number of drifted rows per "<model>.<field>".
+    """
+    drifted = {}
+    for model, field, expression in counter_definitions():
+        stale = (
+            model.objects.annotate(actual=expression)
+            .filter(~Q(**{field: F("actual")}))
+            .values("pk")
+        )
+        count = stale.count()
+        drifted["%s.%s" % (model._meta.model_name, field)] = count
+        if count and not dry_run:
+            model.objects.filter(pk__in=stale).update(**{field: expression})
+    return drifted
@@ -0,0 +1,93 @@
+import functools
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import OperationalError, close_old_connections, connection, transaction
+
+
+def configure_sqlite_connection(sender, connection, **kwargs):
+    """Apply SOFTDESK_SQLITE_PRAGMAS to every new SQLite connection (connection_created receiver)."""
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        for pragma, value in settings.SOFTDESK_SQLITE_PRAGMAS.items():
+            cursor.execute("PRAGMA %s = %s" % (pragma, value))
+
+
+def is_lock_error(exc):
+    return isinstance(exc, OperationalError) and "database is locked" in str(exc)
+
+
+class WriteQueue:
+    """
+    Serializes the writes of a process through a single writer thread.
+
+    SQLite allows one writer at a time: concurrent request threads competing for the write lock wait
+    in the busy handler, or fail at once with "database is locked" when a read transaction has to be
+    upgraded. Writes sent through the queue run one after the other on a dedicated thread and
+    connection, inside a transaction retried with a jittered backoff when the lock is held by another
+    process.
+
+    Attributes:
+        retries (int): The number of attempts after a lock error before giving up.
+        backoff (float): The base delay before a retry, in seconds, doubled on every attempt.
+
+    Methods:
+        - run(function, *args, **kwargs): Runs function on the writer thread and returns its result.
+    """
+
+    def __init__(self, retries, backoff):
+        self.retries = retries
+        self.backoff = backoff
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="writer")
+        self._local = threading.local()
+
+    def run(self, function, *args, **kwargs):
+        if getattr(self._local, "on_writer", False):
+            # Nested write, already serialized
+            return function(*args, **kwargs)
+        return self._executor.submit(self._write, function, args, kwargs).result()
+
+    def _write(self, function, args, kwargs):
+        self._local.on_writer = True
+        close_old_connections()
+        try:
+            for attempt in range(self.retries + 1):
+                try:
+                    with transaction.atomic():
+                        return function(*args, **kwargs)
+                except OperationalError as exc:
+                    if not is_lock_error(exc) or attempt == self.retries:
+                        raise
+                time.sleep(self.backoff * 2**attempt * random.uniform(0.5, 1.5))
+        finally:
+            connection.close_if_unusable_or_obsolete()
+
+
+write_queue = WriteQueue(
+    settings.SOFTDESK_WRITE_QUEUE_RETRIES, settings.SOFTDESK_WRITE_QUEUE_BACKOFF
+)
+
+
+def serialized_create(perform_create):
+    """
+    Run the decorated perform_create(self, serializer) method of a viewset through write_queue when
+    SOFTDESK_WRITE_QUEUE is enabled.
+    """
+
+    @functools.wraps(perform_create)
+    def wrapper(view, serializer):
+        if not settings.SOFTDESK_WRITE_QUEUE:
+            return perform_create(view, serializer)
+
+        def create():
+            # A retried attempt starts over, the instance saved by the failed one was rolled back
+            serializer.instance = None
+            return perform_create(view, serializer)
+
+        return write_queue.run(create)
+
+    return wrapper
@@ -0,0 +1,477 @@
+import asyncio
+import re
+import secrets
+import threading
+import time
+from collections import OrderedDict, deque
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from rest_framework.exceptions import AuthenticationFailed
+
+from accounts.authentication import CachedJWTAuthentication
+from Softdesk import fastjson
+from Softdesk.models import Contributor, Issue, Project
+from Softdesk.serializers import FEED_SERIALIZERS
+
+# The event streams of a project and of an issue, served by EventStreamDispatcher
+EVENT_STREAM_PATH = re.compile(
+    r"^/projects/(?P<project>\d+)/(?:issues/(?P<issue>\d+)/)?events/$"
+)
+
+# Queued on a subscription to end its stream
+CLOSE = object()
+KEEPALIVE = b": keepalive\n\n"
+
+
+class Event:
+    """
+    One published event, encoded once for every subscriber.
+
+    Attributes:
+        sequence (int): The position of the event among the events of the broker.
+        topics (tuple): The streams the event is sent to, e.g. ("project", 1) and ("issue", 7).
+        message (bytes): The event in the text/event-stream format.
+    """
+
+    __slots__ = ("sequence", "topics", "message")
+
+    def __init__(self, sequence, topics, message):
+        self.sequence = sequence
+        self.topics = topics
+        self.message = message
+
+
+class Subscription:
+    """
+    The queue of the events sent to one open stream, consumed on the event loop of the stream.
+
+    Attributes:
+        topic (tuple): The stream, e.g. ("issue", 7).
+        project_id (int): The project of the stream.
+        user_id (int): The user reading the stream.
+        loop: The event loop serving the stream.
+        queue (asyncio.Queue): The encoded events waiting to be sent.
+        closed (bool): Set once CLOSE is queued.
+
+    Methods:
+        - close(): Ends the stream once the queued events are sent. Runs on the loop of the stream.
+    """
+
+    def __init__(self, topic, project_id, user_id, loop):
+        self.topic = topic
+        self.project_id = project_id
+        self.user_id = user_id
+        self.loop = loop
+        self.queue = asyncio.Queue()
+        self.closed = False
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self.queue.put_nowait(CLOSE)
+
+
+class EventBroker:
+    """
+    In-process publish/subscribe of the events of projects and issues, for the event streams.
+
+    Events are published from any thread, usually from signal receivers once their transaction
+    commits, and handed to the event loops of the subscribed streams with one callback per loop.
+    The last `replay_size` events are kept so that a client reconnecting with Last-Event-ID gets
+    what it missed; a client that missed more, or that comes from another process or an older run,
+    gets a "reset" event telling it to sync again (see SyncView). Event ids start with a token of the
+    broker, so ids of another run are recognized.
+    A stream whose client reads too slowly to keep its queue under `queue_size` events is closed;
+    the client resumes it from the replay buffer. One task per event loop sends a keepalive comment
+    to the idle streams every `keepalive` seconds, so idle streams cost no timer each.
+
+    Publishers skip the events that no stream may read (see `watching`). A topic is watched while it
+    has streams and for `resume_window` seconds after its last stream closed; once that lapses its
+    events are dropped, and a client resuming from before then gets a "reset" event.
+
+    Only the streams served by this process see its events.
+
+    Attributes:
+        replay_size (int): The number of events kept for the clients that reconnect.
+        queue_size (int): The number of events queued for a stream before it is closed.
+        keepalive (float): The delay between keepalive comments on idle streams, in seconds.
+        resume_window (float): How long the events of a topic are kept after its last stream closed.
+
+    Methods:
+        - watching(topics): Tells whether a stream may read the events of the topics, or of any topic.
+        - publish(name, data, topics): Sends an event to the streams of the topics.
+        - subscribe(topic, project_id, user_id, last_event_id): Opens a Subscription, queuing the
+            missed events first. Runs on the event loop of the stream.
+        - unsubscribe(subscription): Removes a Subscription.
+        - close_streams(project_id, user_id): Ends the streams of a project, of one user or of all.
+    """
+
+    def __init__(self, replay_size, queue_size, keepalive, resume_window):
+        self.replay_size = replay_size
+        self.queue_size = queue_size
+        self.keepalive = keepalive
+        self.resume_window = resume_window
+        self._token = secrets.token_hex(4)
+        self._lock = threading.Lock()
+        self._sequence = 0
+        self._events = deque(maxlen=replay_size)
+        self._subscriptions = {}
+        self._keepalive_tasks = {}
+        # The topics without streams whose events are still kept, by deadline, oldest first
+        self._released = OrderedDict()
+        # The topics whose events were dropped, with the first sequence number after the drop
+        self._lapsed = OrderedDict()
+
+    def watching(self, topics=None):
+        if topics is None:
+            # Read without the lock: a stream opened meanwhile starts after the event anyway
+            return bool(self._subscriptions or self._released)
+        with self._lock:
+            self._lapse_released()
+            return any(
+                topic in self._subscriptions or topic in self._released
+                for topic in topics
+            )
+
+    def publish(self, name, data, topics):
+        topics = tuple(topics)
+        with self._lock:
+            self._sequence += 1
+            event = Event(
+                self._sequence,
+                topics,
+                b"id: %s\nevent: %s\ndata: %s\n\n"
+                % (self._event_id(self._sequence).encode(), name.encode(), data),
+            )
+            if self.replay_size > 0:
+                self._events.append(event)
+            targets = {}
+            for topic in topics:
+                for subscription in self._subscriptions.get(topic, ()):
+                    targets.setdefault(subscription.loop, set()).add(subscription)
+        for loop, subscriptions in targets.items():
+            self._call_soon(loop, self._deliver, subscriptions, event.message)
+
+    def subscribe(self, topic, project_id, user_id, last_event_id=None):
+        loop = asyncio.get_running_loop()
+        subscription = Subscription(topic, project_id, user_id, loop)
+        with self._lock:
+            self._lapse_released()
+            for message in self._replay(topic, last_event_id):
+                subscription.queue.put_nowait(message)
+            self._subscriptions.setdefault(topic, set()).add(subscription)
+            self._released.pop(topic, None)
+            if loop not in self._keepalive_tasks:
+                self._keepalive_tasks[loop] = loop.create_task(self._keep_alive(loop))
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.topic)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.topic]
+                    self._released[subscription.topic] = (
+                        time.monotonic() + self.resume_window
+                    )
+                    self._lapse_released()
+
+    def close_streams(self, project_id, user_id=None):
+        with self._lock:
+            targets = {}
+            for subscriptions in self._subscriptions.values():
+                for subscription in subscriptions:
+                    if subscription.project_id != project_id:
+                        continue
+                    if user_id is None or subscription.user_id == user_id:
+                        targets.setdefault(subscription.loop, []).append(subscription)
+        for loop, subscriptions in targets.items():
+            for subscription in subscriptions:
+                self._call_soon(loop, subscription.close)
+
+    def _event_id(self, sequence):
+        return "%s-%d" % (self._token, sequence)
+
+    def _lapse_released(self):
+        """Stop keeping the events of the topics released for too long. Called with the lock held."""
+        now = time.monotonic()
+        while self._released:
+            topic, deadline = next(iter(self._released.items()))
+            if deadline > now:
+                break
+            del self._released[topic]
+            # Skips a sequence number, so that the ids given from now on are after the drop
+            self._sequence += 1
+            self._lapsed[topic] = self._sequence
+            self._lapsed.move_to_end(topic)
+        # Resuming from before the oldest kept event is a reset anyway
+        oldest = self._events[0].sequence if self._events else self._sequence + 1
+        while self._lapsed:
+            topic, sequence = next(iter(self._lapsed.items()))
+            if sequence >= oldest:
+                break
+            del self._lapsed[topic]
+
+    def _replay(self, topic, last_event_id):
+        """Return the messages a new subscription starts with. Called with the lock held."""
+        current = self._event_id(self._sequence).encode()
+        ready = b"id: %s\nevent: ready\ndata: {}\n\n" % current
+        if last_event_id is None:
+            return [ready]
+        token, _, sequence = last_event_id.partition("-")
+        try:
+            sequence = int(sequence)
+        except ValueError:
+            sequence = None
+        oldest = self._events[0].sequence if self._events else self._sequence + 1
+        if (
+            token != self._token
+            or sequence is None
+            or sequence > self._sequence
+            or sequence + 1 < oldest
+            or sequence < self._lapsed.get(topic, 0)
+        ):
+            return [b"id: %s\nevent: reset\ndata: {}\n\n" % current]
+        return [
+            event.message
+            for event in self._events
+            if event.sequence > sequence and topic in event.topics
+        ]
+
+    def _deliver(self, subscriptions, message):
+        for subscription in subscriptions:
+            if subscription.closed:
+                continue
+            if subscription.queue.qsize() >= self.queue_size:
+                # Too slow: the client resumes from the replay buffer
+                subscription.close()
+            else:
+                subscription.queue.put_nowait(message)
+
+    async def _keep_alive(self, loop):
+        while True:
+            await asyncio.sleep(self.keepalive)
+            with self._lock:
+                streams = [
+                    subscription
+                    for subscriptions in self._subscriptions.values()
+                    for subscription in subscriptions
+                    if subscription.loop is loop
+                ]
+                if not streams:
+                    del self._keepalive_tasks[loop]
+                    return
+            for subscription in streams:
+                if subscription.queue.empty():
+                    subscription.queue.put_nowait(KEEPALIVE)
+
+    @staticmethod
+    def _call_soon(loop, callback, *args):
+        try:
+            loop.call_soon_threadsafe(callback, *args)
+        except RuntimeError:
+            # The loop was closed, its streams with it
+            pass
+
+
+event_broker = EventBroker(
+    settings.SOFTDESK_EVENTS_REPLAY_SIZE,
+    settings.SOFTDESK_EVENTS_QUEUE_SIZE,
+    settings.SOFTDESK_EVENTS_KEEPALIVE,
+    settings.SOFTDESK_EVENTS_RESUME_WINDOW,
+)
+
+
+def publish_event(name, data, project_id, issue_ids=()):
+    """
+    Publish an event to the stream of a project and to the streams of issues once the current
+    transaction commits, so that rolled back writes are never announced.
+
+    `data` and `project_id` may be callables, called at commit only if a stream may read the event,
+    so that writes nobody watches pay neither the serialization nor the lookup. A project id of None
+    drops the event.
+    """
+
+    def publish():
+        if not event_broker.watching():
+            return
+        project = project_id() if callable(project_id) else project_id
+        if project is None:
+            return
+        topics = [("project", int(project))]
+        topics += [("issue", int(issue_id)) for issue_id in issue_ids]
+        if event_broker.watching(topics):
+            message = fastjson.dumps(data() if callable(data) else data)
+            event_broker.publish(name, message, topics)
+
+    transaction.on_commit(publish)
+
+
+def publish_saved(kind, instance, created, project_id, issue_ids=()):
+    """
+    Publish "<kind>.created" or "<kind>.updated" with the representation of a saved object, as it
+    is when the transaction commits.
+    """
+    serializer_class, options = FEED_SERIALIZERS[kind]
+    publish_event(
+        "%s.%s" % (kind, "created" if created else "updated"),
+        lambda: serializer_class(instance, **options).data,
+        project_id,
+        issue_ids,
+    )
+
+
+def close_event_streams(project_id, user_id=None):
+    """End the streams of a project, of one user or of all, once the current transaction commits."""
+    transaction.on_commit(lambda: event_broker.close_streams(int(project_id), user_id))
+
+
+def authorize_stream(authorization, project_id, issue_id):
+    """
+    Authenticate the bearer token of a stream request and check that its user may read the stream.
+
+    Returns:
+        tuple: The user id and None, or None and the HTTP status and body of the refusal.
+    """
+    close_old_connections()
+    try:
+        authentication = CachedJWTAuthentication()
+        raw_token = authentication.get_raw_token(authorization or b"")
+        if raw_token is None:
+            return None, (
+                401,
+                {"detail": "Authentication credentials were not provided."},
+            )
+        try:
+            user = authentication.get_user(
+                authentication.get_validated_token(raw_token)
+            )
+        except AuthenticationFailed as exc:
+            detail = exc.detail
+            return None, (
+                401,
+                detail if isinstance(detail, dict) else {"detail": detail},
+            )
+
+        if user.is_superuser:
+            allowed = Project.objects.filter(pk=project_id).exists()
+        else:
+            allowed = Contributor.objects.filter(
+                project_id=project_id, user_id=user.id
+            ).exists()
+            if not allowed:
+                return None, (
+                    403,
+                    {"detail": "You do not have permission to perform this action."},
+                )
+        if issue_id is not None:
+            allowed = Issue.objects.filter(pk=issue_id, project_id=project_id).exists()
+        if not allowed:
+            return None, (404, {"detail": "Not found."})
+        return user.id, None
+    finally:
+        close_old_connections()
+
+
+class EventStreamDispatcher:
+    """
+    ASGI application serving the Server-Sent Events streams of projects and issues, and handing every
+    other request to the wrapped application.
+
+    `GET /projects/<id>/events/` streams the events of a project, its issues and their comments, and
+    `GET /projects/<id>/issues/<id>/events/` those of one issue and its comments: "<kind>.created",
+    "<kind>.updated" (with the representation of the object) and "<kind>.deleted" (with its id), and
+    "issues.created" / "issues.updated" (with the ids) for bulk imports and transitions. Readers must
+    contribute to the project and authenticate with the usual bearer token. A stream starts with a
+    "ready" event, or with the events missed since its `Last-Event-ID` header (or `lastEventId`
+    query parameter), and ends when the user leaves the project or the project is deleted.
+
+    The streams are served on the event loop, without a thread each: the only blocking work, the
+    authorization, runs once in the default executor. Django 3.2 would iterate a streaming response
+    on the event loop, blocking it, hence this dispatcher in front of the Django application.
+
+    Attributes:
+        application: The wrapped ASGI application.
+    """
+
+    def __init__(self, application):
+        self.application = application
+        self._authorize = sync_to_async(authorize_stream, thread_sensitive=False)
+
+    async def __call__(self, scope, receive, send):
+        match = None
+        if scope["type"] == "http":
+            match = EVENT_STREAM_PATH.match(scope["path"])
+        if match is None:
+            return await self.application(scope, receive, send)
+        if scope["method"] != "GET":
+            return await self.refuse(send, 405, {"detail": "Method not allowed."})
+
+        headers = dict(scope["headers"])
+        project_id = int(match["project"])
+        issue_id = match["issue"] and int(match["issue"])
+        user_id, refusal = await self._authorize(
+            headers.get(b"authorization"), project_id, issue_id
+        )
+        if refusal is not None:
+            return await self.refuse(send, *refusal)
+
+        last_event_id = headers.get(b"last-event-id", b"").decode("latin-1") or None
+        if last_event_id is None:
+            query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+            last_event_id = query.get("lastEventId", [None])[0]
+        topic = ("issue", issue_id) if issue_id else ("project", project_id)
+        subscription = event_broker.subscribe(topic, project_id, user_id, last_event_id)
+        disconnected = asyncio.Event()
+        watcher = asyncio.ensure_future(
+            self.watch_disconnect(receive, subscription, disconnected)
+        )
+        try:
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 200,
+                    "headers": [
+                        (b"content-type", b"text/event-stream; charset=utf-8"),
+                        (b"cache-control", b"no-cache"),
+                        # Tells nginx not to buffer the stream
+                        (b"x-accel-buffering", b"no"),
+                    ],
+                }
+            )
+            while True:
+                message = await subscription.queue.get()
+                if message is CLOSE:
+                    break
+                await send(
+                    {"type": "http.response.body", "body": message, "more_body": True}
+                )
+            if not disconnected.is_set():
+                await send({"type": "http.response.body", "body": b""})
+        finally:
+            event_broker.unsubscribe(subscription)
+            watcher.cancel()
+
+    @staticmethod
+    async def watch_disconnect(receive, subscription, disconnected):
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                disconnected.set()
+                subscription.close()
+                return
+
+    @staticmethod
+    async def refuse(send, status, body):
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": [(b"content-type", b"application/json")],
+            }
+        )
+        await send({"type": "http.response.body", "body": fastjson.dumps(body)})
@@ -0,0 +1,116 @@
+from Softdesk.models import Comment, Issue
+from Softdesk.streaming import iterate_rows
+
+ISSUE_EXPORT_FIELDS = {
+    "id": "id",
+    "project": "project_id",
+    "title": "title",
+    "description": "description",
+    "priority": "priority",
+    "tag": "tag",
+    "status": "status",
+    "author": "author_id",
+    "assigned_to": "assigned_to_id",
+    "time_created": "time_created",
+}
+
+COMMENT_EXPORT_FIELDS = {
+    "id": "id",
+    "issue": "issue_id",
+    "text": "text",
+    "author": "author_id",
+    "time_created": "time_created",
+    "unique_identifier": "unique_identifier",
+}
+
+# Columns of a CSV export, shared by issue and comment records
+CSV_EXPORT_FIELDS = ["record"] + list(
+    dict.fromkeys(list(ISSUE_EXPORT_FIELDS) + list(COMMENT_EXPORT_FIELDS))
+)
+
+# Issues and comments are read in the order of the (project, time_created) index
+ISSUE_EXPORT_ORDERING = ("time_created", "id")
+COMMENT_EXPORT_ORDERING = ("issue__time_created", "issue_id", "time_created", "id")
+
+
+def _issue_rows(project_id, since, chunk_size):
+    queryset = Issue.objects.filter(project_id=project_id)
+    if since is not None:
+        queryset = queryset.filter(time_created__gte=since)
+    for row in iterate_rows(
+        queryset.order_by(*ISSUE_EXPORT_ORDERING), ISSUE_EXPORT_FIELDS, chunk_size
+    ):
+        row["record"] = "issue"
+        yield row
+
+
+def _comment_rows(project_id, chunk_size, **filters):
+    queryset = Comment.objects.filter(issue__project_id=project_id, **filters)
+    fields = dict(COMMENT_EXPORT_FIELDS, issue_time_created="issue__time_created")
+    for row in iterate_rows(
+        queryset.order_by(*COMMENT_EXPORT_ORDERING), fields, chunk_size
+    ):
+        row["record"] = "comment"
+        yield row
+
+
+def _merge_comments(issues, comments):
+    """
+    Attach each comment to its issue while walking both ordered iterators once.
+
+    Both iterators follow the same issue order, so only the comments of the current issue are held in
+    memory. Comments whose issue is not exported (e.g. created after the issues were read) are skipped.
+    """
+    pending = next(comments, None)
+    for issue in issues:
+        key = (issue["time_created"], issue["id"])
+        while (
+            pending is not None
+            and (
+                pending["issue_time_created"],
+                pending["issue"],
+            )
+            < key
+        ):
+            pending = next(comments, None)
+        issue["comments"] = []
+        while pending is not None and pending["issue"] == issue["id"]:
+            del pending["issue_time_created"], pending["record"]
+            issue["comments"].append(pending)
+            pending = next(comments, None)
+        yield issue
+
+
+def export_project(project_id, comments="inline", since=None, chunk_size=2000):
+    """
+    Yield the export records of a project's issues and comments, reading them with chunked iterators.
+
+    Args:
+        project_id (int): The id of the exported project.
+        comments (str): "inline" to nest the comments in their issue, "separate" to emit them as
+            records of their own after the issues, or "none" to leave them out.
+        since (datetime): If given, only the records created at or after this time are exported. Inline
+            comments follow their issue, so use "separate" for incremental comment exports.
+        chunk_size (int): The number of rows fetched from the database at a time.
+
+    Yields:
+        dict: One record per issue or comment, with a "record" key naming its type.
+    """
+    issues = _issue_rows(project_id, since, chunk_size)
+    if comments == "inline":
+        filters = {}
+        if since is not None:
+            filters["issue__time_created__gte"] = since
+        yield from _merge_comments(
+            issues, _comment_rows(project_id, chunk_size, **filters)
+        )
+        return
+
+    yield from issues
+    if comments == "separate":
+        filters = {}
+        if since is not None:
+            filters["time_created__gte"] = since
+        for row in _comment_rows(project_id, chunk_size, **filters):
+            del row["issue_time_created"]
+            yield row
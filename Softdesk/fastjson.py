@@ -0,0 +1,51 @@
+import json
+
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# UUIDs and datetimes are encoded natively, aware UTC datetimes with a "Z" suffix like DRF does
+ORJSON_OPTIONS = (orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS) if orjson else 0
+
+
+def _default(obj):
+    """Encode the types orjson does not know (Decimal, lazy strings, querysets...) the DRF way."""
+    return JSONEncoder().default(obj)
+
+
+def dumps(data, indent=None):
+    """
+    Encode data as compact UTF-8 JSON, with orjson when it is installed.
+
+    Args:
+        data: The data to encode.
+        indent (int): Indent the output when set. orjson only indents by 2 spaces.
+
+    Returns:
+        bytes: The encoded JSON.
+    """
+    if orjson is not None:
+        options = ORJSON_OPTIONS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(data, default=_default, option=options)
+    return json.dumps(
+        data,
+        cls=JSONEncoder,
+        ensure_ascii=False,
+        indent=indent,
+        separators=(",", ":") if indent is None else None,
+    ).encode("utf-8")
+
+
+def loads(data):
+    """
+    Decode JSON from bytes or str, with orjson when it is installed.
+
+    Raises:
+        ValueError: If data is not valid JSON.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
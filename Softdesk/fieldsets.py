@@ -0,0 +1,152 @@
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.serializers import ListSerializer
+
+FIELDS_QUERY_PARAM = "fields"
+OMIT_QUERY_PARAM = "omit"
+
+
+def parse_field_list(value):
+    """Split a comma separated `?fields=` / `?omit=` value, an empty value selecting nothing."""
+    if not value:
+        return None
+    names = {name.strip() for name in value.split(",")}
+    names.discard("")
+    return names or None
+
+
+def get_requested_fieldset(request):
+    """
+    Return the sparse fieldset asked for by a request.
+
+    Args:
+        request (Request): The current request.
+
+    Returns:
+        tuple: The set of field names to keep, or None to keep them all, and the set of field names
+            to leave out.
+    """
+    params = request.query_params
+    return (
+        parse_field_list(params.get(FIELDS_QUERY_PARAM)),
+        parse_field_list(params.get(OMIT_QUERY_PARAM)) or set(),
+    )
+
+
+class SparseFieldsetMixin:
+    """
+    A serializer mixin rendering only the fields selected with `?fields=` or `?omit=`.
+
+    The selection is read from the `fields` / `omit` keyword arguments of the serializer, or else from
+    the query parameters of the request of the context. Request parameters only apply to the top-level
+    serializer of a read (GET/HEAD) request: embedded serializers and the fields validated by writes
+    are left whole. Fields that are not rendered are not computed, so leaving out an embedded list
+    also saves its queries.
+
+    Attributes:
+        sparse_required_fields (tuple): Model fields read by the representation besides the fields of
+            the serializer, which must be loaded even when the queryset is narrowed.
+
+    Methods:
+        - get_sparse_fieldset(self): Returns the field names to keep (None for all) and to leave out.
+        - get_fields(self): Returns the fields of the serializer, trimmed to the sparse fieldset.
+    """
+
+    sparse_required_fields = ()
+
+    def __init__(self, *args, **kwargs):
+        self._sparse_fields = kwargs.pop("fields", None)
+        self._sparse_omit = kwargs.pop("omit", None)
+        super().__init__(*args, **kwargs)
+
+    def get_sparse_fieldset(self):
+        if self._sparse_fields is not None or self._sparse_omit is not None:
+            fields = self._sparse_fields
+            return (
+                None if fields is None else set(fields),
+                set(self._sparse_omit or ()),
+            )
+        request = self.context.get("request")
+        parent = self.parent
+        if isinstance(parent, ListSerializer):
+            parent = parent.parent
+        if request is None or parent is not None or request.method not in SAFE_METHODS:
+            return None, set()
+        return get_requested_fieldset(request)
+
+    def get_fields(self):
+        fields = super().get_fields()
+        keep, omit = self.get_sparse_fieldset()
+        for name in list(fields):
+            if (keep is not None and name not in keep) or name in omit:
+                del fields[name]
+        return fields
+
+
+class SparseQuerysetMixin:
+    """
+    A viewset mixin loading only the columns rendered by a sparse fieldset.
+
+    When a list or retrieve request carries `?fields=` or `?omit=`, the names are checked against the
+    fields of the serializer (unknown names are a 400) and the queryset is narrowed with .only() to the
+    model fields backing the rendered fields, plus the primary key, the ordering columns, the
+    `sparse_required_fields` of the view and of the serializer. The columns left out are never fetched.
+
+    Attributes:
+        sparse_required_fields (tuple): Model fields the view itself reads on the objects, such as the
+            version used for the ETag.
+
+    Methods:
+        - filter_queryset(self, queryset): Narrows the filtered queryset to the sparse fieldset.
+        - get_sparse_columns(self, queryset, serializer): Returns the model fields to load.
+    """
+
+    sparse_required_fields = ()
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.action not in ("list", "retrieve"):
+            return queryset
+        keep, omit = get_requested_fieldset(self.request)
+        if keep is None and not omit:
+            return queryset
+
+        serializer_class = self.get_serializer_class()
+        available = set(serializer_class(context={}).fields)
+        unknown = sorted(((keep or set()) | omit) - available)
+        if unknown:
+            raise ValidationError(
+                {
+                    "fields": "Unknown fields: %s. Available fields: %s."
+                    % (", ".join(unknown), ", ".join(sorted(available)))
+                }
+            )
+        serializer = serializer_class(context=self.get_serializer_context())
+        return queryset.only(*self.get_sparse_columns(queryset, serializer))
+
+    def get_sparse_columns(self, queryset, serializer):
+        opts = queryset.model._meta
+        names = {opts.pk.name}
+        names.update(self.sparse_required_fields)
+        names.update(getattr(serializer, "sparse_required_fields", ()))
+        names.update(getattr(self, "keyset_ordering", ()))
+        names.update(
+            str(ordering).lstrip("-").split("__")[0]
+            for ordering in queryset.query.order_by
+        )
+        for field in serializer.fields.values():
+            if field.write_only or field.source == "*":
+                continue
+            names.add(field.source.split(".")[0])
+
+        columns = []
+        for name in names:
+            try:
+                model_field = opts.get_field(name)
+            except FieldDoesNotExist:
+                # Computed by the serializer, e.g. a SerializerMethodField
+                continue
+            if model_field.concrete and not model_field.many_to_many:
+                columns.append(name)
+        return sorted(columns)
@@ -0,0 +1,40 @@
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend, OrderingFilter
+
+
+class StableOrderingFilter(OrderingFilter):
+    """
+    OrderingFilter whose orderings always end with the primary key.
+
+    Sorting on a non unique column (e.g. a counter) would otherwise return ties in an arbitrary order,
+    so that limit/offset pages could repeat or skip rows, and could not be resumed by keyset pagination.
+    """
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if ordering and not {"id", "-id", "pk", "-pk"} & set(ordering):
+            ordering = [*ordering, "id"]
+        return ordering
+
+
+class CounterRangeFilter(BaseFilterBackend):
+    """
+    Filter on ranges of the denormalized counters listed in the `counter_filter_fields` view attribute.
+
+    For every such field, `?min_<field>=` and `?max_<field>=` keep the rows whose counter is at least,
+    respectively at most, the given value, e.g. `/projects/?min_open_issue_count=1`.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        for field in getattr(view, "counter_filter_fields", ()):
+            for prefix, lookup in (("min", "gte"), ("max", "lte")):
+                param = "%s_%s" % (prefix, field)
+                value = request.query_params.get(param)
+                if value is None:
+                    continue
+                try:
+                    value = int(value)
+                except ValueError:
+                    raise ValidationError({param: "A whole number is required."})
+                queryset = queryset.filter(**{"%s__%s" % (field, lookup): value})
+        return queryset
@@ -0,0 +1,184 @@
+import contextvars
+import logging
+import random
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+
+from Softdesk import fastjson
+from Softdesk.middleware import HybridMiddleware
+
+logger = logging.getLogger(__name__)
+
+# The metrics of the request being served, None when it is not sampled. Context variables follow
+# the request into the threads of sync_to_async, so the async read views are measured too.
+_current_metrics = contextvars.ContextVar("softdesk_request_metrics", default=None)
+
+
+class RequestMetrics:
+    """
+    The costs measured while serving one request.
+
+    Attributes:
+        queries (int): The number of SQL statements executed.
+        db_time (float): The time spent executing them, in seconds.
+        statements (set): The distinct SQL statements, with placeholders for their parameters.
+        phases (dict): The time spent in each timed phase ("serializer", "render"), in seconds.
+        total (float): The time spent serving the request, in seconds.
+
+    Methods:
+        - repeated_queries(): Returns the number of queries repeating a previous statement, the
+            signature of N+1 query patterns.
+        - server_timing(): Returns the value of the Server-Timing header.
+        - as_log_record(request, response): Returns the structured log record of the request.
+    """
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.statements = set()
+        self.phases = {"serializer": 0.0, "render": 0.0}
+        self.total = 0.0
+        self._active = set()
+
+    def repeated_queries(self):
+        return self.queries - len(self.statements)
+
+    def server_timing(self):
+        metrics = [
+            'db;dur=%.1f;desc="%d queries, %d repeated"'
+            % (self.db_time * 1000, self.queries, self.repeated_queries())
+        ]
+        metrics += [
+            "%s;dur=%.1f" % (phase, duration * 1000)
+            for phase, duration in self.phases.items()
+        ]
+        metrics.append("total;dur=%.1f" % (self.total * 1000))
+        return ", ".join(metrics)
+
+    def as_log_record(self, request, response):
+        match = getattr(request, "resolver_match", None)
+        record = {
+            "method": request.method,
+            "path": request.path,
+            "view": match.view_name if match else None,
+            "status": response.status_code,
+            "queries": self.queries,
+            "repeated_queries": self.repeated_queries(),
+            "db_ms": round(self.db_time * 1000, 2),
+            "total_ms": round(self.total * 1000, 2),
+        }
+        for phase, duration in self.phases.items():
+            record["%s_ms" % phase] = round(duration * 1000, 2)
+        return record
+
+
+def current_metrics():
+    """Return the RequestMetrics of the request being served, or None if it is not sampled."""
+    return _current_metrics.get()
+
+
+@contextmanager
+def measure():
+    """Measure the block, e.g. the serving of a request, and yield its RequestMetrics."""
+    metrics = RequestMetrics()
+    token = _current_metrics.set(metrics)
+    start = time.perf_counter()
+    try:
+        yield metrics
+    finally:
+        metrics.total = time.perf_counter() - start
+        _current_metrics.reset(token)
+
+
+@contextmanager
+def timed(phase):
+    """
+    Add the time spent in the block to a phase of the current request metrics, if any.
+
+    Nested blocks of the same phase (e.g. nested serializers) are only counted once.
+    """
+    metrics = _current_metrics.get()
+    if metrics is None or phase in metrics._active:
+        yield
+        return
+    metrics._active.add(phase)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.phases[phase] = metrics.phases.get(phase, 0.0) + (
+            time.perf_counter() - start
+        )
+        metrics._active.discard(phase)
+
+
+def record_query(execute, sql, params, many, context):
+    """Database execute wrapper counting and timing the queries of sampled requests."""
+    metrics = _current_metrics.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.db_time += time.perf_counter() - start
+        metrics.queries += 1
+        metrics.statements.add(sql)
+
+
+def install_query_recorder(sender, connection, **kwargs):
+    """Add record_query to the execute wrappers of every new connection (connection_created receiver)."""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+class TimedRepresentationMixin:
+    """A serializer mixin adding the time spent in to_representation to the "serializer" phase."""
+
+    def to_representation(self, instance):
+        with timed("serializer"):
+            return super().to_representation(instance)
+
+
+class InstrumentationMiddleware(HybridMiddleware):
+    """
+    Measure the query count, database time, serializer time and render time of requests.
+
+    A share SOFTDESK_INSTRUMENTATION_SAMPLE_RATE of the requests is measured; the others only pay for a
+    random draw. The measures of a sampled request are sent back in a Server-Timing header and logged
+    as one JSON record on the Softdesk.instrumentation logger. Serializer time includes the queries run
+    by the serializers. The body of a streaming response is produced after the measures are taken.
+
+    The middleware runs in the mode of the handler, see HybridMiddleware.
+    """
+
+    def handle(self, request):
+        if not self.sampled():
+            return self.get_response(request)
+
+        with measure() as metrics:
+            response = self.get_response(request)
+        return self.report(request, response, metrics)
+
+    async def ahandle(self, request):
+        if not self.sampled():
+            return await self.get_response(request)
+
+        with measure() as metrics:
+            response = await self.get_response(request)
+        return self.report(request, response, metrics)
+
+    @staticmethod
+    def sampled():
+        rate = settings.SOFTDESK_INSTRUMENTATION_SAMPLE_RATE
+        return rate > 0 and (rate >= 1 or random.random() < rate)
+
+    @staticmethod
+    def report(request, response, metrics):
+        response["Server-Timing"] = metrics.server_timing()
+        logger.info(
+            fastjson.dumps(metrics.as_log_record(request, response)).decode("utf-8")
+        )
+        return response
@@ -0,0 +1,174 @@
+import asyncio
+import statistics
+import threading
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.test import AsyncClient, Client
+from django.test.utils import setup_test_environment, teardown_test_environment
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from accounts.models import User
+from Softdesk.models import Comment, Contributor, Issue, Project
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+class Command(BaseCommand):
+    """
+    Compare the read endpoints served by the sync viewsets under WSGI with the same endpoints served
+    under ASGI, through the sync viewsets and through the async read views of `async/`.
+
+    Every mode sends the same requests, cycling over the project, issue and comment list and detail
+    endpoints, from `--concurrency` concurrent clients: threads for WSGI, coroutines for ASGI. The data
+    lives in a throwaway test database.
+    """
+
+    help = "Benchmark the async read path against the sync WSGI path."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--concurrency", type=int, default=16)
+        parser.add_argument("--requests", type=int, default=400)
+        parser.add_argument("--projects", type=int, default=20)
+        parser.add_argument("--issues", type=int, default=20)
+        parser.add_argument("--comments", type=int, default=5)
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            paths = self.seed(
+                options["projects"], options["issues"], options["comments"]
+            )
+            concurrency = options["concurrency"]
+            requests = max(options["requests"] // concurrency, 1) * concurrency
+
+            self.stdout.write(
+                "%-22s %10s %10s %10s" % ("mode", "req/s", "p50 ms", "p99 ms")
+            )
+            modes = [
+                ("wsgi sync views", self.run_wsgi, ""),
+                ("asgi sync views", self.run_asgi, ""),
+                ("asgi async views", self.run_asgi, "/async"),
+            ]
+            for label, run, prefix in modes:
+                urls = [prefix + path for path in paths]
+                elapsed, latencies = run(urls, concurrency, requests)
+                self.stdout.write(
+                    "%-22s %10.1f %10.1f %10.1f"
+                    % (
+                        label,
+                        len(latencies) / elapsed,
+                        statistics.median(latencies) * 1000,
+                        percentile(latencies, 0.99) * 1000,
+                    )
+                )
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+    def seed(self, projects, issues, comments):
+        """Create the benchmark data and return the paths requested, authenticating the clients."""
+        user = User.objects.create(username="benchmark")
+        self.auth = "Bearer %s" % RefreshToken.for_user(user).access_token
+        paths = []
+        for index in range(projects):
+            project = Project.objects.create(
+                name="Project %d" % index,
+                description="Benchmark project",
+                project_type="BACKEND",
+                author=user,
+            )
+            Contributor.objects.create(user=user, project=project)
+            project_issues = [
+                Issue.objects.create(
+                    title="Issue %d" % number,
+                    description="Benchmark issue",
+                    priority="LOW",
+                    tag="BUG",
+                    project=project,
+                    author=user,
+                    assigned_to=user,
+                )
+                for number in range(issues)
+            ]
+            issue = project_issues[0]
+            for number in range(comments):
+                comment = Comment.objects.create(
+                    text="Comment %d" % number, issue=issue, author=user
+                )
+            base = "/projects/%d/" % project.id
+            paths += [
+                base,
+                base + "issues/",
+                base + "issues/%d/" % issue.id,
+                base + "issues/%d/comments/" % issue.id,
+            ]
+            if comments:
+                paths.append(base + "issues/%d/comments/%d/" % (issue.id, comment.id))
+        return ["/projects/"] + paths
+
+    def run_wsgi(self, urls, concurrency, requests):
+        latencies = []
+        errors = []
+
+        def client_thread(offset):
+            client = Client(HTTP_AUTHORIZATION=self.auth)
+            for number in range(offset, requests, concurrency):
+                start = time.perf_counter()
+                response = client.get(urls[number % len(urls)])
+                latencies.append(time.perf_counter() - start)
+                if response.status_code != 200:
+                    errors.append((urls[number % len(urls)], response.status_code))
+            connections.close_all()
+
+        threads = [
+            threading.Thread(target=client_thread, args=(offset,))
+            for offset in range(concurrency)
+        ]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        self.raise_for_errors(errors)
+        return elapsed, latencies
+
+    def run_asgi(self, urls, concurrency, requests):
+        latencies = []
+        errors = []
+
+        async def client_task(offset):
+            client = AsyncClient()
+            for number in range(offset, requests, concurrency):
+                start = time.perf_counter()
+                # AsyncClient takes raw header names
+                response = await client.get(
+                    urls[number % len(urls)], authorization=self.auth
+                )
+                latencies.append(time.perf_counter() - start)
+                if response.status_code != 200:
+                    errors.append((urls[number % len(urls)], response.status_code))
+
+        async def run_all():
+            await asyncio.gather(
+                *(client_task(offset) for offset in range(concurrency))
+            )
+
+        start = time.perf_counter()
+        asyncio.run(run_all())
+        elapsed = time.perf_counter() - start
+        self.raise_for_errors(errors)
+        return elapsed, latencies
+
+    @staticmethod
+    def raise_for_errors(errors):
+        if errors:
+            raise CommandError(
+                "%d requests failed, e.g. %s %s" % (len(errors), *errors[0])
+            )
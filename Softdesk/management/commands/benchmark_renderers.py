@@ -0,0 +1,102 @@
+import io
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from Softdesk import fastjson
+from Softdesk.parsers import FastJSONParser
+from Softdesk.renderers import FastJSONRenderer
+
+
+def build_payloads(size):
+    """
+    Return the benchmarked payloads: a page of serialized issues and raw export rows.
+
+    The serialized issues hold strings only, as DRF serializers output; the export rows hold the
+    UUIDs and datetimes read from the database.
+    """
+    now = timezone.now()
+    issues = [
+        {
+            "id": number,
+            "title": "Issue %d" % number,
+            "description": "Lorem ipsum dolor sit amet. " * 70,
+            "priority": "LOW",
+            "tag": "BUG",
+            "project": 1,
+            "assigned_to": 1,
+            "status": "To Do",
+            "time_created": now.isoformat(),
+            "author": 1,
+            "comment_count": number % 7,
+        }
+        for number in range(size)
+    ]
+    rows = [
+        {
+            "id": number,
+            "unique_identifier": uuid.uuid4(),
+            "text": "Comment %d" % number,
+            "author": 1,
+            "issue": number // 10,
+            "time_created": now,
+        }
+        for number in range(size)
+    ]
+    return [("issue list", {"count": size, "results": issues}), ("export rows", rows)]
+
+
+def best_of(function, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+class Command(BaseCommand):
+    """
+    Compare the render and parse times of DRF's JSON renderer and parser with FastJSONRenderer and
+    FastJSONParser, on a page of `--size` serialized issues and on `--size` export rows.
+
+    The best time of `--repeat` runs is reported, in milliseconds.
+    """
+
+    help = "Benchmark the JSON renderers and parsers on large issue lists."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--size", type=int, default=5000)
+        parser.add_argument("--repeat", type=int, default=10)
+
+    def handle(self, *args, **options):
+        if fastjson.orjson is None:
+            self.stderr.write("orjson is not installed, FastJSON falls back to DRF.")
+        self.stdout.write(
+            "%-12s %-10s %12s %12s %12s"
+            % ("payload", "backend", "render ms", "parse ms", "size KB")
+        )
+        for label, data in build_payloads(options["size"]):
+            for backend, renderer, parser in [
+                ("drf", JSONRenderer(), JSONParser()),
+                ("fast", FastJSONRenderer(), FastJSONParser()),
+            ]:
+                content = renderer.render(data)
+                render_time = best_of(lambda: renderer.render(data), options["repeat"])
+                parse_time = best_of(
+                    lambda: parser.parse(io.BytesIO(content)), options["repeat"]
+                )
+                self.stdout.write(
+                    "%-12s %-10s %12.2f %12.2f %12.1f"
+                    % (
+                        label,
+                        backend,
+                        render_time * 1000,
+                        parse_time * 1000,
+                        len(content) / 1024,
+                    )
+                )
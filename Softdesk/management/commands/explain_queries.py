@@ -0,0 +1,152 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.http import HttpRequest
+from rest_framework.request import Request
+
+from accounts.models import User
+from Softdesk.models import Comment, Contributor, Issue
+from Softdesk.pagination import KeysetPagination
+from Softdesk.permissions import get_contributor_project_ids
+from Softdesk.views import (
+    CommentViewSet,
+    ContributorViewSet,
+    IssueViewSet,
+    ProjectViewSet,
+)
+
+
+class Command(BaseCommand):
+    """
+    Print the SQLite query plan of the queries run by each viewset.
+
+    The queries are built from the viewsets themselves for a sample contributor, project, issue and
+    comment taken from the database. The contributor is a regular user, whose queries are filtered by
+    their projects, as superusers list every project with a scan by design. Plan steps that scan a
+    whole table without an index, or sort through a temporary B-tree, are flagged so that regressions
+    are visible as the data grows.
+    """
+
+    help = "Print EXPLAIN QUERY PLAN for the queries of each Softdesk viewset."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--fail-on-scan",
+            action="store_true",
+            help="Exit with an error if any query falls back to a full table scan.",
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != "sqlite":
+            raise CommandError("EXPLAIN QUERY PLAN is only available on SQLite.")
+
+        contributor = (
+            Contributor.objects.filter(user__is_superuser=False)
+            .select_related("user")
+            .order_by("id")
+            .first()
+        )
+        user = contributor.user if contributor else User(id=1)
+        project_id = contributor.project_id if contributor else 1
+        issue = Issue.objects.filter(project_id=project_id).first()
+        issue_id = issue.id if issue else 1
+        comment = Comment.objects.filter(issue_id=issue_id).first()
+        comment_id = comment.id if comment else 1
+
+        request = Request(HttpRequest())
+        request.user = user
+        scans = 0
+        for label, queryset in self.get_queries(
+            request, project_id, issue_id, comment_id, comment
+        ):
+            scans += self.explain(label, queryset)
+
+        if scans and options["fail_on_scan"]:
+            raise CommandError("%d queries fall back to a full table scan." % scans)
+
+    def get_queries(self, request, project_id, issue_id, comment_id, comment):
+        project_kwargs = {"project_pk": project_id}
+        issue_kwargs = {"project_pk": project_id, "issue_pk": issue_id}
+
+        projects = self.get_view(ProjectViewSet, request).get_queryset()
+        issues = self.get_view(IssueViewSet, request, **project_kwargs).get_queryset()
+        comments = self.get_view(CommentViewSet, request, **issue_kwargs).get_queryset()
+        contributors = self.get_view(
+            ContributorViewSet, request, **project_kwargs
+        ).get_queryset()
+
+        get_contributor_project_ids(request)
+        yield "membership", Contributor.objects.filter(
+            user_id=request.user.id
+        ).values_list("project_id", flat=True)
+        yield "ProjectViewSet.list", projects
+        yield "ProjectViewSet.list (cursor)", self.seek(
+            projects, ProjectViewSet.keyset_ordering
+        )
+        yield "ProjectViewSet.retrieve", projects.filter(pk=project_id)
+        yield "ProjectDetailSerializer.issues", Issue.objects.filter(
+            project=project_id
+        ).order_by("time_created", "id")
+        yield "IssueViewSet.list", issues
+        yield "IssueViewSet.list (cursor)", self.seek(
+            issues, IssueViewSet.keyset_ordering
+        )
+        yield "IssueViewSet.retrieve", issues.filter(pk=issue_id)
+        yield "Issue by assignee and status", Issue.objects.filter(
+            assigned_to=request.user.id, status="To Do"
+        )
+        yield "IssueDetailSerializer.comments", Comment.objects.filter(
+            issue=issue_id
+        ).order_by("-time_created", "-id")
+        yield "CommentViewSet.list", comments
+        yield "CommentViewSet.list (cursor)", self.seek(
+            comments, CommentViewSet.keyset_ordering
+        )
+        yield "CommentViewSet.retrieve", comments.filter(pk=comment_id)
+        if comment is not None:
+            yield "Comment by unique_identifier", Comment.objects.filter(
+                unique_identifier=comment.unique_identifier
+            )
+        yield "ContributorViewSet.list", contributors
+
+    @staticmethod
+    def get_view(viewset_class, request, **kwargs):
+        return viewset_class(
+            request=request, kwargs=kwargs, format_kwarg=None, action="list"
+        )
+
+    @staticmethod
+    def seek(queryset, ordering):
+        """Apply the condition of a keyset page following the first row of the queryset."""
+        paginator = KeysetPagination()
+        paginator.ordering = ordering
+        row = queryset.first()
+        if row is None:
+            return queryset
+        condition = paginator.get_seek_condition(
+            paginator.get_position(row), reverse=False, inclusive=False
+        )
+        return queryset.filter(condition).order_by(*ordering)
+
+    def explain(self, label, queryset):
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute("EXPLAIN QUERY PLAN " + sql, params)
+            plan = [row[-1] for row in cursor.fetchall()]
+
+        scans = [step for step in plan if self.is_full_scan(step)]
+        style = self.style.WARNING if scans else self.style.SUCCESS
+        self.stdout.write(style(label))
+        for step in plan:
+            if step in scans:
+                self.stdout.write(
+                    self.style.ERROR("    %s  <-- full table scan" % step)
+                )
+            elif "TEMP B-TREE" in step:
+                self.stdout.write(self.style.WARNING("    %s  <-- sort" % step))
+            else:
+                self.stdout.write("    %s" % step)
+        return 1 if scans else 0
+
+    @staticmethod
+    def is_full_scan(step):
+        return step.startswith("SCAN ") and " USING " not in step
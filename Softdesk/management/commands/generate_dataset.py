@@ -0,0 +1,345 @@
+import random
+import time
+import uuid
+from array import array
+from datetime import datetime, timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from accounts.models import User
+from Softdesk.changes import backfill_changes
+from Softdesk.counters import reconcile_counters
+from Softdesk.models import Comment, Contributor, Issue, Project
+from Softdesk.search import drop_search_triggers, rebuild_search_index
+
+# The generated timestamps span the year starting at this date
+EPOCH = datetime(2023, 1, 1, tzinfo=timezone.utc)
+YEAR_SECONDS = 365 * 24 * 3600
+
+WORDS = (
+    "api build cache client commit crash deploy error feature fix flaky form index issue "
+    "layout leak login memory mobile null page patch query release request screen server "
+    "session slow sync test timeout token update upload user view widget window"
+).split()
+STATUS_WEIGHTS = {"To Do": 3, "In Progress": 2, "Finished": 5}
+# The number of words of the corpus the texts are cut from
+CORPUS_WORDS = 100000
+
+
+def zipf_cum_weights(count, exponent):
+    """Return the cumulative Zipf weights of `count` ranks, the rank r weighing 1 / r**exponent."""
+    cum_weights = []
+    total = 0.0
+    for rank in range(1, count + 1):
+        total += rank**-exponent
+        cum_weights.append(total)
+    return cum_weights
+
+
+class Command(BaseCommand):
+    """
+    Generate a large, skewed and reproducible dataset of users, projects, contributors, issues and
+    comments.
+
+    Issues are spread over projects and comments over issues following Zipf distributions, so a few
+    projects hold a large share of the issues and comment counts have a long tail; the team of a
+    project is Pareto distributed. Everything, identifiers, texts, timestamps and version tokens
+    included, is drawn from a random generator seeded with `--seed`: on the same database, the same
+    arguments give the same rows, so benchmarks can be compared between runs.
+
+    Rows are written with raw INSERT statements run by executemany, `--batch-size` rows per call and
+    per transaction. The values of the objects are written as they are, so the drawn timestamps are
+    kept even where the field is auto_now_add, and the signals are not sent: the denormalized
+    counters, the full-text index and the change feed are computed once at the end. The time taken
+    by every table is reported; the build time grows linearly with the number of rows.
+    """
+
+    help = "Generate a large seeded dataset for benchmarks."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--projects", type=int, default=100)
+        parser.add_argument("--issues", type=int, default=20000)
+        parser.add_argument("--comments", type=int, default=100000)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument(
+            "--project-skew",
+            type=float,
+            default=1.1,
+            help="Zipf exponent of the number of issues per project.",
+        )
+        parser.add_argument(
+            "--comment-skew",
+            type=float,
+            default=0.8,
+            help="Zipf exponent of the number of comments per issue.",
+        )
+        parser.add_argument(
+            "--password",
+            default="softdesk-dataset",
+            help="The password of every generated user.",
+        )
+
+    def handle(self, *args, **options):
+        if options["users"] < 1 or options["projects"] < 1 or options["issues"] < 1:
+            raise CommandError("At least one user, project and issue are required.")
+        self.rng = random.Random(options["seed"])
+        self.batch_size = options["batch_size"]
+        self.prefix = "dataset%d-" % options["seed"]
+        if User.objects.filter(username__startswith=self.prefix).exists():
+            raise CommandError(
+                "The dataset of seed %d is already loaded." % options["seed"]
+            )
+
+        # Texts are slices of a corpus drawn once, instead of being drawn word by word
+        words = self.rng.choices(WORDS, k=CORPUS_WORDS)
+        self.corpus = " ".join(words) + " "
+        self.word_offsets = array("l", [0])
+        for word in words:
+            self.word_offsets.append(self.word_offsets[-1] + len(word) + 1)
+
+        start = time.perf_counter()
+        # The full-text index is rebuilt in one pass at the end, faster than by its triggers
+        drop_search_triggers(connection)
+        try:
+            users = self.generate_users(options["users"], options["password"])
+            projects, teams = self.generate_projects(users, options["projects"])
+            issues = self.generate_issues(
+                projects, teams, options["issues"], options["project_skew"]
+            )
+            self.generate_comments(
+                issues, teams, options["comments"], options["comment_skew"]
+            )
+        finally:
+            step = time.perf_counter()
+            if connection.vendor == "sqlite":
+                with transaction.atomic():
+                    rebuild_search_index(connection)
+            self.stdout.write("search index: %.1fs" % (time.perf_counter() - step))
+
+        step = time.perf_counter()
+        reconcile_counters()
+        self.stdout.write("counters: %.1fs" % (time.perf_counter() - step))
+        step = time.perf_counter()
+        backfill_changes()
+        self.stdout.write("change feed: %.1fs" % (time.perf_counter() - step))
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(
+                no_style(), [User, Project, Contributor, Issue, Comment]
+            ):
+                cursor.execute(sql)
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Generated the dataset of seed %d in %.1fs."
+                % (options["seed"], time.perf_counter() - start)
+            )
+        )
+
+    def next_id(self, model):
+        return (model.objects.aggregate(last=Max("id"))["last"] or 0) + 1
+
+    def uuid(self):
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    def words(self, count):
+        """Return `count` words of the corpus, from a random position."""
+        start = self.rng.randrange(len(self.word_offsets) - count)
+        begin = self.word_offsets[start]
+        end = self.word_offsets[start + count] - 1
+        return self.corpus[begin:end]
+
+    def insert(self, label, model, objects, total):
+        """Insert the objects, one executemany and transaction per batch, reporting the rows per second."""
+        start = time.perf_counter()
+        batch = []
+        for obj in objects:
+            batch.append(obj)
+            if len(batch) >= self.batch_size:
+                self.insert_batch(model, batch)
+                batch = []
+        if batch:
+            self.insert_batch(model, batch)
+        elapsed = time.perf_counter() - start
+        self.stdout.write(
+            "%s: %d rows in %.1fs (%d rows/s)"
+            % (label, total, elapsed, total / elapsed if elapsed else 0)
+        )
+
+    @staticmethod
+    def insert_batch(model, batch):
+        """
+        Insert the objects with one INSERT run by executemany.
+
+        Unlike bulk_create, the fields are not pre-saved: the values of the objects are written as
+        they are, auto_now_add fields included. Objects without a primary key get one from the
+        database.
+        """
+        quote = connection.ops.quote_name
+        fields = [
+            field
+            for field in model._meta.local_concrete_fields
+            if not (field.primary_key and batch[0].pk is None)
+        ]
+        sql = "INSERT INTO %s (%s) VALUES (%s)" % (
+            quote(model._meta.db_table),
+            ", ".join(quote(field.column) for field in fields),
+            ", ".join(["%s"] * len(fields)),
+        )
+        rows = [
+            [
+                field.get_db_prep_save(getattr(obj, field.attname), connection)
+                for field in fields
+            ]
+            for obj in batch
+        ]
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.executemany(sql, rows)
+
+    def generate_users(self, count, password):
+        """Create the users and return their ids."""
+        # Hashed once, with a fixed salt to stay reproducible
+        encoded = make_password(password, salt="softdeskdataset")
+        first_id = self.next_id(User)
+        rng = self.rng
+
+        def users():
+            for number in range(count):
+                yield User(
+                    id=first_id + number,
+                    username="%suser%d" % (self.prefix, number),
+                    password=encoded,
+                    email="user%d@example.com" % number,
+                    first_name=rng.choice(WORDS).title(),
+                    last_name=rng.choice(WORDS).title(),
+                    age=rng.randint(15, 70),
+                    can_be_contacted=rng.random() < 0.5,
+                    can_data_be_shared=rng.random() < 0.5,
+                    date_joined=EPOCH,
+                )
+
+        self.insert("users", User, users(), count)
+        return range(first_id, first_id + count)
+
+    def generate_projects(self, users, count):
+        """Create the projects and their contributors, and return the project ids and teams."""
+        rng = self.rng
+        first_id = self.next_id(Project)
+        teams = []
+        projects = []
+        for number in range(count):
+            author = rng.choice(users)
+            size = min(len(users), int(rng.paretovariate(1.2) * 2))
+            team = [author] + [
+                user for user in rng.sample(users, size) if user != author
+            ]
+            teams.append(team)
+            projects.append(
+                Project(
+                    id=first_id + number,
+                    name="Project %d %s" % (number, self.words(2)),
+                    description=self.words(rng.randint(5, 60)),
+                    project_type=rng.choice(Project.TYPES_CHOICES)[0],
+                    author_id=author,
+                    version=self.uuid(),
+                )
+            )
+        self.insert("projects", Project, projects, count)
+
+        def contributors():
+            for number, team in enumerate(teams):
+                for user in team:
+                    yield Contributor(project_id=first_id + number, user_id=user)
+
+        self.insert(
+            "contributors",
+            Contributor,
+            contributors(),
+            sum(len(team) for team in teams),
+        )
+        return range(first_id, first_id + count), teams
+
+    def generate_issues(self, projects, teams, count, skew):
+        """
+        Create the issues, spread over the projects by a Zipf distribution.
+
+        Returns:
+            tuple: The issue ids, and the project index and creation offset of every issue.
+        """
+        rng = self.rng
+        first_id = self.next_id(Issue)
+        # Which projects are the large ones is drawn too
+        ranked = list(range(len(projects)))
+        rng.shuffle(ranked)
+        project_of = array(
+            "l",
+            rng.choices(
+                ranked, cum_weights=zipf_cum_weights(len(ranked), skew), k=count
+            ),
+        )
+        offsets = array("d")
+        statuses = list(STATUS_WEIGHTS)
+        status_weights = list(STATUS_WEIGHTS.values())
+
+        def issues():
+            for number in range(count):
+                team = teams[project_of[number]]
+                offset = rng.random() * YEAR_SECONDS
+                offsets.append(offset)
+                time_created = EPOCH + timedelta(seconds=offset)
+                issue = Issue(
+                    id=first_id + number,
+                    title=self.words(rng.randint(2, 8)).capitalize(),
+                    # Mostly short, now and then near the 2048 characters limit
+                    description=self.words(min(int(rng.paretovariate(1.0) * 15), 400))[
+                        :2048
+                    ],
+                    priority=rng.choice(Issue.PRIORITY_CHOICES)[0],
+                    tag=rng.choice(Issue.TAG_CHOICES)[0],
+                    project_id=projects[project_of[number]],
+                    author_id=rng.choice(team),
+                    assigned_to_id=rng.choice(team),
+                    status=rng.choices(statuses, status_weights)[0],
+                    time_created=time_created,
+                    version=self.uuid(),
+                )
+                issue.sync_time_finished(
+                    now=time_created + timedelta(seconds=rng.expovariate(1 / 864000))
+                )
+                yield issue
+
+        self.insert("issues", Issue, issues(), count)
+        return range(first_id, first_id + count), project_of, offsets
+
+    def generate_comments(self, issues, teams, count, skew):
+        """Create the comments, spread over the issues by a Zipf distribution."""
+        rng = self.rng
+        issue_ids, project_of, offsets = issues
+        first_id = self.next_id(Comment)
+        ranked = list(range(len(issue_ids)))
+        rng.shuffle(ranked)
+        cum_weights = zipf_cum_weights(len(ranked), skew)
+
+        def comments():
+            number = 0
+            while number < count:
+                size = min(self.batch_size, count - number)
+                for index in rng.choices(ranked, cum_weights=cum_weights, k=size):
+                    offset = offsets[index] + rng.expovariate(1 / 259200)
+                    yield Comment(
+                        id=first_id + number,
+                        text=self.words(rng.randint(3, 40)).capitalize(),
+                        issue_id=issue_ids[index],
+                        author_id=rng.choice(teams[project_of[index]]),
+                        unique_identifier=self.uuid(),
+                        time_created=EPOCH + timedelta(seconds=offset),
+                        version=self.uuid(),
+                    )
+                    number += 1
+
+        self.insert("comments", Comment, comments(), count)
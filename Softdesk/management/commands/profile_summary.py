@@ -0,0 +1,55 @@
+import io
+import os
+import pstats
+
+from django.core.management.base import BaseCommand, CommandError
+
+from Softdesk.profiling import profile_ring
+
+SORT_KEYS = ("cumulative", "tottime", "ncalls")
+
+
+class Command(BaseCommand):
+    """
+    List the profile dumps stored by ProfilingMiddleware and summarize the hottest functions across
+    them.
+
+    The dumps are merged, so a function is ranked by its total over every profiled request; `--match`
+    restricts the summary to the dumps whose file name (time, process, method and path) contains it.
+    """
+
+    help = "Summarize the hot functions of the stored request profiles."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--limit", type=int, default=25, help="Number of functions shown."
+        )
+        parser.add_argument("--sort", choices=SORT_KEYS, default="cumulative")
+        parser.add_argument(
+            "--match", default="", help="Only use the dumps whose name contains this."
+        )
+        parser.add_argument(
+            "--list", action="store_true", help="Only list the stored dumps."
+        )
+
+    def handle(self, *args, **options):
+        paths = [
+            path
+            for path in profile_ring.paths()
+            if options["match"] in os.path.basename(path)
+        ]
+        if not paths:
+            raise CommandError("No profile stored in %s." % profile_ring.directory)
+
+        for path in paths:
+            self.stdout.write(
+                "%s %8.1f KB" % (os.path.basename(path), os.path.getsize(path) / 1024)
+            )
+        if options["list"]:
+            return
+
+        # pstats prints piece by piece, the output wrapper would end every piece with a newline
+        output = io.StringIO()
+        stats = pstats.Stats(*paths, stream=output)
+        stats.strip_dirs().sort_stats(options["sort"]).print_stats(options["limit"])
+        self.stdout.write(output.getvalue())
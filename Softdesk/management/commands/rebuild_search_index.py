@@ -0,0 +1,35 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from Softdesk.models import Comment, Issue
+from Softdesk.search import rebuild_search_index
+
+
+class Command(BaseCommand):
+    """
+    Rebuild the full-text search index of issues and comments in bulk.
+
+    Use it after loading existing data, or to recover from an index that drifted from the tables
+    (e.g. rows written while the triggers were missing).
+    """
+
+    help = "Rebuild the SQLite FTS5 index of issues and comments."
+
+    def handle(self, *args, **options):
+        if connection.vendor != "sqlite":
+            raise CommandError("The search index is only available on SQLite.")
+        start = time.perf_counter()
+        with transaction.atomic():
+            rebuild_search_index(connection)
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Indexed %d issues and %d comments in %.1fs."
+                % (
+                    Issue.objects.count(),
+                    Comment.objects.count(),
+                    time.perf_counter() - start,
+                )
+            )
+        )
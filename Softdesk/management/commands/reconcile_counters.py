@@ -0,0 +1,39 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from Softdesk.counters import reconcile_counters
+
+
+class Command(BaseCommand):
+    """
+    Recompute the denormalized issue and comment counters of projects and issues.
+
+    The counters are maintained incrementally on every write; this repairs the drift left by writes
+    that bypassed the application (raw SQL, restored backups, interrupted deployments).
+    """
+
+    help = "Recompute the issue_count, open_issue_count and comment_count counters."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report the number of drifted rows.",
+        )
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        drifted = reconcile_counters(dry_run=options["dry_run"])
+        for counter, count in drifted.items():
+            self.stdout.write("%s: %d drifted rows" % (counter, count))
+        self.stdout.write(
+            self.style.SUCCESS(
+                "%s %d rows in %.1fs."
+                % (
+                    "Found" if options["dry_run"] else "Reconciled",
+                    sum(drifted.values()),
+                    time.perf_counter() - start,
+                )
+            )
+        )
@@ -0,0 +1,43 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from Softdesk.models import Project, ProjectStatistics
+from Softdesk.statistics import refresh_project_rollup
+
+
+class Command(BaseCommand):
+    """
+    Refresh the precomputed project statistics served by `/projects/<pk>/stats/?rollup=true`.
+
+    Only the rollups flagged stale since their last computation are recomputed, unless --all is given,
+    so that running it frequently costs in proportion to the projects that changed.
+    """
+
+    help = "Recompute the stale project statistics rollups."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Recompute the rollups of every project, creating the missing ones.",
+        )
+
+    def handle(self, *args, **options):
+        if options["all"]:
+            project_ids = Project.objects.values_list("id", flat=True)
+        else:
+            project_ids = ProjectStatistics.objects.filter(is_stale=True).values_list(
+                "project_id", flat=True
+            )
+        start = time.perf_counter()
+        refreshed = 0
+        for project_id in list(project_ids):
+            refresh_project_rollup(project_id)
+            refreshed += 1
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Refreshed %d rollups in %.1fs."
+                % (refreshed, time.perf_counter() - start)
+            )
+        )
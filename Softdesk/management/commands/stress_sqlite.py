@@ -0,0 +1,203 @@
+import os
+import statistics
+import tempfile
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, connections
+from django.test import Client
+from django.test.utils import (
+    override_settings,
+    setup_test_environment,
+    teardown_test_environment,
+)
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from accounts.models import User
+from Softdesk.db import is_lock_error
+from Softdesk.models import Contributor, Issue, Project
+
+# The settings of the production database profile of setup/settings.py
+PRODUCTION_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": 5000,
+    "mmap_size": 256 * 1024 * 1024,
+}
+PROFILES = {
+    "development": {"SOFTDESK_SQLITE_PRAGMAS": {}, "SOFTDESK_WRITE_QUEUE": False},
+    "production": {
+        "SOFTDESK_SQLITE_PRAGMAS": PRODUCTION_PRAGMAS,
+        "SOFTDESK_WRITE_QUEUE": True,
+    },
+}
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+class Command(BaseCommand):
+    """
+    Stress concurrent writes against an SQLite file, with and without the production profile.
+
+    For each profile a fresh database file is migrated and seeded, then `--writers` threads create
+    comments and issues and change issue statuses through the API while `--readers` threads list
+    issues and comments. The "database is locked" errors and the latency percentiles of reads and
+    writes are reported per profile.
+    """
+
+    help = "Measure SQLite lock errors and tail latency under concurrent writes."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--writers", type=int, default=8)
+        parser.add_argument("--readers", type=int, default=4)
+        parser.add_argument(
+            "--requests", type=int, default=50, help="Requests sent by each thread."
+        )
+        parser.add_argument(
+            "--profiles", default="development,production", help="Profiles to compare."
+        )
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        self.stdout.write(
+            "%-12s %8s %8s %8s %10s %10s %10s"
+            % (
+                "profile",
+                "writes",
+                "locked",
+                "errors",
+                "write p50",
+                "write p99",
+                "read p99",
+            )
+        )
+        try:
+            for profile in options["profiles"].split(","):
+                with tempfile.TemporaryDirectory() as directory:
+                    with override_settings(**PROFILES[profile]):
+                        result = self.run_profile(
+                            os.path.join(directory, "stress.sqlite3"), options
+                        )
+                self.stdout.write(
+                    "%-12s %8d %8d %8d %10.1f %10.1f %10.1f" % ((profile,) + result)
+                )
+        finally:
+            teardown_test_environment()
+
+    def run_profile(self, path, options):
+        connection.settings_dict["TEST"]["NAME"] = path
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            user = User.objects.create(username="stress")
+            project = Project.objects.create(
+                name="Stress", description="", project_type="BACKEND", author=user
+            )
+            Contributor.objects.create(user=user, project=project)
+            issue_ids = [
+                Issue.objects.create(
+                    title="Issue %d" % index,
+                    priority="LOW",
+                    tag="BUG",
+                    project=project,
+                    author=user,
+                    assigned_to=user,
+                ).id
+                for index in range(10)
+            ]
+            auth = "Bearer %s" % RefreshToken.for_user(user).access_token
+            return self.stress(project.id, user.id, issue_ids, auth, options)
+        finally:
+            connections.close_all()
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    def stress(self, project_id, user_id, issue_ids, auth, options):
+        base = "/projects/%d/issues/" % project_id
+        write_latencies = []
+        read_latencies = []
+        counts = {"locked": 0, "errors": 0}
+        lock = threading.Lock()
+
+        def request(client, method, path, data=None):
+            start = time.perf_counter()
+            try:
+                response = getattr(client, method)(
+                    path, data, content_type="application/json"
+                )
+                failed = response.status_code >= 400
+            except Exception as exc:
+                with lock:
+                    counts["locked" if is_lock_error(exc) else "errors"] += 1
+                return None
+            if failed:
+                with lock:
+                    counts["errors"] += 1
+            return time.perf_counter() - start
+
+        def writer(number):
+            client = Client(HTTP_AUTHORIZATION=auth)
+            for step in range(options["requests"]):
+                issue_id = issue_ids[(number + step) % len(issue_ids)]
+                if step % 10 == 9:
+                    elapsed = request(
+                        client,
+                        "post",
+                        base,
+                        {
+                            "title": "New",
+                            "priority": "LOW",
+                            "tag": "BUG",
+                            "assigned_to": user_id,
+                        },
+                    )
+                elif step % 5 == 4:
+                    status = "Finished" if step % 2 else "In Progress"
+                    elapsed = request(
+                        client, "patch", "%s%d/" % (base, issue_id), {"status": status}
+                    )
+                else:
+                    elapsed = request(
+                        client,
+                        "post",
+                        "%s%d/comments/" % (base, issue_id),
+                        {"text": "Comment %d-%d" % (number, step)},
+                    )
+                if elapsed is not None:
+                    write_latencies.append(elapsed)
+            connections.close_all()
+
+        def reader(number):
+            client = Client(HTTP_AUTHORIZATION=auth)
+            for step in range(options["requests"]):
+                issue_id = issue_ids[(number + step) % len(issue_ids)]
+                path = base if step % 2 else "%s%d/comments/" % (base, issue_id)
+                elapsed = request(client, "get", path)
+                if elapsed is not None:
+                    read_latencies.append(elapsed)
+            connections.close_all()
+
+        threads = [
+            threading.Thread(target=writer, args=(number,))
+            for number in range(options["writers"])
+        ] + [
+            threading.Thread(target=reader, args=(number,))
+            for number in range(options["readers"])
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        return (
+            len(write_latencies),
+            counts["locked"],
+            counts["errors"],
+            statistics.median(write_latencies or [0]) * 1000,
+            percentile(write_latencies, 0.99) * 1000,
+            percentile(read_latencies, 0.99) * 1000,
+        )
@@ -0,0 +1,36 @@
+import asyncio
+
+
+class HybridMiddleware:
+    """
+    Base of the middlewares that run in the mode of the handler: sync under WSGI, async under ASGI.
+
+    Running in the mode of the handler keeps Django from adapting the chain around the middleware, so
+    that under ASGI the async views are not brought back to the thread of the sync views. Calls are
+    dispatched to handle() or to the coroutine ahandle(), which subclasses implement.
+
+    Methods:
+        - handle(self, request): Returns the response of a request, under WSGI.
+        - ahandle(self, request): Returns the response of a request, under ASGI.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = asyncio.iscoroutinefunction(get_response)
+        if self.is_async:
+            # Tells the handler that calling the middleware returns a coroutine, as MiddlewareMixin does
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.ahandle(request)
+        return self.handle(request)
+
+    def handle(self, request):
+        raise NotImplementedError
+
+    async def ahandle(self, request):
+        raise NotImplementedError
@@ -0,0 +1,87 @@
+# Generated by Django 3.2.5 on 2026-10-18 06:48
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("Softdesk", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="comment",
+            name="issue",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="comments",
+                to="Softdesk.issue",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="contributor",
+            name="user",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="issue",
+            name="assigned_to",
+            field=models.ForeignKey(
+                db_index=False,
+                default=models.ForeignKey(
+                    on_delete=django.db.models.deletion.CASCADE,
+                    to=settings.AUTH_USER_MODEL,
+                ),
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="issue_assignee",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="issue",
+            name="project",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="issues",
+                to="Softdesk.project",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(
+                fields=["issue", "time_created"], name="comment_issue_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="comment",
+            index=models.Index(fields=["unique_identifier"], name="comment_uuid_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="contributor",
+            index=models.Index(
+                fields=["user", "project"], name="contributor_user_project_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="issue",
+            index=models.Index(
+                fields=["project", "time_created"], name="issue_project_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="issue",
+            index=models.Index(
+                fields=["assigned_to", "status"], name="issue_assignee_status_idx"
+            ),
+        ),
+    ]
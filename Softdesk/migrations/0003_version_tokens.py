@@ -0,0 +1,29 @@
+# Generated by Django 3.2.5 on 2026-10-18 06:51
+
+from django.db import migrations, models
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("Softdesk", "0002_hot_path_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="comment",
+            name="version",
+            field=models.UUIDField(default=uuid.uuid4, editable=False),
+        ),
+        migrations.AddField(
+            model_name="issue",
+            name="version",
+            field=models.UUIDField(default=uuid.uuid4, editable=False),
+        ),
+        migrations.AddField(
+            model_name="project",
+            name="version",
+            field=models.UUIDField(default=uuid.uuid4, editable=False),
+        ),
+    ]
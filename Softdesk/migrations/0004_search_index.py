@@ -0,0 +1,70 @@
+from django.db import migrations
+
+# Softdesk.search as of this migration, which must not import the live module. External-content FTS5
+# tables indexing the text of issues and comments, keyed by their row id; SQLite only
+SEARCH_TABLES = {
+    "Softdesk_issue_fts": ("Softdesk_issue", ["title", "description"]),
+    "Softdesk_comment_fts": ("Softdesk_comment", ["text"]),
+}
+
+
+def create(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for fts_table, (table, columns) in SEARCH_TABLES.items():
+        names = ", ".join(columns)
+        schema_editor.execute(
+            'CREATE VIRTUAL TABLE IF NOT EXISTS "%s" USING fts5(%s, '
+            "content='%s', content_rowid='id', tokenize='porter unicode61 remove_diacritics 2')"
+            % (fts_table, names, table)
+        )
+        delete = (
+            'INSERT INTO "%s"("%s", rowid, %s) VALUES (\'delete\', old.id, %s);'
+            % (
+                fts_table,
+                fts_table,
+                names,
+                ", ".join("old.%s" % column for column in columns),
+            )
+        )
+        insert = 'INSERT INTO "%s"(rowid, %s) VALUES (new.id, %s);' % (
+            fts_table,
+            names,
+            ", ".join("new.%s" % column for column in columns),
+        )
+        schema_editor.execute(
+            'CREATE TRIGGER IF NOT EXISTS "%s_insert" AFTER INSERT ON "%s" BEGIN %s END'
+            % (fts_table, table, insert)
+        )
+        schema_editor.execute(
+            'CREATE TRIGGER IF NOT EXISTS "%s_delete" AFTER DELETE ON "%s" BEGIN %s END'
+            % (fts_table, table, delete)
+        )
+        schema_editor.execute(
+            'CREATE TRIGGER IF NOT EXISTS "%s_update" AFTER UPDATE OF %s ON "%s" '
+            "BEGIN %s %s END" % (fts_table, names, table, delete, insert)
+        )
+        # Index the rows written before the migration
+        schema_editor.execute(
+            'INSERT INTO "%s"("%s") VALUES (\'rebuild\')' % (fts_table, fts_table)
+        )
+
+
+def drop(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for fts_table in SEARCH_TABLES:
+        for event in ("insert", "update", "delete"):
+            schema_editor.execute('DROP TRIGGER IF EXISTS "%s_%s"' % (fts_table, event))
+        schema_editor.execute('DROP TABLE IF EXISTS "%s"' % fts_table)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("Softdesk", "0003_version_tokens"),
+    ]
+
+    operations = [
+        migrations.RunPython(create, drop),
+    ]
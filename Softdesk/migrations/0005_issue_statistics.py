@@ -0,0 +1,37 @@
+# Generated by Django 3.2.5 on 2026-10-18 06:54
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("Softdesk", "0004_search_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProjectStatistics",
+            fields=[
+                (
+                    "project",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="statistics",
+                        serialize=False,
+                        to="Softdesk.project",
+                    ),
+                ),
+                ("data", models.JSONField()),
+                ("is_stale", models.BooleanField(default=False)),
+                ("time_computed", models.DateTimeField()),
+            ],
+        ),
+        migrations.AddField(
+            model_name="issue",
+            name="time_finished",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 3.2.5 on 2026-10-18 06:57
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+# Softdesk.counters.reconcile_counters as of this migration, which must not import the live models
+def count_of(queryset, group_field):
+    counts = (
+        queryset.filter(**{group_field: OuterRef("pk")})
+        .order_by()
+        .values(group_field)
+        .annotate(count=Count("pk"))
+        .values("count")
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), 0)
+
+
+def backfill(apps, schema_editor):
+    project_model = apps.get_model("Softdesk", "Project")
+    issue_model = apps.get_model("Softdesk", "Issue")
+    comment_model = apps.get_model("Softdesk", "Comment")
+    issues = issue_model.objects.all()
+    project_model.objects.update(
+        issue_count=count_of(issues, "project"),
+        open_issue_count=count_of(issues.exclude(status="Finished"), "project"),
+    )
+    issue_model.objects.update(
+        comment_count=count_of(comment_model.objects.all(), "issue")
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("Softdesk", "0005_issue_statistics"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="issue",
+            name="comment_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="project",
+            name="issue_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="project",
+            name="open_issue_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name="issue",
+            index=models.Index(
+                fields=["project", "comment_count"], name="issue_project_comments_idx"
+            ),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
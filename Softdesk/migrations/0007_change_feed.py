@@ -0,0 +1,99 @@
+# Generated by Django 3.2.5 on 2026-10-18 07:27
+
+from django.db import migrations, models
+from django.utils import timezone
+
+# Softdesk.changes.backfill_changes as of this migration, which must not import the live models; the
+# table is new, so every row gets a change. Kind, object id, project id and FROM clause of each kind
+SOURCES = [
+    ("project", "t.id", "t.id", "%(Project)s t"),
+    ("contributor", "t.user_id", "t.project_id", "%(Contributor)s t"),
+    ("issue", "t.id", "t.project_id", "%(Issue)s t"),
+    (
+        "comment",
+        "t.id",
+        "i.project_id",
+        "%(Comment)s t INNER JOIN %(Issue)s i ON i.id = t.issue_id",
+    ),
+]
+
+
+def backfill(apps, schema_editor):
+    connection = schema_editor.connection
+    quote = connection.ops.quote_name
+    tables = {
+        name: quote(apps.get_model("Softdesk", name)._meta.db_table)
+        for name in ("Change", "Project", "Contributor", "Issue", "Comment")
+    }
+    now = connection.ops.adapt_datetimefield_value(timezone.now())
+    with connection.cursor() as cursor:
+        for kind, object_id, project_id, source in SOURCES:
+            cursor.execute(
+                (
+                    "INSERT INTO %(Change)s (kind, object_id, project_id, deleted, time) "
+                    "SELECT %%s, {object_id}, {project_id}, %%s, %%s FROM {source} "
+                    "ORDER BY t.id"
+                ).format(object_id=object_id, project_id=project_id, source=source)
+                % tables,
+                [kind, False, now],
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("Softdesk", "0006_denormalized_counters"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Change",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("project", "Project"),
+                            ("issue", "Issue"),
+                            ("comment", "Comment"),
+                            ("contributor", "Contributor"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("object_id", models.BigIntegerField()),
+                ("project_id", models.BigIntegerField()),
+                ("user_id", models.BigIntegerField(blank=True, null=True)),
+                ("deleted", models.BooleanField(default=False)),
+                ("time", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="change",
+            index=models.Index(
+                fields=["project_id", "id"], name="change_project_seq_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="change",
+            index=models.Index(fields=["kind", "object_id"], name="change_object_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="change",
+            index=models.Index(
+                condition=models.Q(("user_id__isnull", False)),
+                fields=["user_id", "id"],
+                name="change_user_seq_idx",
+            ),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
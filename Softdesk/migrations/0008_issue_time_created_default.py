@@ -0,0 +1,19 @@
+# Generated by Django 3.2.5 on 2026-10-18 07:48
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Softdesk', '0007_change_feed'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='issue',
+            name='time_created',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False),
+        ),
+    ]
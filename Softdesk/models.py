@@ -1,21 +1,51 @@
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 import uuid
 
 
+class VersionedModel(models.Model):
+    """
+    Abstract model carrying a version token that changes on every save.
+
+    The token is a random UUID rather than a counter so that concurrent writers never produce the same
+    version for different contents. It is used to answer conditional requests (ETag / If-None-Match).
+    """
+
+    version = models.UUIDField(default=uuid.uuid4, editable=False)
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        self.version = uuid.uuid4()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            kwargs["update_fields"] = {*update_fields, "version"}
+        super().save(*args, **kwargs)
+
+
 class Contributor(models.Model):
     """Represents a user who contributes to a project"""
 
-    user = models.ForeignKey(to=settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    # Indexed user-first by Meta.indexes for the membership lookups
+    user = models.ForeignKey(
+        to=settings.AUTH_USER_MODEL, on_delete=models.CASCADE, db_index=False
+    )
     project = models.ForeignKey(
         to="Project", on_delete=models.CASCADE, related_name="contributors"
     )
 
     class Meta:
         unique_together = ("project", "user")
+        indexes = [
+            models.Index(
+                fields=["user", "project"], name="contributor_user_project_idx"
+            ),
+        ]
 
 
-class Project(models.Model):
+class Project(VersionedModel):
     """Represents a project in the SoftDesk Support system"""
 
     TYPES_CHOICES = (
@@ -29,12 +59,15 @@ class Project(models.Model):
     description = models.TextField()
     project_type = models.CharField(max_length=20, choices=TYPES_CHOICES)
     author = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    # Maintained by Softdesk.signals and the bulk endpoints, rebuilt by `reconcile_counters`
+    issue_count = models.PositiveIntegerField(default=0, editable=False)
+    open_issue_count = models.PositiveIntegerField(default=0, editable=False)
 
     def __str__(self):
         return self.name
 
 
-class Issue(models.Model):
+class Issue(VersionedModel):
     """Represents an issue or problem within a project"""
 
     PRIORITY_CHOICES = (
@@ -57,8 +90,9 @@ class Issue(models.Model):
     description = models.CharField(max_length=2048, blank=True)
     priority = models.CharField(max_length=10, choices=PRIORITY_CHOICES)
     tag = models.CharField(max_length=10, choices=TAG_CHOICES)
+    # project and assigned_to are indexed by the composite indexes of Meta.indexes
     project = models.ForeignKey(
-        Project, on_delete=models.CASCADE, related_name="issues"
+        Project, on_delete=models.CASCADE, related_name="issues", db_index=False
     )
     author = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     assigned_to = models.ForeignKey(
@@ -66,19 +100,142 @@ class Issue(models.Model):
         on_delete=models.CASCADE,
         default=author,
         related_name="issue_assignee",
+        db_index=False,
     )
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="To Do")
-    time_created = models.DateTimeField(auto_now_add=True)
+    # Set when the issue is built rather than by auto_now_add at insert time, so that an issue created
+    # finished is stamped with the same time_finished
+    time_created = models.DateTimeField(default=timezone.now, editable=False)
+    # Set when the issue reaches the FINISHED_STATUS, cleared if it is reopened
+    time_finished = models.DateTimeField(null=True, blank=True, editable=False)
+    # Maintained by Softdesk.signals, rebuilt by `reconcile_counters`
+    comment_count = models.PositiveIntegerField(default=0, editable=False)
+
+    FINISHED_STATUS = "Finished"
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["project", "time_created"], name="issue_project_created_idx"
+            ),
+            models.Index(
+                fields=["assigned_to", "status"], name="issue_assignee_status_idx"
+            ),
+            models.Index(
+                fields=["project", "comment_count"], name="issue_project_comments_idx"
+            ),
+        ]
 
     def __str__(self):
         return self.title
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored status so that a save knows whether the issue was open
+        instance._loaded_status = instance.__dict__.get("status")
+        return instance
+
+    @property
+    def is_open(self):
+        return self.status != self.FINISHED_STATUS
+
+    def save(self, *args, **kwargs):
+        self.sync_time_finished()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "status" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "time_finished"}
+        self._previous_status = None
+        if not self._state.adding:
+            self._previous_status = getattr(self, "_loaded_status", None)
+            if self._previous_status is None:
+                self._previous_status = (
+                    Issue.objects.filter(pk=self.pk)
+                    .values_list("status", flat=True)
+                    .first()
+                )
+        super().save(*args, **kwargs)
+        self._loaded_status = self.status
+
+    def sync_time_finished(self, now=None):
+        """
+        Set or clear time_finished according to the status.
+
+        An issue finished from the start finishes when it is created, unless `now` says otherwise.
+        """
+        if self.status != self.FINISHED_STATUS:
+            self.time_finished = None
+        elif self.time_finished is None:
+            if now is None:
+                now = self.time_created if self._state.adding else timezone.now()
+            self.time_finished = now
+
+
+class ProjectStatistics(models.Model):
+    """Precomputed issue statistics of a project, refreshed when its issues change"""
+
+    project = models.OneToOneField(
+        Project, on_delete=models.CASCADE, primary_key=True, related_name="statistics"
+    )
+    data = models.JSONField()
+    is_stale = models.BooleanField(default=False)
+    time_computed = models.DateTimeField()
+
 
-class Comment(models.Model):
+class Comment(VersionedModel):
     """Represents a comment made on an issue"""
 
     text = models.TextField()
-    issue = models.ForeignKey(Issue, on_delete=models.CASCADE, related_name="comments")
+    # Indexed by the (issue, time_created) index of Meta.indexes
+    issue = models.ForeignKey(
+        Issue, on_delete=models.CASCADE, related_name="comments", db_index=False
+    )
     author = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     unique_identifier = models.UUIDField(default=uuid.uuid4, editable=False)
     time_created = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["issue", "time_created"], name="comment_issue_created_idx"
+            ),
+            models.Index(fields=["unique_identifier"], name="comment_uuid_idx"),
+        ]
+
+
+class Change(models.Model):
+    """
+    Records that a project, issue, comment or contributor was saved or deleted, for incremental sync.
+
+    The id is the change sequence: it only grows (AUTOINCREMENT on SQLite) and SQLite commits writers
+    one at a time, so a client that has read every change up to an id never misses a later one.
+    A new change of an object supersedes its earlier ones, so the feed holds one row per object.
+    """
+
+    KIND_CHOICES = (
+        ("project", "Project"),
+        ("issue", "Issue"),
+        ("comment", "Comment"),
+        ("contributor", "Contributor"),
+    )
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    # The id of the changed object, the id of the user for contributors. Plain ids rather than foreign
+    # keys, for tombstones outlive the rows they record.
+    object_id = models.BigIntegerField()
+    project_id = models.BigIntegerField()
+    # Set on the changes only this user may read, e.g. the loss of their membership of a project
+    user_id = models.BigIntegerField(null=True, blank=True)
+    deleted = models.BooleanField(default=False)
+    time = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["project_id", "id"], name="change_project_seq_idx"),
+            models.Index(fields=["kind", "object_id"], name="change_object_idx"),
+            models.Index(
+                fields=["user_id", "id"],
+                name="change_user_seq_idx",
+                condition=models.Q(user_id__isnull=False),
+            ),
+        ]
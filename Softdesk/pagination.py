@@ -0,0 +1,239 @@
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from functools import reduce
+from operator import or_
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, LimitOffsetPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (seek) pagination over a composite ordering.
+
+    Each page is fetched with a range condition on the ordering columns of the last row seen instead
+    of an OFFSET, and no COUNT query is run, so a page costs the same whatever its depth.
+    The ordering is taken from the `keyset_ordering` attribute of the view, or from the ordering
+    requested through an ordering filter backend of the view, and must end with a unique column
+    (e.g. ("time_created", "id") or ("-issue_count", "id")).
+
+    Attributes:
+        cursor_query_param (str): The query parameter holding the opaque cursor.
+        page_size_query_param (str): The query parameter the client may use to set the page size.
+        max_page_size (int): The upper bound of the page size a client may request.
+        default_ordering (tuple): The ordering used when the view does not declare one.
+
+    Methods:
+        - paginate_queryset(self, queryset, request, view): Returns the rows of the requested page.
+        - get_paginated_response(self, data): Wraps the page with its next and previous links.
+    """
+
+    cursor_query_param = "cursor"
+    page_size_query_param = "limit"
+    max_page_size = 100
+    default_ordering = ("id",)
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.model = queryset.model
+        position, reverse, inclusive = self.decode_cursor(request)
+
+        if position is not None:
+            queryset = queryset.filter(
+                self.get_seek_condition(position, reverse, inclusive)
+            )
+        if reverse:
+            queryset = queryset.order_by(*map(self._flip, self.ordering))
+        else:
+            queryset = queryset.order_by(*self.ordering)
+
+        rows = list(queryset[: self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+        if reverse:
+            rows.reverse()
+
+        if reverse:
+            self.has_next = position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+        self.first_row = rows[0] if rows else None
+        self.last_row = rows[-1] if rows else None
+        self.position = position
+        return rows
+
+    @property
+    def fields(self):
+        """The ordering columns, without their direction."""
+        return tuple(spec.lstrip("-") for spec in self.ordering)
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return api_settings.PAGE_SIZE
+        if page_size <= 0:
+            return api_settings.PAGE_SIZE
+        return min(page_size, self.max_page_size)
+
+    def get_ordering(self, request, queryset, view):
+        """Return the ordering requested through an ordering filter, else the keyset_ordering."""
+        for backend in getattr(view, "filter_backends", ()):
+            param = getattr(backend, "ordering_param", None)
+            if param and request.query_params.get(param):
+                ordering = backend().get_ordering(request, queryset, view)
+                if ordering:
+                    return tuple(ordering)
+        return tuple(getattr(view, "keyset_ordering", self.default_ordering))
+
+    def get_seek_condition(self, position, reverse, inclusive):
+        """
+        Build the condition selecting the rows after (or before) a position.
+
+        The leading column is also constrained with a plain range, so that the database can seek into
+        the index instead of evaluating the OR branches on every row.
+        """
+        branches = []
+        for index, (spec, field) in enumerate(zip(self.ordering, self.fields)):
+            lookup, inclusive_lookup = self._lookups(spec, reverse)
+            branch = {f: position[f] for f in self.fields[:index]}
+            if inclusive and index == len(self.fields) - 1:
+                branch["%s__%s" % (field, inclusive_lookup)] = position[field]
+            else:
+                branch["%s__%s" % (field, lookup)] = position[field]
+            branches.append(Q(**branch))
+        leading = self.fields[0]
+        leading_lookup = self._lookups(self.ordering[0], reverse)[1]
+        return Q(**{"%s__%s" % (leading, leading_lookup): position[leading]}) & reduce(
+            or_, branches
+        )
+
+    @staticmethod
+    def _flip(spec):
+        return spec[1:] if spec.startswith("-") else "-" + spec
+
+    @staticmethod
+    def _lookups(spec, reverse):
+        """The strict and inclusive lookups moving forward along one ordering column."""
+        if spec.startswith("-") != reverse:
+            return "lt", "lte"
+        return "gt", "gte"
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        row = self.last_row
+        if row is None:
+            # An empty page reached backwards: resume from the original position.
+            return self.encode_cursor(self.position, reverse=False, inclusive=True)
+        return self.encode_cursor(self.get_position(row), reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        row = self.first_row
+        if row is None:
+            return self.encode_cursor(self.position, reverse=True, inclusive=True)
+        return self.encode_cursor(self.get_position(row), reverse=True)
+
+    def get_position(self, row):
+        return {field: getattr(row, field) for field in self.fields}
+
+    def encode_cursor(self, position, reverse, inclusive=False):
+        url = self.request.build_absolute_uri()
+        values = [self._encode_value(position[field]) for field in self.fields]
+        payload = json.dumps(
+            {"p": values, "r": int(reverse), "i": int(inclusive)}, separators=(",", ":")
+        )
+        token = base64.urlsafe_b64encode(payload.encode("ascii")).decode("ascii")
+        return replace_query_param(url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None, False, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(token.encode("ascii")))
+            values = payload["p"]
+            if len(values) != len(self.fields):
+                raise ValueError
+            position = {
+                field: self.model._meta.get_field(field).to_python(value)
+                for field, value in zip(self.fields, values)
+            }
+            return position, bool(payload.get("r")), bool(payload.get("i"))
+        except (
+            TypeError,
+            ValueError,
+            KeyError,
+            UnicodeEncodeError,
+            binascii.Error,
+            ValidationError,
+        ):
+            raise NotFound(self.invalid_cursor_message)
+
+    @staticmethod
+    def _encode_value(value):
+        if isinstance(value, (datetime, date)):
+            return value.isoformat()
+        return value
+
+
+class OptionalKeysetPagination(LimitOffsetPagination):
+    """
+    Limit/offset pagination that switches to keyset pagination when the client asks for it.
+
+    Requests keep the usual limit/offset contract by default. Passing `?pagination=cursor` (or a
+    `cursor` obtained from a previous keyset page) serves the request with KeysetPagination instead,
+    ordered on the requested ordering or the `keyset_ordering` attribute of the view.
+
+    Attributes:
+        mode_query_param (str): The query parameter used to opt in to keyset pagination.
+        keyset_class (class): The pagination class used for keyset pages.
+
+    Methods:
+        - paginate_queryset(self, queryset, request, view): Delegates to the selected pagination style.
+        - get_paginated_response(self, data): Builds the response of the selected pagination style.
+    """
+
+    mode_query_param = "pagination"
+    keyset_class = KeysetPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if self.wants_keyset(request):
+            self.keyset = self.keyset_class()
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def wants_keyset(self, request):
+        return (
+            request.query_params.get(self.mode_query_param) == "cursor"
+            or self.keyset_class.cursor_query_param in request.query_params
+        )
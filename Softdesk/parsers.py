@@ -0,0 +1,54 @@
+import codecs
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser
+
+from Softdesk import fastjson
+from Softdesk.renderers import FastJSONRenderer, NDJSONRenderer
+
+
+class FastJSONParser(JSONParser):
+    """
+    Parser for JSON decoding with orjson, falling back to DRF's JSONParser when it is missing.
+    """
+
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if fastjson.orjson is None:
+            return super().parse(stream, media_type, parser_context)
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        data = stream.read()
+        try:
+            if encoding.lower().replace("-", "") != "utf8":
+                data = data.decode(encoding)
+            return fastjson.loads(data)
+        except ValueError as exc:
+            raise ParseError("JSON parse error - %s" % exc)
+
+
+class NDJSONParser(BaseParser):
+    """
+    Parser for newline-delimited JSON, one object per line.
+
+    Blank lines are ignored. The parsed rows are returned as a list, like a JSON array body.
+    """
+
+    media_type = "application/x-ndjson"
+    renderer_class = NDJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        rows = []
+        for number, line in enumerate(codecs.getreader(encoding)(stream), 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                rows.append(fastjson.loads(line))
+            except ValueError as exc:
+                raise ParseError("NDJSON parse error on line %d - %s" % (number, exc))
+        return rows
@@ -1,5 +1,65 @@
 from rest_framework.permissions import BasePermission, SAFE_METHODS
 
+from Softdesk.models import Contributor
+
+
+def get_contributor_project_ids(request):
+    """
+    Return the ids of the projects the requesting user contributes to.
+
+    The ids are loaded with a single query the first time they are needed and memoized on the
+    request, so every permission check and queryset built while serving that request shares them.
+
+    Args:
+        request (Request): The current request.
+
+    Returns:
+        frozenset: The ids of the projects the user contributes to.
+    """
+    project_ids = getattr(request, "_contributor_project_ids", None)
+    if project_ids is None:
+        user = request.user
+        if user.is_authenticated:
+            project_ids = frozenset(
+                Contributor.objects.filter(user_id=user.id).values_list(
+                    "project_id", flat=True
+                )
+            )
+        else:
+            project_ids = frozenset()
+        request._contributor_project_ids = project_ids
+    return project_ids
+
+
+def is_project_contributor(request, project_id):
+    """
+    Check whether the requesting user contributes to a project or is a superuser.
+
+    Args:
+        request (Request): The current request.
+        project_id (int or str): The id of the project, as found in the URL kwargs.
+
+    Returns:
+        bool: True if the user may read the project.
+    """
+    if request.user.is_superuser:
+        return True
+    try:
+        project_id = int(project_id)
+    except (TypeError, ValueError):
+        return False
+    return project_id in get_contributor_project_ids(request)
+
+
+def get_view_project_id(view):
+    """
+    Return the id of the project targeted by a view, or None for top-level project lists.
+    """
+    project_pk = view.kwargs.get("project_pk")
+    if project_pk is None:
+        return view.kwargs.get("pk")
+    return project_pk
+
 
 class AuthorOrReadOnly(BasePermission):
     """
@@ -19,30 +79,13 @@ class AuthorOrReadOnly(BasePermission):
     """
 
     def has_object_permission(self, request, view, obj):
-        project_pk = view.kwargs.get("project_pk")
-        pk = view.kwargs.get("pk")
-        user = request.user
-        if project_pk is None:
-            if pk is None:
-                return True
-            else:
-                project_id = pk
-        else:
-            project_id = project_pk
+        project_id = get_view_project_id(view)
+        if project_id is None:
+            return True
 
         if request.method in SAFE_METHODS:
-            user.contributor_set.filter(
-                project_id=project_id
-            ).exists() or request.user.is_superuser
-            return (
-                user.contributor_set.filter(project_id=project_id).exists()
-                or request.user.is_superuser
-            )
-        else:
-            if obj.author == request.user:
-                print("author")
-                return True
-            return False
+            return is_project_contributor(request, project_id)
+        return obj.author_id == request.user.id
 
 
 class IsContributor(BasePermission):
@@ -62,17 +105,9 @@ class IsContributor(BasePermission):
     """
 
     def has_permission(self, request, view):
-        project_pk = view.kwargs.get("project_pk")
-        pk = view.kwargs.get("pk")
-        user = request.user
-        if project_pk is None:
-            if pk is None:
-                return True
-            else:
-                project_id = pk
-        else:
-            project_id = project_pk
-        return user.is_authenticated and (
-            user.contributor_set.filter(project_id=project_id).exists()
-            or request.user.is_superuser
+        project_id = get_view_project_id(view)
+        if project_id is None:
+            return True
+        return request.user.is_authenticated and is_project_contributor(
+            request, project_id
         )
@@ -0,0 +1,138 @@
+import cProfile
+import itertools
+import os
+import re
+import time
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.conf import settings
+from rest_framework.exceptions import AuthenticationFailed
+
+from accounts.authentication import CachedJWTAuthentication
+from Softdesk.middleware import HybridMiddleware
+
+PROFILE_HEADER = "HTTP_X_PROFILE"
+PROFILE_QUERY_PARAM = "profile"
+PROFILE_SUFFIX = ".prof"
+
+
+class ProfileRing:
+    """
+    A bounded on-disk ring of cProfile dumps.
+
+    Each dump is written to its own file, named after its time, process and request; once `size`
+    dumps are stored, saving one deletes the oldest. Processes may share the directory.
+
+    Attributes:
+        directory (str): The directory of the dumps, created when the first one is saved.
+        size (int): The number of dumps kept.
+
+    Methods:
+        - save(profile, label): Writes a profile and returns the name of its file.
+        - paths(): Returns the paths of the stored dumps, oldest first.
+    """
+
+    def __init__(self, directory, size):
+        self.directory = directory
+        self.size = size
+        self._sequence = itertools.count()
+
+    def save(self, profile, label):
+        os.makedirs(self.directory, exist_ok=True)
+        name = "%s-%d-%d-%s%s" % (
+            time.strftime("%Y%m%dT%H%M%S"),
+            os.getpid(),
+            next(self._sequence),
+            re.sub(r"[^A-Za-z0-9]+", "_", label).strip("_")[:80],
+            PROFILE_SUFFIX,
+        )
+        profile.dump_stats(os.path.join(self.directory, name))
+        paths = self.paths()
+        stale = max(len(paths) - self.size, 0)
+        for path in paths[:stale]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                # Pruned by another process
+                pass
+        return name
+
+    def paths(self):
+        if not os.path.isdir(self.directory):
+            return []
+        paths = [
+            os.path.join(self.directory, name)
+            for name in os.listdir(self.directory)
+            if name.endswith(PROFILE_SUFFIX)
+        ]
+        # Names start with the time of the dump
+        return sorted(paths)
+
+
+profile_ring = ProfileRing(
+    settings.SOFTDESK_PROFILE_DIR, settings.SOFTDESK_PROFILE_RING_SIZE
+)
+
+
+def profiling_requested(request):
+    """Check whether the request asks to be profiled, with `X-Profile: 1` or `?profile=1`."""
+    flag = request.META.get(PROFILE_HEADER) or request.GET.get(PROFILE_QUERY_PARAM)
+    return flag is not None and flag.lower() in ("1", "true", "yes", "on")
+
+
+def is_superuser_request(request):
+    """Authenticate the bearer token of a request, independently of the view, as DRF will."""
+    try:
+        authenticated = CachedJWTAuthentication().authenticate(request)
+    except AuthenticationFailed:
+        return False
+    return authenticated is not None and authenticated[0].is_superuser
+
+
+class ProfilingMiddleware(HybridMiddleware):
+    """
+    Profile single requests on demand with cProfile.
+
+    Off unless SOFTDESK_PROFILING is set. A request flagged with `X-Profile: 1` or `?profile=1` and
+    authenticated as a superuser is profiled from this middleware down, view and rendering included;
+    the dump is saved to profile_ring and its file name returned in the X-Profile header. Other
+    requests only pay for the flag lookup. Work that async views hand to other threads is not seen
+    by the profiler, which follows the calling thread.
+
+    The middleware runs in the mode of the handler. Under ASGI, a profiled request is served from a
+    thread of its own, where its sync views run too, so that the profiler sees them; the other
+    requests stay on the event loop.
+    """
+
+    def handle(self, request):
+        if not (
+            settings.SOFTDESK_PROFILING
+            and profiling_requested(request)
+            and is_superuser_request(request)
+        ):
+            return self.get_response(request)
+        return self.profile(request, self.get_response)
+
+    async def ahandle(self, request):
+        if not (
+            settings.SOFTDESK_PROFILING
+            and profiling_requested(request)
+            and await sync_to_async(is_superuser_request)(request)
+        ):
+            return await self.get_response(request)
+        return await sync_to_async(self.profile, thread_sensitive=False)(
+            request, async_to_sync(self.get_response)
+        )
+
+    @staticmethod
+    def profile(request, get_response):
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            response = get_response(request)
+        finally:
+            profile.disable()
+        response["X-Profile"] = profile_ring.save(
+            profile, "%s %s" % (request.method, request.path)
+        )
+        return response
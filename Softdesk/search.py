@@ -0,0 +1,190 @@
+import re
+
+from django.db import connection
+
+# External-content FTS5 tables indexing the text of issues and comments, keyed by their row id
+SEARCH_TABLES = {
+    "Softdesk_issue_fts": ("Softdesk_issue", ["title", "description"]),
+    "Softdesk_comment_fts": ("Softdesk_comment", ["text"]),
+}
+
+SNIPPET_TOKENS = 12
+
+
+def drop_search_triggers(using_connection=connection):
+    """
+    Drop the triggers of the FTS5 tables, e.g. before a bulk load followed by rebuild_search_index,
+    which creates them again.
+    """
+    if using_connection.vendor != "sqlite":
+        return
+    with using_connection.cursor() as cursor:
+        for fts_table in SEARCH_TABLES:
+            for event in ("insert", "update", "delete"):
+                cursor.execute('DROP TRIGGER IF EXISTS "%s_%s"' % (fts_table, event))
+
+
+def ensure_search_triggers(using_connection=connection):
+    """
+    Create the triggers keeping the FTS5 tables in sync with issues and comments, if missing.
+
+    Triggers also cover bulk_create, queryset updates and cascade deletes. SQLite drops them when a
+    migration rebuilds the table, so this runs again after every migrate. Tables whose FTS5 index has
+    not been created yet are skipped.
+    """
+    if using_connection.vendor != "sqlite":
+        return
+    with using_connection.cursor() as cursor:
+        for fts_table, (table, columns) in SEARCH_TABLES.items():
+            cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s",
+                [fts_table],
+            )
+            if cursor.fetchone() is None:
+                # The search migration has not been applied yet
+                continue
+            names = ", ".join(columns)
+            new_values = ", ".join("new.%s" % column for column in columns)
+            old_values = ", ".join("old.%s" % column for column in columns)
+            delete = (
+                'INSERT INTO "%s"("%s", rowid, %s) VALUES (\'delete\', old.id, %s);'
+                % (fts_table, fts_table, names, old_values)
+            )
+            insert = 'INSERT INTO "%s"(rowid, %s) VALUES (new.id, %s);' % (
+                fts_table,
+                names,
+                new_values,
+            )
+            cursor.execute(
+                'CREATE TRIGGER IF NOT EXISTS "%s_insert" AFTER INSERT ON "%s" BEGIN %s END'
+                % (fts_table, table, insert)
+            )
+            cursor.execute(
+                'CREATE TRIGGER IF NOT EXISTS "%s_delete" AFTER DELETE ON "%s" BEGIN %s END'
+                % (fts_table, table, delete)
+            )
+            cursor.execute(
+                'CREATE TRIGGER IF NOT EXISTS "%s_update" AFTER UPDATE OF %s ON "%s" '
+                "BEGIN %s %s END" % (fts_table, names, table, delete, insert)
+            )
+
+
+def rebuild_search_index(using_connection=connection):
+    """Rebuild the FTS5 tables from the content of the issue and comment tables."""
+    ensure_search_triggers(using_connection)
+    with using_connection.cursor() as cursor:
+        for fts_table in SEARCH_TABLES:
+            cursor.execute(
+                'INSERT INTO "%s"("%s") VALUES (\'rebuild\')' % (fts_table, fts_table)
+            )
+            cursor.execute(
+                'INSERT INTO "%s"("%s") VALUES (\'optimize\')' % (fts_table, fts_table)
+            )
+
+
+def build_match_query(text):
+    """
+    Turn free text into an FTS5 query matching every word, so user input cannot inject FTS syntax.
+    """
+    words = re.findall(r"\w+", text)
+    return " ".join('"%s"' % word for word in words)
+
+
+class SearchResults:
+    """
+    Lazy, sliceable result set of a full-text search over issues and comments, ranked by relevance.
+
+    bm25 scores depend on the statistics of the table they are computed on, so issue and comment
+    scores are not comparable as they are. Each is divided by the best bm25 score of its own table,
+    which gives a score between 0 and 1, 1 for the best match of each kind, before both are merged.
+
+    It supports count() and slicing like a queryset, so DRF paginators can page through it; each
+    slice runs one ranked query with LIMIT/OFFSET.
+
+    Attributes:
+        match (str): The FTS5 query.
+        project_ids (iterable): The projects searched, or None to search every project.
+        kinds (tuple): The record kinds searched, among "issue" and "comment".
+    """
+
+    def __init__(self, match, project_ids=None, kinds=("issue", "comment")):
+        self.match = match
+        self.project_ids = None if project_ids is None else sorted(project_ids)
+        self.kinds = kinds
+
+    @staticmethod
+    def _result_columns(kind, id, issue, fts_table, snippet_column):
+        return (
+            "%s AS kind, %s AS id, %s AS issue, i.project_id AS project, i.title AS title, "
+            "snippet(%s, %d, '[', ']', '...', %d) AS snippet, bm25(%s) AS bm25"
+            % (kind, id, issue, fts_table, snippet_column, SNIPPET_TOKENS, fts_table)
+        )
+
+    def _project_filter(self):
+        if self.project_ids is None:
+            return "", []
+        placeholders = ", ".join(["%s"] * len(self.project_ids))
+        return " AND i.project_id IN (%s)" % placeholders, list(self.project_ids)
+
+    def _selects(self, columns):
+        project_filter, project_params = self._project_filter()
+        selects, params = [], []
+        if "issue" in self.kinds:
+            selects.append(
+                "SELECT %s FROM Softdesk_issue_fts f "
+                "JOIN Softdesk_issue i ON i.id = f.rowid "
+                "WHERE Softdesk_issue_fts MATCH %%s%s"
+                % (columns["issue"], project_filter)
+            )
+            params += [self.match] + project_params
+        if "comment" in self.kinds:
+            selects.append(
+                "SELECT %s FROM Softdesk_comment_fts f "
+                "JOIN Softdesk_comment c ON c.id = f.rowid "
+                "JOIN Softdesk_issue i ON i.id = c.issue_id "
+                "WHERE Softdesk_comment_fts MATCH %%s%s"
+                % (columns["comment"], project_filter)
+            )
+            params += [self.match] + project_params
+        return selects, params
+
+    def count(self):
+        if not self.match or self.project_ids == []:
+            return 0
+        selects, params = self._selects({"issue": "COUNT(*)", "comment": "COUNT(*)"})
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT %s" % " + ".join("(%s)" % select for select in selects), params
+            )
+            return cursor.fetchone()[0]
+
+    def __getitem__(self, item):
+        if not isinstance(item, slice):
+            raise TypeError("SearchResults only supports slicing.")
+        if not self.match or self.project_ids == []:
+            return []
+        start = item.start or 0
+        limit = -1 if item.stop is None else max(item.stop - start, 0)
+        selects, params = self._selects(
+            {
+                "issue": self._result_columns(
+                    "'issue'", "i.id", "i.id", "Softdesk_issue_fts", -1
+                ),
+                "comment": self._result_columns(
+                    "'comment'", "c.id", "c.issue_id", "Softdesk_comment_fts", 0
+                ),
+            }
+        )
+        # bm25 cannot be used in a window, hence the subquery. bm25 is negative, lower is better
+        sql = " UNION ALL ".join(
+            "SELECT kind, id, issue, project, title, snippet, "
+            "COALESCE(bm25 / NULLIF(MIN(bm25) OVER (), 0), 1.0) AS score FROM (%s)"
+            % select
+            for select in selects
+        )
+        sql += " ORDER BY score DESC, kind, id LIMIT %s OFFSET %s"
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params + [limit, start])
+            rows = cursor.fetchall()
+        keys = ["kind", "id", "issue", "project", "title", "snippet", "score"]
+        return [dict(zip(keys, row)) for row in rows]
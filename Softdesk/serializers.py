@@ -1,11 +1,38 @@
+from django.conf import settings
 from rest_framework import serializers
+from rest_framework.reverse import reverse
+from rest_framework.utils.urls import replace_query_param
 from Softdesk.models import Project, Issue, Comment, Contributor
 
 from accounts.models import User
 from accounts.serializers import UserListSerializer
+from Softdesk.fieldsets import SparseFieldsetMixin
+from Softdesk.instrumentation import TimedRepresentationMixin
 
 
-class ContributorSerializer(serializers.ModelSerializer):
+def embed_requested(context, query_param):
+    """
+    Check whether the client asked to keep an embedded list in the response.
+
+    Embeds are on by default and can be turned off with `?<query_param>=false` (or 0, no, off).
+
+    Args:
+        context (dict): The serializer context, holding the current request if any.
+        query_param (str): The query parameter controlling the embed.
+
+    Returns:
+        bool: True if the embedded list should be rendered.
+    """
+    request = context.get("request")
+    if request is None:
+        return True
+    value = request.query_params.get(query_param)
+    return value is None or value.lower() not in ("0", "false", "no", "off")
+
+
+class ContributorSerializer(
+    TimedRepresentationMixin, SparseFieldsetMixin, serializers.ModelSerializer
+):
     """
     Serializer for Contributor model.
     Attributes:
@@ -29,7 +56,9 @@ class ContributorSerializer(serializers.ModelSerializer):
         return UserListSerializer(queryset, many=True).data
 
 
-class ProjectListSerializer(serializers.ModelSerializer):
+class ProjectListSerializer(
+    TimedRepresentationMixin, SparseFieldsetMixin, serializers.ModelSerializer
+):
     """
     Serializer for Project model used in list views.
 
@@ -42,10 +71,19 @@ class ProjectListSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Project
-        fields = ["id", "name", "project_type", "author"]
+        fields = [
+            "id",
+            "name",
+            "project_type",
+            "author",
+            "issue_count",
+            "open_issue_count",
+        ]
 
 
-class ProjectDetailSerializer(serializers.ModelSerializer):
+class ProjectDetailSerializer(
+    TimedRepresentationMixin, SparseFieldsetMixin, serializers.ModelSerializer
+):
     """
     Serializer for Project model used in detail views.
 
@@ -56,7 +94,8 @@ class ProjectDetailSerializer(serializers.ModelSerializer):
             read_only_fields (list): The fields that should be read-only.
 
     Methods:
-        - get_issues(self, instance): Retrieves and serializes associated issues.
+        - get_fields(self): Drops the embedded issues when the client passes `?embed_issues=false`.
+        - get_issues(self, instance): Retrieves and serializes the first page of associated issues.
 
     """
 
@@ -74,15 +113,48 @@ class ProjectDetailSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ["author"]
 
+    def get_fields(self):
+        fields = super().get_fields()
+        if not embed_requested(self.context, "embed_issues"):
+            fields.pop("issues", None)
+        return fields
+
     def get_issues(self, instance):
-        queryset = Issue.objects.filter(project=instance.id)
-        return IssueListSerializer(queryset, many=True).data
+        """
+        Embed at most SOFTDESK_EMBEDDED_ISSUES_LIMIT issues, with the total count and a link to the
+        next page of the project's issue list.
+        """
+        limit = settings.SOFTDESK_EMBEDDED_ISSUES_LIMIT
+        queryset = Issue.objects.filter(project=instance.id).order_by(
+            "time_created", "id"
+        )
+        issues = list(queryset[:limit])
+        if len(issues) < limit:
+            count = len(issues)
+        else:
+            count = queryset.count()
+        next_url = None
+        if count > limit:
+            next_url = reverse(
+                "issues-list",
+                kwargs={"project_pk": instance.id},
+                request=self.context.get("request"),
+            )
+            next_url = replace_query_param(next_url, "limit", limit)
+            next_url = replace_query_param(next_url, "offset", limit)
+        return {
+            "count": count,
+            "next": next_url,
+            "results": IssueListSerializer(issues, many=True).data,
+        }
 
     def validate_author(self, value):
         return value  # Bypass the validation for author field
 
 
-class IssueListSerializer(serializers.ModelSerializer):
+class IssueListSerializer(
+    TimedRepresentationMixin, SparseFieldsetMixin, serializers.ModelSerializer
+):
     """
     Serializer for Issue model used in list views.
 
@@ -102,25 +174,31 @@ class IssueListSerializer(serializers.ModelSerializer):
             "project",
             "assigned_to",
             "status",
+            "comment_count",
         ]
 
 
-class IssueDetailSerializer(serializers.ModelSerializer):
+class IssueDetailSerializer(
+    TimedRepresentationMixin, SparseFieldsetMixin, serializers.ModelSerializer
+):
     """
     Serializer for Issue model used in detail views.
 
     Attributes:
+        - sparse_required_fields (tuple): The project is read to link the comment history.
         - Meta:
             model (Issue): The Issue model class to serialize.
             fields (list): The fields to include in the serialized data.
             read_only_fields (list): The fields that should be read-only.
 
     Methods:
-        - get_comments(self, instance): Retrieves and serializes associated comments.
+        - get_fields(self): Drops the embedded comments when the client passes `?embed_comments=false`.
+        - get_comments(self, instance): Retrieves and serializes the latest associated comments.
 
     """
 
     comments = serializers.SerializerMethodField()
+    sparse_required_fields = ("project",)
 
     class Meta:
         model = Issue
@@ -139,12 +217,121 @@ class IssueDetailSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ["author", "project"]
 
+    def get_fields(self):
+        fields = super().get_fields()
+        if not embed_requested(self.context, "embed_comments"):
+            fields.pop("comments", None)
+        return fields
+
     def get_comments(self, instance):
+        """
+        Embed the SOFTDESK_EMBEDDED_COMMENTS_LIMIT latest comments, newest first, with the total count
+        and a link to the streamed comment history of the issue.
+        """
+        limit = settings.SOFTDESK_EMBEDDED_COMMENTS_LIMIT
         queryset = Comment.objects.filter(issue=instance.id)
-        return CommentListSerializer(queryset, many=True).data
+        comments = list(queryset.order_by("-time_created", "-id")[:limit])
+        if len(comments) < limit:
+            count = len(comments)
+        else:
+            count = queryset.count()
+        history_url = reverse(
+            "comments-stream",
+            kwargs={"project_pk": instance.project_id, "issue_pk": instance.id},
+            request=self.context.get("request"),
+        )
+        return {
+            "count": count,
+            "history": history_url,
+            "results": CommentListSerializer(comments, many=True).data,
+        }
+
+
+class IssueImportSerializer(serializers.ModelSerializer):
+    """
+    Serializer validating the rows of a bulk issue import.
+
+    The assignee is validated as a plain id so that rows can be checked without a query each; the
+    bulk import checks every referenced user at once.
+
+    Attributes:
+        - Meta:
+            model (Issue): The Issue model class to validate.
+            fields (list): The fields accepted for each imported issue.
+
+    """
+
+    assigned_to = serializers.IntegerField(required=False, min_value=1)
+
+    class Meta:
+        model = Issue
+        fields = [
+            "title",
+            "description",
+            "priority",
+            "tag",
+            "status",
+            "assigned_to",
+        ]
+
+
+class IssueFilterSerializer(serializers.Serializer):
+    """
+    Serializer validating the filter selecting the issues of a bulk transition.
+
+    Every field is optional, but at least one is required so that an empty filter does not select
+    every issue; the issues must match all the given fields.
+
+    Methods:
+        - validate(self, attrs): Checks that at least one field is given.
+    """
+
+    status = serializers.ChoiceField(choices=Issue.STATUS_CHOICES, required=False)
+    priority = serializers.ChoiceField(choices=Issue.PRIORITY_CHOICES, required=False)
+    tag = serializers.ChoiceField(choices=Issue.TAG_CHOICES, required=False)
+    assigned_to = serializers.IntegerField(required=False, min_value=1)
+
+    def validate(self, attrs):
+        if not attrs:
+            raise serializers.ValidationError("Provide at least one filter field.")
+        return attrs
 
 
-class CommentListSerializer(serializers.ModelSerializer):
+class IssueTransitionSerializer(serializers.Serializer):
+    """
+    Serializer validating a bulk transition of issues.
+
+    The issues are selected either by `ids` or by `filter`, and receive the target `status` and/or
+    `assigned_to`.
+
+    Methods:
+        - validate(self, attrs): Checks that exactly one selector and at least one change are given.
+
+    """
+
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        required=False,
+        allow_empty=False,
+        max_length=settings.SOFTDESK_BULK_TRANSITION_MAX_ROWS,
+    )
+    filter = IssueFilterSerializer(required=False)
+    status = serializers.ChoiceField(choices=Issue.STATUS_CHOICES, required=False)
+    assigned_to = serializers.PrimaryKeyRelatedField(
+        queryset=User.objects.all(), required=False
+    )
+
+    def validate(self, attrs):
+        if ("ids" in attrs) == ("filter" in attrs):
+            raise serializers.ValidationError("Provide either ids or filter.")
+        if "status" not in attrs and "assigned_to" not in attrs:
+            raise serializers.ValidationError("Provide a status or an assigned_to.")
+        return attrs
+
+
+class CommentListSerializer(
+    TimedRepresentationMixin, SparseFieldsetMixin, serializers.ModelSerializer
+):
     """
     Serializer for Comment model used in list views.
 
@@ -163,7 +350,9 @@ class CommentListSerializer(serializers.ModelSerializer):
         ]
 
 
-class CommentDetailSerializer(serializers.ModelSerializer):
+class CommentDetailSerializer(
+    TimedRepresentationMixin, SparseFieldsetMixin, serializers.ModelSerializer
+):
     """
     Serializer for Comment model used in detail views.
 
@@ -178,3 +367,12 @@ class CommentDetailSerializer(serializers.ModelSerializer):
         model = Comment
         fields = ["id", "text", "author", "time_created", "unique_identifier", "issue"]
         read_only_fields = ["author", "issue"]
+
+
+# The representation of each kind of object in the change feed and the event streams: the detail
+# representation, without the embedded lists, which would cost queries per object
+FEED_SERIALIZERS = {
+    "project": (ProjectDetailSerializer, {"omit": {"issues"}}),
+    "issue": (IssueDetailSerializer, {"omit": {"comments"}}),
+    "comment": (CommentDetailSerializer, {}),
+}
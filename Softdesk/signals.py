@@ -0,0 +1,193 @@
+import threading
+import uuid
+from functools import partial
+
+from django.db.models import F, Subquery
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from Softdesk.cache import detail_cache
+from Softdesk.changes import (
+    forget_changes,
+    record_changes,
+    record_membership_lost,
+    record_project_deleted,
+)
+from Softdesk.events import close_event_streams, publish_event, publish_saved
+from Softdesk.models import Comment, Contributor, Issue, Project
+from Softdesk.statistics import mark_rollups_stale
+
+# Primary keys of the projects and issues whose deletion is in progress in this thread, so that the
+# rows deleted by cascade do not update a parent that is about to disappear, and the ids of the comments
+# deleted by cascade per issue
+_deleting = threading.local()
+
+
+def _being_deleted(model, pk):
+    return (model, pk) in getattr(_deleting, "keys", ())
+
+
+def counter_changes(**deltas):
+    """Turn counter deltas into F() expressions for an UPDATE, leaving out the null ones."""
+    return {field: F(field) + delta for field, delta in deltas.items() if delta}
+
+
+def touch_projects(*project_ids, stale_rollups=True, **changes):
+    """
+    Record that the issues of projects changed: give the projects new version tokens, drop their
+    cached payloads and flag their statistics rollups stale, unless `stale_rollups` is False (e.g. for
+    a comment count, which the statistics do not show).
+
+    Extra keyword arguments (e.g. counter_changes()) are applied by the same UPDATE.
+    """
+    Project.objects.filter(pk__in=project_ids).update(version=uuid.uuid4(), **changes)
+    detail_cache.invalidate(Project, *project_ids)
+    if stale_rollups:
+        mark_rollups_stale(*project_ids)
+
+
+def touch_issues(*issue_ids, **changes):
+    """
+    Give new version tokens to issues whose embedded comments changed and drop their cached payloads.
+
+    Extra keyword arguments (e.g. counter_changes()) are applied by the same UPDATE.
+    """
+    Issue.objects.filter(pk__in=issue_ids).update(version=uuid.uuid4(), **changes)
+    detail_cache.invalidate(Issue, *issue_ids)
+
+
+@receiver(pre_delete, sender=Project)
+@receiver(pre_delete, sender=Issue)
+def deletion_started(sender, instance, **kwargs):
+    if not hasattr(_deleting, "keys"):
+        _deleting.keys = set()
+        _deleting.comments = {}
+    _deleting.keys.add((sender, instance.pk))
+
+
+def comment_project_id(comment):
+    """Return the project id of a comment, from its issue when it is loaded."""
+    if Comment._meta.get_field("issue").is_cached(comment):
+        return comment.issue.project_id
+    return (
+        Issue.objects.filter(pk=comment.issue_id)
+        .values_list("project_id", flat=True)
+        .first()
+    )
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+def project_changed(sender, instance, **kwargs):
+    detail_cache.invalidate(Project, instance.pk)
+    if kwargs["signal"] is post_delete:
+        _deleting.keys.discard((Project, instance.pk))
+        record_project_deleted(instance.pk)
+        publish_event("project.deleted", {"id": instance.pk}, instance.pk)
+        close_event_streams(instance.pk)
+    else:
+        record_changes(
+            "project", instance.pk, [instance.pk], supersede=not kwargs["created"]
+        )
+        publish_saved("project", instance, kwargs["created"], instance.pk)
+
+
+@receiver(post_save, sender=Issue)
+def issue_saved(sender, instance, created, **kwargs):
+    detail_cache.invalidate(Issue, instance.pk)
+    if created:
+        changes = counter_changes(issue_count=1, open_issue_count=int(instance.is_open))
+    else:
+        was_open = getattr(instance, "_previous_status", None) != Issue.FINISHED_STATUS
+        changes = counter_changes(open_issue_count=instance.is_open - was_open)
+    touch_projects(instance.project_id, **changes)
+    record_changes("issue", instance.project_id, [instance.pk], supersede=not created)
+    publish_saved("issue", instance, created, instance.project_id, [instance.pk])
+
+
+@receiver(post_delete, sender=Issue)
+def issue_deleted(sender, instance, **kwargs):
+    detail_cache.invalidate(Issue, instance.pk)
+    _deleting.keys.discard((Issue, instance.pk))
+    comment_ids = _deleting.comments.pop(instance.pk, ())
+    if not _being_deleted(Project, instance.project_id):
+        touch_projects(
+            instance.project_id,
+            **counter_changes(issue_count=-1, open_issue_count=-int(instance.is_open))
+        )
+        record_changes("issue", instance.project_id, [instance.pk], deleted=True)
+        # The tombstone of the issue stands for those of its comments
+        forget_changes("comment", instance.project_id, comment_ids)
+        publish_event(
+            "issue.deleted",
+            {"id": instance.pk, "project": instance.project_id},
+            instance.project_id,
+            [instance.pk],
+        )
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def comment_changed(sender, instance, **kwargs):
+    detail_cache.invalidate(Comment, instance.pk)
+    if kwargs["signal"] is post_delete:
+        if _being_deleted(Issue, instance.issue_id):
+            _deleting.comments.setdefault(instance.issue_id, []).append(instance.pk)
+            return
+        touch_issues(instance.issue_id, **counter_changes(comment_count=-1))
+    elif kwargs["created"]:
+        touch_issues(instance.issue_id, **counter_changes(comment_count=1))
+    else:
+        touch_issues(instance.issue_id)
+    deleted = kwargs["signal"] is post_delete
+    if deleted or kwargs["created"]:
+        project_id = event_project_id = comment_project_id(instance)
+        # The issues embedded in the project detail show their comment counts
+        touch_projects(project_id, stale_rollups=False)
+    else:
+        # An edit needs the project for the feed and the event streams only: not worth a query
+        project_id = Subquery(
+            Issue.objects.filter(pk=instance.issue_id).values("project_id")
+        )
+        event_project_id = partial(comment_project_id, instance)
+    record_changes(
+        "comment",
+        project_id,
+        [instance.pk],
+        deleted=deleted,
+        supersede=not kwargs.get("created"),
+    )
+    if deleted:
+        publish_event(
+            "comment.deleted",
+            {"id": instance.pk, "issue": instance.issue_id},
+            event_project_id,
+            [instance.issue_id],
+        )
+    else:
+        publish_saved(
+            "comment",
+            instance,
+            kwargs["created"],
+            event_project_id,
+            [instance.issue_id],
+        )
+
+
+@receiver(post_save, sender=Contributor)
+@receiver(post_delete, sender=Contributor)
+def contributor_changed(sender, instance, **kwargs):
+    detail_cache.invalidate(Project, instance.project_id)
+    if kwargs["signal"] is post_delete:
+        # Also recorded when the project is being deleted: the tombstone tells the member
+        record_membership_lost(instance.project_id, instance.user_id)
+        if _being_deleted(Project, instance.project_id):
+            # The streams end after the "project.deleted" event
+            return
+        close_event_streams(instance.project_id, instance.user_id)
+    record_changes(
+        "contributor",
+        instance.project_id,
+        [instance.user_id],
+        deleted=kwargs["signal"] is post_delete,
+    )
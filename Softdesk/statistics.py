@@ -0,0 +1,133 @@
+from datetime import timedelta
+
+from django.db.models import Count, DurationField, ExpressionWrapper, F, Q
+from django.utils import timezone
+
+from Softdesk.models import Issue, ProjectStatistics
+
+BREAKDOWNS = {
+    "status": Issue.STATUS_CHOICES,
+    "priority": Issue.PRIORITY_CHOICES,
+    "tag": Issue.TAG_CHOICES,
+}
+
+
+def compute_project_statistics(project_id):
+    """
+    Compute the issue statistics of a project with aggregate queries only.
+
+    The status, priority and tag breakdowns and the totals come from one conditional aggregate pass
+    over the project's issues, the assignee breakdown from one GROUP BY, and the median time to finish
+    from a COUNT plus a LIMIT/OFFSET read of the middle row(s). No issue row is loaded.
+
+    Args:
+        project_id (int): The id of the project.
+
+    Returns:
+        dict: The statistics, JSON serializable.
+    """
+    issues = Issue.objects.filter(project_id=project_id)
+
+    aggregates = {
+        "total": Count("id"),
+        "timed": Count("id", filter=Q(time_finished__isnull=False)),
+    }
+    aliases = {}
+    for field, choices in BREAKDOWNS.items():
+        for index, (value, label) in enumerate(choices):
+            alias = "%s_%d" % (field, index)
+            aliases[alias] = (field, value)
+            aggregates[alias] = Count("id", filter=Q(**{field: value}))
+    totals = issues.aggregate(**aggregates)
+
+    statistics = {"total": totals["total"]}
+    for field in BREAKDOWNS:
+        statistics["by_%s" % field] = {}
+    for alias, (field, value) in aliases.items():
+        statistics["by_%s" % field][value] = totals[alias]
+    finished = statistics["by_status"][Issue.FINISHED_STATUS]
+    statistics["finished"] = finished
+    statistics["open"] = totals["total"] - finished
+
+    statistics["by_assignee"] = [
+        {"assigned_to": row["assigned_to"], "count": row["count"]}
+        for row in issues.values("assigned_to")
+        .annotate(count=Count("id"))
+        .order_by("-count", "assigned_to")
+    ]
+    statistics["median_time_to_finish"] = median_time_to_finish(issues, totals["timed"])
+    return statistics
+
+
+def median_time_to_finish(issues, count):
+    """
+    Return the median of time_finished - time_created in seconds, or None if no issue has finished.
+
+    Args:
+        issues (QuerySet): The issues to measure.
+        count (int): The number of those issues with a time_finished.
+    """
+    if not count:
+        return None
+    durations = (
+        issues.filter(time_finished__isnull=False)
+        .annotate(
+            duration=ExpressionWrapper(
+                F("time_finished") - F("time_created"), output_field=DurationField()
+            )
+        )
+        .order_by("duration")
+        .values_list("duration", flat=True)
+    )
+    start, stop = (count - 1) // 2, count // 2 + 1
+    middle = list(durations[start:stop])
+    return (sum(middle, timedelta()) / len(middle)).total_seconds()
+
+
+def get_project_rollup(project_id, max_age):
+    """
+    Return the precomputed statistics of a project, refreshing them only when needed.
+
+    The rollup is recomputed when it does not exist yet, or when issues changed since it was computed
+    and it is older than `max_age` seconds; otherwise the stored statistics are served, flagged stale
+    if issues changed since.
+
+    Refreshes recompute the whole rollup rather than applying per-issue deltas. The median time to
+    finish cannot be kept up to date from deltas, and applying them to the stored JSON on every
+    issue write would add a locked read-modify-write to the write paths, bulk ones included. Issue
+    writes only flag the rollup stale, and the recompute is throttled by `max_age`.
+
+    Args:
+        project_id (int): The id of the project.
+        max_age (int): How long, in seconds, a stale rollup may still be served.
+
+    Returns:
+        ProjectStatistics: The rollup of the project.
+    """
+    rollup = ProjectStatistics.objects.filter(project_id=project_id).first()
+    if rollup is None or (
+        rollup.is_stale
+        and rollup.time_computed < timezone.now() - timedelta(seconds=max_age)
+    ):
+        rollup = refresh_project_rollup(project_id)
+    return rollup
+
+
+def refresh_project_rollup(project_id):
+    """Recompute and store the statistics of a project."""
+    rollup, created = ProjectStatistics.objects.update_or_create(
+        project_id=project_id,
+        defaults={
+            "data": compute_project_statistics(project_id),
+            "is_stale": False,
+            "time_computed": timezone.now(),
+        },
+    )
+    return rollup
+
+
+def mark_rollups_stale(*project_ids):
+    """Flag the rollups of projects whose issues changed, with one UPDATE."""
+    ProjectStatistics.objects.filter(project_id__in=project_ids, is_stale=False).update(
+        is_stale=True
+    )
@@ -0,0 +1,99 @@
+import csv
+from datetime import datetime
+
+from Softdesk import fastjson
+
+# Rows are grouped into chunks of about this many bytes before being handed to the server
+STREAM_BUFFER_SIZE = 64 * 1024
+
+
+def ndjson_lines(rows, buffer_size=STREAM_BUFFER_SIZE):
+    """
+    Encode an iterable of dicts as newline-delimited JSON, one object per line.
+
+    Lines are buffered into chunks of roughly `buffer_size` bytes so the server writes fewer, larger
+    chunks, while memory stays bounded whatever the number of rows.
+
+    Args:
+        rows (iterable): The rows to encode, typically read from a queryset iterator.
+        buffer_size (int): The approximate size of each chunk yielded.
+
+    Yields:
+        bytes: Chunks of encoded lines.
+    """
+    buffer = []
+    size = 0
+    for row in rows:
+        line = fastjson.dumps(row) + b"\n"
+        buffer.append(line)
+        size += len(line)
+        if size >= buffer_size:
+            yield b"".join(buffer)
+            buffer = []
+            size = 0
+    if buffer:
+        yield b"".join(buffer)
+
+
+def iterate_rows(queryset, fields, chunk_size):
+    """
+    Read a queryset with a server-side iterator and yield its rows as dicts.
+
+    Args:
+        queryset (QuerySet): The queryset to read.
+        fields (dict): Output keys mapped to the model columns to read (e.g. {"author": "author_id"}).
+        chunk_size (int): The number of rows fetched from the database at a time.
+
+    Yields:
+        dict: One row per object, keyed by the output keys.
+    """
+    keys = list(fields)
+    for values in queryset.values_list(*fields.values()).iterator(
+        chunk_size=chunk_size
+    ):
+        yield dict(zip(keys, values))
+
+
+class _Echo:
+    """A file-like object whose write() returns the value written, for streaming csv.writer output."""
+
+    def write(self, value):
+        return value
+
+
+def _csv_value(value):
+    if isinstance(value, datetime):
+        value = value.isoformat()
+        if value.endswith("+00:00"):
+            value = value[:-6] + "Z"
+        return value
+    return value
+
+
+def csv_lines(rows, fieldnames, buffer_size=STREAM_BUFFER_SIZE):
+    """
+    Encode an iterable of dicts as CSV with a header line, keeping only `fieldnames`.
+
+    Args:
+        rows (iterable): The rows to encode.
+        fieldnames (list): The columns of the CSV, in order. Missing keys are left empty.
+        buffer_size (int): The approximate size of each chunk yielded.
+
+    Yields:
+        bytes: Chunks of encoded lines.
+    """
+    writer = csv.writer(_Echo())
+    buffer = [writer.writerow(fieldnames).encode("utf-8")]
+    size = len(buffer[0])
+    for row in rows:
+        line = writer.writerow(
+            [_csv_value(row.get(field, "")) for field in fieldnames]
+        ).encode("utf-8")
+        buffer.append(line)
+        size += len(line)
+        if size >= buffer_size:
+            yield b"".join(buffer)
+            buffer = []
+            size = 0
+    if buffer:
+        yield b"".join(buffer)
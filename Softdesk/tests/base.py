@@ -0,0 +1,57 @@
+from django.test import TestCase
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from accounts.models import User
+from Softdesk.models import Contributor, Issue, Project
+
+
+def client_for(user):
+    """Return an API client sending the bearer token of a user."""
+    client = APIClient()
+    client.credentials(
+        HTTP_AUTHORIZATION="Bearer %s" % RefreshToken.for_user(user).access_token
+    )
+    return client
+
+
+class ProjectTestCase(TestCase):
+    """
+    A TestCase with a project, its author as its contributor and a client authenticated as them.
+
+    Subclasses extending setUpTestData call it first.
+
+    Attributes:
+        project_name (str): The name of the project.
+    """
+
+    project_name = "Project"
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username="author")
+        cls.project = Project.objects.create(
+            name=cls.project_name,
+            description="d",
+            project_type="BACKEND",
+            author=cls.user,
+        )
+        Contributor.objects.create(user=cls.user, project=cls.project)
+
+    def setUp(self):
+        self.client = client_for(self.user)
+
+    @classmethod
+    def create_issue(cls, title="Issue", **fields):
+        """Create an issue of the project, authored by and assigned to the user."""
+        fields = dict(
+            {
+                "priority": "LOW",
+                "tag": "BUG",
+                "project": cls.project,
+                "author": cls.user,
+                "assigned_to": cls.user,
+            },
+            **fields
+        )
+        return Issue.objects.create(title=title, **fields)
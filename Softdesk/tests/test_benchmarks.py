@@ -0,0 +1,140 @@
+from Softdesk import benchmarks
+from Softdesk.benchmarks import Endpoint
+
+PROJECT = "/projects/{project}/"
+ISSUE = PROJECT + "issues/{issue}/"
+COMMENT = ISSUE + "comments/{comment}/"
+
+
+def bulk_rows(values):
+    return [
+        {"title": "Imported %d" % number, "priority": "LOW", "tag": "TASK"}
+        for number in range(100)
+    ]
+
+
+class SoftdeskEndpointBenchmark(benchmarks.BenchmarkTestCase):
+    urlconf = "Softdesk.urls"
+    endpoints = [
+        # First, so that the incremental sync reads the changes of the fixture, not those of the writes
+        Endpoint("sync", "get", "/sync/", 5),
+        Endpoint(
+            "sync",
+            "get",
+            "/sync/?since={since}",
+            6,
+            label="incremental",
+        ),
+        Endpoint("project-list", "get", "/projects/", 4),
+        Endpoint(
+            "project-list",
+            "post",
+            "/projects/",
+            8,
+            data={"name": "Created", "description": "Benchmark", "project_type": "IOS"},
+            status=201,
+        ),
+        Endpoint("project-detail", "get", PROJECT, 5),
+        Endpoint("project-detail", "patch", PROJECT, 9, data={"description": "x"}),
+        Endpoint(
+            "project-detail",
+            "delete",
+            "/projects/{new_project}/",
+            13,
+            consumes="new_project",
+            status=204,
+        ),
+        Endpoint("project-export", "get", PROJECT + "export/", 5),
+        Endpoint("project-stats", "get", PROJECT + "stats/", 6),
+        Endpoint(
+            "project-stats", "get", PROJECT + "stats/?rollup=true", 12, label="rollup"
+        ),
+        Endpoint("issues-list", "get", PROJECT + "issues/", 4),
+        Endpoint(
+            "issues-list",
+            "post",
+            PROJECT + "issues/",
+            9,
+            data=lambda values: {
+                "title": "Created",
+                "priority": "HIGH",
+                "tag": "BUG",
+                "assigned_to": values["author"],
+            },
+            status=201,
+        ),
+        Endpoint(
+            "issues-bulk",
+            "post",
+            PROJECT + "issues/bulk/",
+            12,
+            data=bulk_rows,
+            status=201,
+        ),
+        Endpoint(
+            "issues-transition",
+            "post",
+            PROJECT + "issues/transition/",
+            9,
+            data=lambda values: {"ids": [values["issue"]], "status": "In Progress"},
+        ),
+        Endpoint("issues-detail", "get", ISSUE, 5),
+        Endpoint("issues-detail", "patch", ISSUE, 11, data={"priority": "HIGH"}),
+        Endpoint(
+            "issues-detail",
+            "delete",
+            PROJECT + "issues/{new_issue}/",
+            10,
+            consumes="new_issue",
+            status=204,
+        ),
+        Endpoint("contributors-list", "get", PROJECT + "contributors/", 4),
+        Endpoint(
+            "contributors-list",
+            "post",
+            PROJECT + "contributors/",
+            8,
+            data=lambda values: {"user": values["new_user"]},
+            consumes="new_user",
+            status=201,
+        ),
+        Endpoint(
+            "contributors-detail", "get", PROJECT + "contributors/{contributor}/", 3
+        ),
+        Endpoint(
+            "contributors-detail",
+            "delete",
+            PROJECT + "contributors/{new_contributor}/",
+            9,
+            consumes="new_contributor",
+            status=204,
+        ),
+        Endpoint("comments-list", "get", ISSUE + "comments/", 4),
+        Endpoint(
+            "comments-list",
+            "post",
+            ISSUE + "comments/",
+            7,
+            data={"text": "Created"},
+            status=201,
+        ),
+        Endpoint("comments-stream", "get", ISSUE + "comments/stream/", 4),
+        Endpoint("comments-detail", "get", COMMENT, 3),
+        Endpoint("comments-detail", "patch", COMMENT, 8, data={"text": "Edited"}),
+        Endpoint(
+            "comments-detail",
+            "delete",
+            ISSUE + "comments/{new_comment}/",
+            10,
+            consumes="new_comment",
+            status=204,
+        ),
+        Endpoint("async-projects-list", "get", "/async/projects/", 4),
+        Endpoint("async-projects-detail", "get", "/async" + PROJECT, 5),
+        Endpoint("async-issues-list", "get", "/async" + PROJECT + "issues/", 4),
+        Endpoint("async-issues-detail", "get", "/async" + ISSUE, 5),
+        Endpoint("async-comments-list", "get", "/async" + ISSUE + "comments/", 4),
+        Endpoint("async-comments-detail", "get", "/async" + COMMENT, 3),
+        Endpoint("detail-cache-stats", "get", "/cache/stats/", 1, user="staff"),
+        Endpoint("search", "get", "/search/?q=crash", 4),
+    ]
@@ -0,0 +1,93 @@
+from django.test import override_settings
+
+from accounts.models import User
+from Softdesk.models import Issue
+from Softdesk.tests.base import ProjectTestCase
+
+
+class BulkImportTests(ProjectTestCase):
+    project_name = "Import"
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.assignee = User.objects.create(username="assignee")
+
+    def setUp(self):
+        super().setUp()
+        self.path = "/projects/%d/issues/bulk/" % self.project.id
+
+    def row(self, title, **fields):
+        return dict({"title": title, "priority": "LOW", "tag": "TASK"}, **fields)
+
+    def test_a_json_array_is_imported(self):
+        response = self.client.post(
+            self.path + "?batch_size=2",
+            [
+                self.row("First"),
+                self.row("Second", assigned_to=self.assignee.id),
+                self.row("Third", status=Issue.FINISHED_STATUS),
+            ],
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json(), {"created": 3})
+        issues = Issue.objects.filter(project=self.project).order_by("id")
+        self.assertEqual(
+            [(issue.title, issue.author_id, issue.assigned_to_id) for issue in issues],
+            [
+                ("First", self.user.id, self.user.id),
+                ("Second", self.user.id, self.assignee.id),
+                ("Third", self.user.id, self.user.id),
+            ],
+        )
+        self.project.refresh_from_db()
+        self.assertEqual(
+            (self.project.issue_count, self.project.open_issue_count), (3, 2)
+        )
+
+    def test_an_ndjson_body_is_imported(self):
+        body = '{"title": "First", "priority": "LOW", "tag": "BUG"}\n\n'
+        body += '{"title": "Second", "priority": "HIGH", "tag": "BUG"}\n'
+        response = self.client.post(
+            self.path, body, content_type="application/x-ndjson"
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            list(
+                Issue.objects.filter(project=self.project)
+                .order_by("id")
+                .values_list("title", "priority")
+            ),
+            [("First", "LOW"), ("Second", "HIGH")],
+        )
+
+    def test_invalid_rows_reject_the_whole_import(self):
+        response = self.client.post(
+            self.path,
+            [
+                self.row("Valid"),
+                self.row("Bad priority", priority="URGENT"),
+                self.row("Unknown assignee", assigned_to=999999),
+            ],
+            format="json",
+        )
+        self.assertEqual(response.status_code, 400)
+        body = response.json()
+        self.assertEqual(body["created"], 0)
+        self.assertEqual([error["row"] for error in body["errors"]], [1, 2])
+        self.assertIn("priority", body["errors"][0]["errors"])
+        self.assertIn("assigned_to", body["errors"][1]["errors"])
+        self.assertFalse(Issue.objects.filter(project=self.project).exists())
+
+    def test_the_body_must_be_a_list(self):
+        response = self.client.post(self.path, self.row("Alone"), format="json")
+        self.assertEqual(response.status_code, 400)
+
+    @override_settings(SOFTDESK_BULK_IMPORT_MAX_ROWS=2)
+    def test_imports_are_capped(self):
+        response = self.client.post(
+            self.path, [self.row("Row %d" % n) for n in range(3)], format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Issue.objects.filter(project=self.project).exists())
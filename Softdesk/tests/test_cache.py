@@ -0,0 +1,83 @@
+from accounts.models import User
+from Softdesk.cache import DetailCache, detail_cache
+from Softdesk.models import Comment
+from Softdesk.serializers import CommentDetailSerializer
+from Softdesk.tests.base import ProjectTestCase, client_for
+
+
+class DetailCacheTests(ProjectTestCase):
+    project_name = "Cache"
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.issue = cls.create_issue()
+        cls.comments = [
+            Comment.objects.create(
+                text="Comment %d" % number, issue=cls.issue, author=cls.user
+            )
+            for number in range(3)
+        ]
+        cls.staff = User.objects.create(username="staff", is_staff=True)
+
+    def setUp(self):
+        super().setUp()
+        detail_cache.backend.clear()
+        self.cache = DetailCache("default", 60, max_tracked_keys=2)
+
+    def test_payloads_are_stored_per_version_and_variant(self):
+        comment = self.comments[0]
+        self.cache.set(CommentDetailSerializer, comment, "a", {"text": "a"})
+        self.assertEqual(
+            self.cache.get(CommentDetailSerializer, comment, "a"), {"text": "a"}
+        )
+        self.assertIsNone(self.cache.get(CommentDetailSerializer, comment, "b"))
+        comment.save()
+        self.assertIsNone(self.cache.get(CommentDetailSerializer, comment, "a"))
+        stats = self.cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 2))
+        self.assertEqual(stats["hit_ratio"], 1 / 3)
+
+    def test_invalidate_deletes_the_payloads_of_an_object(self):
+        first, second = self.comments[:2]
+        self.cache.set(CommentDetailSerializer, first, "a", {})
+        self.cache.set(CommentDetailSerializer, second, "a", {})
+        self.cache.invalidate(Comment, first.pk)
+        self.assertIsNone(self.cache.get(CommentDetailSerializer, first, "a"))
+        self.assertEqual(self.cache.get(CommentDetailSerializer, second, "a"), {})
+        self.assertEqual(self.cache.stats()["invalidations"], 1)
+
+    def test_tracked_keys_are_bounded(self):
+        for comment in self.comments:
+            self.cache.set(CommentDetailSerializer, comment, "a", {})
+        self.assertEqual(self.cache.stats()["tracked_keys"], 2)
+
+    def test_payloads_dropped_by_the_backend_are_evictions(self):
+        comment = self.comments[0]
+        self.cache.set(CommentDetailSerializer, comment, "a", {})
+        self.cache.backend.delete(
+            self.cache.make_key(CommentDetailSerializer, comment, "a")
+        )
+        self.assertIsNone(self.cache.get(CommentDetailSerializer, comment, "a"))
+        self.assertEqual(self.cache.stats()["evictions"], 1)
+
+    def test_detail_endpoints_serve_cached_payloads_until_a_change(self):
+        client = self.client
+        path = "/projects/%d/issues/%d/" % (self.project.id, self.issue.id)
+        client.get(path)
+        hits = detail_cache.stats()["hits"]
+        response = client.get(path)
+        self.assertEqual(detail_cache.stats()["hits"], hits + 1)
+        self.assertEqual(response.json()["comments"]["count"], 3)
+
+        self.comments[0].delete()
+        response = client.get(path)
+        self.assertEqual(detail_cache.stats()["hits"], hits + 1)
+        self.assertEqual(response.json()["comments"]["count"], 2)
+
+    def test_stats_are_for_staff_only(self):
+        response = client_for(self.staff).get("/cache/stats/")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("hit_ratio", response.json())
+        response = self.client.get("/cache/stats/")
+        self.assertEqual(response.status_code, 403)
@@ -0,0 +1,84 @@
+import json
+
+from django.test import override_settings
+
+from accounts.models import User
+from Softdesk.cache import detail_cache
+from Softdesk.models import Comment, Contributor, Project
+from Softdesk.tests.base import ProjectTestCase
+
+
+class CommentHistoryTests(ProjectTestCase):
+    project_name = "History"
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.issue = cls.create_issue()
+        cls.comments = [
+            Comment.objects.create(
+                text="Comment %d" % number, issue=cls.issue, author=cls.user
+            )
+            for number in range(3)
+        ]
+        # An issue of a project the user does not contribute to
+        stranger = User.objects.create(username="stranger")
+        foreign = Project.objects.create(
+            name="Foreign", description="d", project_type="BACKEND", author=stranger
+        )
+        Contributor.objects.create(user=stranger, project=foreign)
+        cls.foreign_issue = cls.create_issue(
+            "Secret", project=foreign, author=stranger, assigned_to=stranger
+        )
+        cls.foreign_comment = Comment.objects.create(
+            text="Secret", issue=cls.foreign_issue, author=stranger
+        )
+
+    def setUp(self):
+        super().setUp()
+        detail_cache.backend.clear()
+        self.issue_path = "/projects/%d/issues/%d/" % (self.project.id, self.issue.id)
+        # The foreign issue, reached through the project of the user
+        self.foreign_path = "/projects/%d/issues/%d/" % (
+            self.project.id,
+            self.foreign_issue.id,
+        )
+
+    def stream(self, issue_path):
+        return self.client.get(issue_path + "comments/stream/")
+
+    @override_settings(SOFTDESK_EMBEDDED_COMMENTS_LIMIT=2)
+    def test_issues_embed_their_latest_comments(self):
+        comments = self.client.get(self.issue_path).json()["comments"]
+        self.assertEqual(comments["count"], 3)
+        self.assertEqual(
+            [comment["id"] for comment in comments["results"]],
+            [self.comments[2].id, self.comments[1].id],
+        )
+        self.assertTrue(comments["history"].endswith("comments/stream/"))
+
+        body = self.client.get(self.issue_path + "?embed_comments=false").json()
+        self.assertNotIn("comments", body)
+
+    def test_the_history_streams_every_comment_oldest_first(self):
+        response = self.stream(self.issue_path)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        rows = [
+            json.loads(line)
+            for line in b"".join(response.streaming_content).splitlines()
+        ]
+        self.assertEqual(
+            [(row["id"], row["text"], row["issue"]) for row in rows],
+            [(comment.id, comment.text, self.issue.id) for comment in self.comments],
+        )
+
+    def test_comments_of_an_issue_of_another_project_are_not_found(self):
+        self.assertEqual(self.stream(self.foreign_path).status_code, 404)
+        comment_path = self.foreign_path + "comments/%d/" % self.foreign_comment.id
+        self.assertEqual(self.client.get(comment_path).status_code, 404)
+        response = self.client.get(self.foreign_path + "comments/")
+        self.assertEqual(response.json()["count"], 0)
+        response = self.client.post(self.foreign_path + "comments/", {"text": "x"})
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(Comment.objects.filter(issue=self.foreign_issue).count(), 1)
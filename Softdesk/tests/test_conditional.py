@@ -0,0 +1,89 @@
+from Softdesk.cache import detail_cache
+from Softdesk.models import Comment
+from Softdesk.tests.base import ProjectTestCase
+
+
+class ConditionalRetrieveTests(ProjectTestCase):
+    project_name = "ETags"
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.issue = cls.create_issue()
+        cls.comment = Comment.objects.create(
+            text="Comment", issue=cls.issue, author=cls.user
+        )
+
+    def setUp(self):
+        super().setUp()
+        detail_cache.backend.clear()
+        self.project_path = "/projects/%d/" % self.project.id
+        self.issue_path = self.project_path + "issues/%d/" % self.issue.id
+        self.comment_path = self.issue_path + "comments/%d/" % self.comment.id
+
+    def get_etag(self, path):
+        response = self.client.get(path)
+        self.assertEqual(response.status_code, 200)
+        return response["ETag"]
+
+    def assertNotModified(self, path, etag, if_none_match=None):
+        response = self.client.get(path, HTTP_IF_NONE_MATCH=if_none_match or etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+    def assertModified(self, path, etag):
+        response = self.client.get(path, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_unchanged_objects_are_not_modified(self):
+        for path in (self.project_path, self.issue_path, self.comment_path):
+            etag = self.get_etag(path)
+            self.assertNotModified(path, etag)
+            self.assertNotModified(path, etag, "*")
+            self.assertNotModified(path, etag, '"other", %s' % etag)
+
+    def test_the_etag_depends_on_the_representation(self):
+        etag = self.get_etag(self.issue_path)
+        self.assertNotEqual(
+            self.get_etag(self.issue_path + "?embed_comments=false"), etag
+        )
+        self.assertModified(self.issue_path + "?embed_comments=false", etag)
+
+    def test_editing_an_object_changes_its_etag(self):
+        etag = self.get_etag(self.comment_path)
+        response = self.client.patch(self.comment_path, {"text": "Edited"})
+        self.assertEqual(response.status_code, 200)
+        self.assertModified(self.comment_path, etag)
+
+    def test_a_comment_changes_the_etag_of_its_issue(self):
+        etag = self.get_etag(self.issue_path)
+        Comment.objects.create(text="Another", issue=self.issue, author=self.user)
+        self.assertModified(self.issue_path, etag)
+
+    def test_an_issue_changes_the_etag_of_its_project(self):
+        etag = self.get_etag(self.project_path)
+        self.issue.title = "Renamed"
+        self.issue.save()
+        self.assertModified(self.project_path, etag)
+
+    def test_bulk_writes_change_the_etag_of_the_project(self):
+        etag = self.get_etag(self.project_path)
+        response = self.client.post(
+            self.project_path + "issues/bulk/",
+            [{"title": "Imported", "priority": "LOW", "tag": "TASK"}],
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertModified(self.project_path, etag)
+
+        etag = self.get_etag(self.project_path)
+        issue_etag = self.get_etag(self.issue_path)
+        response = self.client.post(
+            self.project_path + "issues/transition/",
+            {"ids": [self.issue.id], "status": "In Progress"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertModified(self.project_path, etag)
+        self.assertModified(self.issue_path, issue_etag)
@@ -0,0 +1,96 @@
+from Softdesk.models import Comment, Issue
+from Softdesk.tests.base import ProjectTestCase
+
+
+class CounterTests(ProjectTestCase):
+    project_name = "Counters"
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.issue = cls.create_issue("Open")
+
+    def assertCounters(self, issue_count, open_issue_count):
+        self.project.refresh_from_db()
+        self.assertEqual(
+            (self.project.issue_count, self.project.open_issue_count),
+            (issue_count, open_issue_count),
+        )
+
+    def test_created_issues_are_counted(self):
+        self.create_issue()
+        self.create_issue(status=Issue.FINISHED_STATUS)
+        self.assertCounters(3, 2)
+
+    def test_finishing_and_reopening_moves_the_open_count(self):
+        self.issue.status = Issue.FINISHED_STATUS
+        self.issue.save()
+        self.assertCounters(1, 0)
+        self.assertFalse(self.issue.is_open)
+        # Saved again without a status change, e.g. an edit of the title
+        self.issue.title = "Done"
+        self.issue.save()
+        self.assertCounters(1, 0)
+        self.issue.status = "In Progress"
+        self.issue.save()
+        self.assertCounters(1, 1)
+
+    def test_status_change_of_an_issue_loaded_without_its_status(self):
+        issue = Issue.objects.only("id", "title").get(pk=self.issue.pk)
+        issue.status = Issue.FINISHED_STATUS
+        issue.save()
+        self.assertCounters(1, 0)
+
+    def test_deleted_issues_are_uncounted(self):
+        finished = self.create_issue(status=Issue.FINISHED_STATUS)
+        finished.delete()
+        self.assertCounters(1, 1)
+        self.issue.delete()
+        self.assertCounters(0, 0)
+
+    def test_transition_moves_the_open_count(self):
+        response = self.client.post(
+            "/projects/%d/issues/transition/" % self.project.id,
+            {"ids": [self.issue.id], "status": Issue.FINISHED_STATUS},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["updated"], 1)
+        self.assertCounters(1, 0)
+
+    def test_comments_are_counted(self):
+        comment = Comment.objects.create(text="a", issue=self.issue, author=self.user)
+        Comment.objects.create(text="b", issue=self.issue, author=self.user)
+        self.issue.refresh_from_db()
+        self.assertEqual(self.issue.comment_count, 2)
+        comment.delete()
+        self.issue.refresh_from_db()
+        self.assertEqual(self.issue.comment_count, 1)
+
+    def test_comment_counts_embedded_in_the_project_are_current(self):
+        path = "/projects/%d/" % self.project.id
+        response = self.client.get(path)
+        etag = response["ETag"]
+        self.assertEqual(response.json()["issues"]["results"][0]["comment_count"], 0)
+
+        response = self.client.post(
+            "/projects/%d/issues/%d/comments/" % (self.project.id, self.issue.id),
+            {"text": "New"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+
+        response = self.client.get(path, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["issues"]["results"][0]["comment_count"], 1)
+
+        etag = response["ETag"]
+        comment_path = "/projects/%d/issues/%d/comments/%d/" % (
+            self.project.id,
+            self.issue.id,
+            Comment.objects.get(issue=self.issue).id,
+        )
+        self.assertEqual(self.client.delete(comment_path).status_code, 204)
+        response = self.client.get(path, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["issues"]["results"][0]["comment_count"], 0)
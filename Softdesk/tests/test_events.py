@@ -0,0 +1,250 @@
+import asyncio
+import json
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.test import TransactionTestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from accounts.models import User
+from Softdesk.events import EventBroker, EventStreamDispatcher
+from Softdesk.models import Comment, Contributor, Issue, Project
+
+
+class Stream:
+    """One request driven through an ASGI application, its messages read as they are sent."""
+
+    def __init__(self, path, user=None, method="GET", last_event_id=None):
+        headers = []
+        if user is not None:
+            token = AccessToken.for_user(user)
+            headers.append((b"authorization", b"Bearer %s" % str(token).encode()))
+        if last_event_id is not None:
+            headers.append((b"last-event-id", last_event_id.encode()))
+        self.scope = {
+            "type": "http",
+            "method": method,
+            "path": path,
+            "headers": headers,
+            "query_string": b"",
+        }
+        self.received = asyncio.Queue()
+        self.sent = asyncio.Queue()
+
+    async def open(self, application):
+        """Start the request and return its status."""
+        self.task = asyncio.ensure_future(
+            application(self.scope, self.received.get, self.sent.put)
+        )
+        return (await self.next())["status"]
+
+    async def next(self):
+        return await asyncio.wait_for(self.sent.get(), 5)
+
+    async def read(self):
+        """Return the name, data and id of the next event, or None once the stream ended."""
+        message = await self.next()
+        if not message.get("more_body"):
+            await asyncio.wait_for(self.task, 5)
+            return None
+        fields = dict(
+            line.split(": ", 1) for line in message["body"].decode().split("\n") if line
+        )
+        return fields["event"], json.loads(fields["data"]), fields["id"]
+
+    async def disconnect(self):
+        await self.received.put({"type": "http.disconnect"})
+        await asyncio.wait_for(self.task, 5)
+
+
+class EventStreamTests(TransactionTestCase):
+    # The streams authorize their requests on other connections
+    def setUp(self):
+        self.member = User.objects.create(username="member")
+        self.leaver = User.objects.create(username="leaver")
+        self.outsider = User.objects.create(username="outsider")
+        self.project = Project.objects.create(
+            name="Events", description="d", project_type="BACKEND", author=self.member
+        )
+        Contributor.objects.create(user=self.member, project=self.project)
+        Contributor.objects.create(user=self.leaver, project=self.project)
+        self.issue = Issue.objects.create(
+            title="Issue",
+            priority="LOW",
+            tag="BUG",
+            project=self.project,
+            author=self.member,
+            assigned_to=self.member,
+        )
+        self.path = "/projects/%d/events/" % self.project.id
+        self.dispatcher = EventStreamDispatcher(self.not_a_stream)
+        self.use_broker(resume_window=60)
+
+    def use_broker(self, queue_size=100, resume_window=60):
+        self.broker = EventBroker(
+            replay_size=10,
+            queue_size=queue_size,
+            keepalive=60,
+            resume_window=resume_window,
+        )
+        patcher = mock.patch("Softdesk.events.event_broker", self.broker)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    @staticmethod
+    async def not_a_stream(scope, receive, send):
+        await send({"type": "http.response.start", "status": 204, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def open(self, user, path=None, **kwargs):
+        stream = Stream(path or self.path, user, **kwargs)
+        self.assertEqual(await stream.open(self.dispatcher), 200)
+        return stream
+
+    @sync_to_async
+    def comment(self, text="Comment"):
+        return Comment.objects.create(text=text, issue=self.issue, author=self.member)
+
+    def test_requests_are_refused_before_streaming(self):
+        other = Project.objects.create(
+            name="Other", description="d", project_type="BACKEND", author=self.outsider
+        )
+        Contributor.objects.create(user=self.outsider, project=other)
+
+        async def scenario():
+            for path, user, method, status in (
+                (self.path, None, "GET", 401),
+                (self.path, self.outsider, "GET", 403),
+                (self.path, self.member, "POST", 405),
+                (
+                    "/projects/%d/issues/%d/events/" % (other.id, self.issue.id),
+                    self.outsider,
+                    "GET",
+                    404,
+                ),
+            ):
+                stream = Stream(path, user, method=method)
+                self.assertEqual(await stream.open(self.dispatcher), status, path)
+                self.assertIn("detail", json.loads((await stream.next())["body"]))
+
+        asyncio.run(scenario())
+
+    def test_streams_start_ready_and_receive_the_events_of_their_topic(self):
+        async def scenario():
+            project_stream = await self.open(self.member)
+            issue_stream = await self.open(
+                self.member,
+                "/projects/%d/issues/%d/events/" % (self.project.id, self.issue.id),
+            )
+            for stream in (project_stream, issue_stream):
+                self.assertEqual((await stream.read())[:2], ("ready", {}))
+            comment = await self.comment()
+            for stream in (project_stream, issue_stream):
+                name, data, _ = await stream.read()
+                self.assertEqual((name, data["id"]), ("comment.created", comment.id))
+                await stream.disconnect()
+
+        asyncio.run(scenario())
+
+    def test_events_nobody_may_read_are_not_serialized(self):
+        with mock.patch.object(self.broker, "publish") as publish, mock.patch(
+            "Softdesk.serializers.CommentDetailSerializer.to_representation"
+        ) as to_representation:
+            comment = Comment.objects.create(
+                text="Unread", issue=self.issue, author=self.member
+            )
+            comment.text = "Edited"
+            comment.save()
+        publish.assert_not_called()
+        to_representation.assert_not_called()
+
+    def test_a_resumed_stream_receives_the_events_it_missed(self):
+        async def scenario():
+            stream = await self.open(self.member)
+            _, _, last_event_id = await stream.read()
+            await stream.disconnect()
+            comment = await self.comment()
+            stream = await self.open(self.member, last_event_id=last_event_id)
+            name, data, _ = await stream.read()
+            self.assertEqual((name, data["id"]), ("comment.created", comment.id))
+            await stream.disconnect()
+
+        asyncio.run(scenario())
+
+    def test_a_stream_resumed_after_its_events_were_dropped_is_reset(self):
+        self.use_broker(resume_window=0)
+
+        async def scenario():
+            stream = await self.open(self.member)
+            _, _, last_event_id = await stream.read()
+            await stream.disconnect()
+            await self.comment()
+            stream = await self.open(self.member, last_event_id=last_event_id)
+            self.assertEqual((await stream.read())[0], "reset")
+
+            # The events of the topic are kept while another of its streams is open
+            other = await self.open(self.member)
+            _, _, last_event_id = await other.read()
+            await other.disconnect()
+            comment = await self.comment()
+            other = await self.open(self.member, last_event_id=last_event_id)
+            name, data, _ = await other.read()
+            self.assertEqual((name, data["id"]), ("comment.created", comment.id))
+            await other.disconnect()
+            await stream.disconnect()
+
+            stream = await self.open(self.member, last_event_id="unknown-1")
+            self.assertEqual((await stream.read())[0], "reset")
+            await stream.disconnect()
+
+        asyncio.run(scenario())
+
+    def test_streams_end_when_their_user_leaves_the_project(self):
+        @sync_to_async
+        def leave():
+            Contributor.objects.get(user=self.leaver, project=self.project).delete()
+
+        async def scenario():
+            stream = await self.open(self.leaver)
+            await stream.read()
+            await leave()
+            self.assertIsNone(await stream.read())
+
+        asyncio.run(scenario())
+
+    def test_streams_end_after_the_deletion_of_the_project(self):
+        @sync_to_async
+        def delete():
+            Project.objects.get(pk=self.project.pk).delete()
+
+        async def scenario():
+            stream = await self.open(self.member)
+            await stream.read()
+            await delete()
+            name, data, _ = await stream.read()
+            self.assertEqual((name, data), ("project.deleted", {"id": self.project.id}))
+            self.assertIsNone(await stream.read())
+
+        asyncio.run(scenario())
+
+    def test_slow_streams_are_closed(self):
+        self.use_broker(queue_size=1)
+
+        async def scenario():
+            stream = await self.open(self.member)
+            await stream.read()
+            for number in range(3):
+                self.broker.publish(
+                    "test", b"%d" % number, [("project", self.project.id)]
+                )
+            self.assertEqual((await stream.read())[:2], ("test", 0))
+            self.assertIsNone(await stream.read())
+
+        asyncio.run(scenario())
+
+    def test_other_requests_are_passed_through(self):
+        async def scenario():
+            stream = Stream("/projects/%d/" % self.project.id, self.member)
+            self.assertEqual(await stream.open(self.dispatcher), 204)
+
+        asyncio.run(scenario())
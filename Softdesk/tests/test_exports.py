@@ -0,0 +1,192 @@
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+
+from django.test import SimpleTestCase
+from django.utils import timezone
+
+from Softdesk.exports import CSV_EXPORT_FIELDS, _merge_comments
+from Softdesk.models import Comment, Issue
+from Softdesk.tests.base import ProjectTestCase
+
+START = datetime(2023, 1, 1, tzinfo=timezone.utc)
+
+
+class ProjectExportTests(ProjectTestCase):
+    project_name = "Exported"
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.first = cls.create_issue("First")
+        cls.second = cls.create_issue("Second")
+        Issue.objects.filter(pk=cls.first.pk).update(time_created=START)
+        Issue.objects.filter(pk=cls.second.pk).update(
+            time_created=START + timedelta(days=2)
+        )
+        # Created alternately, so the comments of the two issues interleave
+        cls.comments = []
+        for day, issue in enumerate([cls.second, cls.first, cls.second], start=1):
+            comment = Comment.objects.create(
+                text="Day %d" % day, issue=issue, author=cls.user
+            )
+            Comment.objects.filter(pk=comment.pk).update(
+                time_created=START + timedelta(days=day)
+            )
+            cls.comments.append(comment)
+
+    def setUp(self):
+        super().setUp()
+        self.path = "/projects/%d/export/" % self.project.id
+
+    def export(self, query="", **headers):
+        response = self.client.get(self.path + query, **headers)
+        self.assertEqual(response.status_code, 200, query)
+        return response, b"".join(response.streaming_content).decode()
+
+    def ndjson(self, query=""):
+        response, content = self.export(query)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        return [json.loads(line) for line in content.splitlines()]
+
+    def csv(self, query="?format=csv", **headers):
+        response, content = self.export(query, **headers)
+        self.assertEqual(response["Content-Type"], "text/csv")
+        self.assertIn(
+            'filename="project-%d.csv"' % self.project.id,
+            response["Content-Disposition"],
+        )
+        rows = list(csv.reader(io.StringIO(content)))
+        self.assertEqual(rows[0], CSV_EXPORT_FIELDS)
+        return [dict(zip(rows[0], row)) for row in rows[1:]]
+
+    def test_ndjson_exports_nest_the_comments_in_their_issue(self):
+        records = self.ndjson()
+        self.assertEqual(
+            [(record["record"], record["title"]) for record in records],
+            [("issue", "First"), ("issue", "Second")],
+        )
+        self.assertEqual(records[0]["project"], self.project.id)
+        self.assertEqual(records[0]["time_created"], "2023-01-01T00:00:00Z")
+        self.assertEqual(
+            [comment["text"] for comment in records[0]["comments"]], ["Day 2"]
+        )
+        self.assertEqual(
+            [comment["text"] for comment in records[1]["comments"]],
+            ["Day 1", "Day 3"],
+        )
+        self.assertEqual(
+            set(records[1]["comments"][0]),
+            {"id", "issue", "text", "author", "time_created", "unique_identifier"},
+        )
+
+    def test_csv_exports_list_the_comments_as_records(self):
+        rows = self.csv()
+        self.assertEqual(
+            [(row["record"], row["id"]) for row in rows],
+            [
+                ("issue", str(self.first.id)),
+                ("issue", str(self.second.id)),
+                ("comment", str(self.comments[1].id)),
+                ("comment", str(self.comments[0].id)),
+                ("comment", str(self.comments[2].id)),
+            ],
+        )
+        self.assertEqual(rows[2]["issue"], str(self.first.id))
+        self.assertEqual(rows[2]["title"], "")
+        self.assertEqual(rows[0]["text"], "")
+
+    def test_comments_can_be_left_out(self):
+        records = self.ndjson("?comments=none")
+        self.assertEqual([record["record"] for record in records], ["issue", "issue"])
+        self.assertNotIn("comments", records[0])
+        rows = self.csv("?format=csv&comments=none")
+        self.assertEqual([row["record"] for row in rows], ["issue", "issue"])
+
+    def test_since_exports_the_later_records(self):
+        since = "?since=2023-01-02T12:00:00Z"
+        records = self.ndjson(since)
+        # Inline comments follow their issue, whenever they were created
+        self.assertEqual([record["title"] for record in records], ["Second"])
+        self.assertEqual(
+            [comment["text"] for comment in records[0]["comments"]],
+            ["Day 1", "Day 3"],
+        )
+        records = self.ndjson(since + "&comments=separate")
+        self.assertEqual(
+            [(record["record"], record["id"]) for record in records],
+            [
+                ("issue", self.second.id),
+                ("comment", self.comments[1].id),
+                ("comment", self.comments[2].id),
+            ],
+        )
+        # Naive timestamps are read as UTC
+        records = self.ndjson("?since=2023-01-02T12:00:00")
+        self.assertEqual([record["title"] for record in records], ["Second"])
+
+    def test_the_format_is_negotiated(self):
+        rows = self.csv("", HTTP_ACCEPT="text/csv")
+        self.assertEqual(rows[-1]["record"], "comment")
+        response, _ = self.export(HTTP_ACCEPT="application/x-ndjson")
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        response, _ = self.export(HTTP_ACCEPT="*/*")
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+
+    def test_invalid_parameters_are_rejected(self):
+        for query, status in (
+            ("?comments=all", 400),
+            ("?format=csv&comments=inline", 400),
+            ("?since=yesterday", 400),
+            ("?format=xml", 404),
+        ):
+            response = self.client.get(self.path + query)
+            self.assertEqual(response.status_code, status, query)
+        response = self.client.get(self.path, HTTP_ACCEPT="application/xml")
+        self.assertEqual(response.status_code, 406)
+
+
+class MergeCommentsTests(SimpleTestCase):
+    @staticmethod
+    def issue(id, time_created):
+        return {"record": "issue", "id": id, "time_created": time_created}
+
+    @staticmethod
+    def comment(id, issue, issue_time_created):
+        return {
+            "record": "comment",
+            "id": id,
+            "issue": issue,
+            "issue_time_created": issue_time_created,
+        }
+
+    def test_comments_are_attached_to_their_issue(self):
+        # Issues created at the same time are ordered by id
+        issues = [self.issue(1, 10), self.issue(3, 10), self.issue(2, 20)]
+        # The comments of issues that are not exported are skipped
+        comments = [
+            self.comment(9, 0, 10),
+            self.comment(1, 1, 10),
+            self.comment(4, 1, 10),
+            self.comment(2, 3, 10),
+            self.comment(6, 5, 10),
+            self.comment(7, 5, 15),
+            self.comment(3, 2, 20),
+            self.comment(5, 2, 20),
+            self.comment(8, 9, 30),
+        ]
+        merged = list(_merge_comments(iter(issues), iter(comments)))
+        self.assertEqual(
+            [
+                (issue["id"], [comment["id"] for comment in issue["comments"]])
+                for issue in merged
+            ],
+            [(1, [1, 4]), (3, [2]), (2, [3, 5])],
+        )
+        self.assertEqual(merged[0]["comments"][0], {"id": 1, "issue": 1})
+
+    def test_issues_without_comments_get_an_empty_list(self):
+        issues = [self.issue(1, 10), self.issue(2, 10)]
+        merged = list(_merge_comments(iter(issues), iter([])))
+        self.assertEqual([issue["comments"] for issue in merged], [[], []])
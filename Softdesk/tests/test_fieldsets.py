@@ -0,0 +1,99 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from accounts.models import User
+from Softdesk.cache import detail_cache
+from Softdesk.models import Comment
+from Softdesk.tests.base import ProjectTestCase
+
+
+class SparseFieldsetTests(ProjectTestCase):
+    project_name = "Sparse"
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.issue = cls.create_issue(description="Long description")
+        Comment.objects.create(text="Comment", issue=cls.issue, author=cls.user)
+        cls.private = User.objects.create(
+            username="private", email="private@example.com", age=30
+        )
+
+    def setUp(self):
+        super().setUp()
+        detail_cache.backend.clear()
+        self.issues_path = "/projects/%d/issues/" % self.project.id
+        self.issue_path = self.issues_path + "%d/" % self.issue.id
+
+    def get(self, path):
+        response = self.client.get(path)
+        self.assertEqual(response.status_code, 200, path)
+        return response.json()
+
+    def selected(self, path, table):
+        """Return the body of a request and the columns of its SELECT of the table."""
+        with CaptureQueriesContext(connection) as queries:
+            body = self.get(path)
+        prefix = 'SELECT "%s".' % table
+        (sql,) = [
+            query["sql"]
+            for query in queries.captured_queries
+            if query["sql"].startswith(prefix)
+        ]
+        columns = sql[: sql.index(" FROM ")].replace("SELECT ", "", 1).split(", ")
+        return body, {column.split(".")[1].strip('"') for column in columns}
+
+    def test_fields_and_omit_trim_the_payload(self):
+        body = self.get(self.issues_path + "?fields=id,title")
+        self.assertEqual(body["results"], [{"id": self.issue.id, "title": "Issue"}])
+
+        body = self.get(self.issue_path + "?omit=comments,description")
+        self.assertNotIn("comments", body)
+        self.assertNotIn("description", body)
+        self.assertEqual(body["title"], "Issue")
+
+        body = self.get(self.issue_path + "?fields=title,status&omit=status")
+        self.assertEqual(body, {"title": "Issue"})
+
+    def test_unknown_names_are_rejected(self):
+        for query in ("?fields=id,secret", "?omit=secret"):
+            response = self.client.get(self.issues_path + query)
+            self.assertEqual(response.status_code, 400, query)
+            self.assertIn("secret", response.json()["fields"])
+        response = self.client.get(self.issue_path + "?fields=nothing")
+        self.assertEqual(response.status_code, 400)
+
+    def test_omitting_an_embedded_list_saves_its_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.get(self.issue_path)
+        detail_cache.backend.clear()
+        with self.assertNumQueries(len(queries) - 1):
+            self.get(self.issue_path + "?omit=comments")
+
+        project_path = "/projects/%d/" % self.project.id
+        with CaptureQueriesContext(connection) as queries:
+            self.get(project_path)
+        with self.assertNumQueries(len(queries) - 1):
+            self.get(project_path + "?omit=issues")
+
+    def test_only_the_rendered_and_required_columns_are_loaded(self):
+        _, columns = self.selected(self.issues_path + "?fields=title", "Softdesk_issue")
+        # The version makes the ETag, the ordering columns the keyset cursor
+        self.assertEqual(columns, {"id", "title", "version", "time_created"})
+
+        _, columns = self.selected(self.issue_path + "?fields=title", "Softdesk_issue")
+        # The project links the comment history
+        self.assertEqual(
+            columns, {"id", "title", "version", "time_created", "project_id"}
+        )
+
+        _, columns = self.selected(self.issues_path, "Softdesk_issue")
+        self.assertIn("description", columns)
+
+    def test_privacy_flags_are_loaded_with_any_fieldset(self):
+        body, columns = self.selected(
+            "/users/%d/?fields=email,age" % self.private.id, "accounts_user"
+        )
+        self.assertEqual(body, {"email": None, "age": None})
+        self.assertLessEqual({"can_be_contacted", "can_data_be_shared"}, columns)
+        self.assertNotIn("password", columns)
@@ -0,0 +1,95 @@
+import io
+
+from django.core.management import call_command
+
+from Softdesk.models import Issue
+from Softdesk.tests.base import ProjectTestCase
+
+
+class KeysetPaginationTests(ProjectTestCase):
+    project_name = "Pages"
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.issues = [cls.create_issue("Issue %d" % number) for number in range(7)]
+        # Ties on the counter, broken by the id
+        for issue, comment_count in zip(cls.issues, [2, 0, 5, 2, 0, 2, 1]):
+            issue.comment_count = comment_count
+        Issue.objects.bulk_update(cls.issues, ["comment_count"])
+
+    def setUp(self):
+        super().setUp()
+        self.issues_path = "/projects/%d/issues/" % self.project.id
+
+    def walk(self, url, link="next"):
+        """Follow the links of a keyset listing, returning the ids of every page."""
+        pages = []
+        while url is not None:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            body = response.json()
+            self.assertNotIn("count", body)
+            pages.append([issue["id"] for issue in body["results"]])
+            url = body[link]
+        return pages
+
+    def test_descending_counter_ordering_walks_every_issue_once(self):
+        expected = [
+            issue.id
+            for issue in sorted(self.issues, key=lambda i: (-i.comment_count, i.id))
+        ]
+        pages = self.walk(
+            self.issues_path + "?pagination=cursor&ordering=-comment_count&limit=2"
+        )
+        self.assertEqual([len(page) for page in pages], [2, 2, 2, 1])
+        self.assertEqual(sum(pages, []), expected)
+
+    def test_descending_counter_ordering_walks_back(self):
+        ordered = [
+            issue.id
+            for issue in sorted(self.issues, key=lambda i: (-i.comment_count, i.id))
+        ]
+        first = self.client.get(
+            self.issues_path + "?pagination=cursor&ordering=-comment_count&limit=3"
+        ).json()
+        second = self.client.get(first["next"]).json()
+        self.assertEqual([issue["id"] for issue in second["results"]], ordered[3:6])
+        pages = self.walk(second["previous"], link="previous")
+        self.assertEqual(pages, [ordered[:3]])
+
+    def test_explain_queries_plans_keyset_pages(self):
+        output = io.StringIO()
+        call_command("explain_queries", stdout=output)
+        self.assertIn("IssueViewSet.list (cursor)", output.getvalue())
+
+    def test_limit_offset_stays_the_default(self):
+        body = self.client.get(self.issues_path + "?limit=2&offset=2").json()
+        self.assertEqual(body["count"], 7)
+        self.assertEqual(
+            [issue["id"] for issue in body["results"]],
+            [issue.id for issue in self.issues[2:4]],
+        )
+
+    def test_keyset_pages_resume_within_ties_of_time_created(self):
+        Issue.objects.filter(project=self.project).update(
+            time_created=self.issues[0].time_created
+        )
+        pages = self.walk(self.issues_path + "?pagination=cursor&limit=3")
+        ids = [issue.id for issue in self.issues]
+        self.assertEqual(pages, [ids[:3], ids[3:6], ids[6:]])
+
+    def test_a_cursor_alone_selects_keyset_pagination(self):
+        first = self.client.get(self.issues_path + "?pagination=cursor&limit=3").json()
+        cursor = first["next"].split("cursor=")[1].split("&")[0]
+        body = self.client.get(self.issues_path + "?limit=3&cursor=" + cursor).json()
+        self.assertNotIn("count", body)
+        self.assertEqual(
+            [issue["id"] for issue in body["results"]],
+            [issue.id for issue in self.issues[3:6]],
+        )
+
+    def test_invalid_cursor_is_not_found(self):
+        for cursor in ["garbage", "eyJwIjpbMV19"]:
+            response = self.client.get(self.issues_path + "?cursor=" + cursor)
+            self.assertEqual(response.status_code, 404, cursor)
@@ -0,0 +1,94 @@
+from types import SimpleNamespace
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from accounts.models import User
+from Softdesk.models import Comment, Contributor, Project
+from Softdesk.permissions import get_contributor_project_ids, is_project_contributor
+from Softdesk.tests.base import ProjectTestCase, client_for
+
+
+class PermissionTests(ProjectTestCase):
+    project_name = "Permissions"
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.member = User.objects.create(username="member")
+        Contributor.objects.create(user=cls.member, project=cls.project)
+        cls.outsider = User.objects.create(username="outsider")
+        cls.superuser = User.objects.create(username="admin", is_superuser=True)
+        other = Project.objects.create(
+            name="Other", description="d", project_type="BACKEND", author=cls.outsider
+        )
+        Contributor.objects.create(user=cls.outsider, project=other)
+        cls.issue = cls.create_issue()
+        cls.comment = Comment.objects.create(
+            text="Comment", issue=cls.issue, author=cls.user
+        )
+
+    def setUp(self):
+        super().setUp()
+        self.project_path = "/projects/%d/" % self.project.id
+        self.issue_path = self.project_path + "issues/%d/" % self.issue.id
+        self.comment_path = self.issue_path + "comments/%d/" % self.comment.id
+        self.paths = [
+            self.project_path,
+            self.project_path + "issues/",
+            self.issue_path,
+            self.issue_path + "comments/",
+            self.comment_path,
+            self.project_path + "contributors/",
+        ]
+
+    def test_memberships_are_read_once_per_request(self):
+        request = SimpleNamespace(user=self.member)
+        with self.assertNumQueries(1):
+            self.assertEqual(get_contributor_project_ids(request), {self.project.id})
+            self.assertTrue(is_project_contributor(request, str(self.project.id)))
+            self.assertFalse(is_project_contributor(request, self.project.id + 1))
+            self.assertFalse(is_project_contributor(request, "x"))
+        with self.assertNumQueries(0):
+            request = SimpleNamespace(user=self.superuser)
+            self.assertTrue(is_project_contributor(request, self.project.id))
+
+    def test_nested_requests_read_the_memberships_once(self):
+        client = client_for(self.member)
+        for path in self.paths:
+            with CaptureQueriesContext(connection) as queries:
+                self.assertEqual(client.get(path).status_code, 200, path)
+            memberships = [
+                query["sql"]
+                for query in queries.captured_queries
+                if 'FROM "Softdesk_contributor" WHERE "Softdesk_contributor"."user_id"'
+                in query["sql"]
+            ]
+            self.assertEqual(len(memberships), 1, path)
+
+    def test_non_contributors_are_refused(self):
+        client = client_for(self.outsider)
+        for path in self.paths:
+            self.assertEqual(client.get(path).status_code, 403, path)
+        self.assertEqual(
+            client.patch(self.issue_path, {"title": "Taken"}).status_code, 403
+        )
+        self.assertEqual(client.delete(self.comment_path).status_code, 403)
+        self.assertTrue(Comment.objects.filter(pk=self.comment.pk).exists())
+
+    def test_superusers_read_every_project(self):
+        client = client_for(self.superuser)
+        for path in self.paths:
+            self.assertEqual(client.get(path).status_code, 200, path)
+
+    def test_only_authors_change_their_issues_and_comments(self):
+        member = client_for(self.member)
+        self.assertEqual(member.patch(self.issue_path, {"title": "x"}).status_code, 403)
+        self.assertEqual(member.delete(self.comment_path).status_code, 403)
+        self.assertEqual(
+            member.patch(self.project_path, {"description": "x"}).status_code, 403
+        )
+
+        response = self.client.patch(self.issue_path, {"title": "Renamed"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.delete(self.comment_path).status_code, 204)
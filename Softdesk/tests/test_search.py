@@ -0,0 +1,122 @@
+from django.test import TestCase
+
+from accounts.models import User
+from Softdesk.models import Comment, Contributor, Issue, Project
+from Softdesk.search import build_match_query
+from Softdesk.tests.base import client_for
+
+
+class SearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.member = User.objects.create(username="member")
+        cls.outsider = User.objects.create(username="outsider")
+        cls.superuser = User.objects.create(username="admin", is_superuser=True)
+        cls.projects = []
+        cls.issues = []
+        for number, owner in enumerate([cls.member, cls.member, cls.outsider]):
+            project = Project.objects.create(
+                name="Project %d" % number,
+                description="d",
+                project_type="BACKEND",
+                author=owner,
+            )
+            Contributor.objects.create(user=owner, project=project)
+            issue = Issue.objects.create(
+                title="Login crash %d" % number,
+                description="The form fails",
+                priority="LOW",
+                tag="BUG",
+                project=project,
+                author=owner,
+                assigned_to=owner,
+            )
+            cls.projects.append(project)
+            cls.issues.append(issue)
+        cls.comment = Comment.objects.create(
+            text="Crashes again after the upgrade",
+            issue=cls.issues[0],
+            author=cls.member,
+        )
+
+    def search(self, user, query):
+        return client_for(user).get("/search/" + query)
+
+    def found(self, user, query):
+        response = self.search(user, query)
+        self.assertEqual(response.status_code, 200)
+        return {(row["kind"], row["id"]) for row in response.json()["results"]}
+
+    def test_search_is_scoped_to_the_projects_of_the_user(self):
+        self.assertEqual(
+            self.found(self.member, "?q=crash"),
+            {
+                ("issue", self.issues[0].id),
+                ("issue", self.issues[1].id),
+                ("comment", self.comment.id),
+            },
+        )
+        self.assertEqual(
+            self.found(self.outsider, "?q=crash"), {("issue", self.issues[2].id)}
+        )
+        self.assertEqual(len(self.found(self.superuser, "?q=crash")), 4)
+
+    def test_search_narrows_to_a_project_the_user_contributes_to(self):
+        self.assertEqual(
+            self.found(self.member, "?q=crash&project=%d" % self.projects[1].id),
+            {("issue", self.issues[1].id)},
+        )
+        self.assertEqual(
+            self.found(self.member, "?q=crash&project=%d" % self.projects[2].id), set()
+        )
+
+    def test_search_narrows_to_a_kind(self):
+        self.assertEqual(
+            self.found(self.member, "?q=crash&kind=comment"),
+            {("comment", self.comment.id)},
+        )
+
+    def test_the_index_follows_edits_and_deletions(self):
+        issue = Issue.objects.get(pk=self.issues[0].pk)
+        issue.title = "Upload timeout"
+        issue.description = ""
+        issue.save()
+        self.comment.delete()
+        self.assertEqual(
+            self.found(self.member, "?q=crash"), {("issue", self.issues[1].id)}
+        )
+        self.assertEqual(self.found(self.member, "?q=timeout"), {("issue", issue.id)})
+
+    def test_results_are_counted_and_paged(self):
+        body = self.search(self.superuser, "?q=crash&limit=1").json()
+        self.assertEqual(body["count"], 4)
+        self.assertEqual(len(body["results"]), 1)
+        self.assertIsNotNone(body["next"])
+
+    def test_scores_are_normalised_per_kind(self):
+        results = self.search(self.superuser, "?q=crash").json()["results"]
+        scores = [row["score"] for row in results]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+        self.assertTrue(all(0 < score <= 1 for score in scores))
+        # The only comment is the best of its kind, though its bm25 is far from those of the issues
+        self.assertEqual((results[0]["kind"], results[0]["score"]), ("comment", 1.0))
+        self.assertEqual(max(row["score"] for row in results[1:]), 1.0)
+
+    def test_pages_follow_the_ranking(self):
+        ranked = self.search(self.superuser, "?q=crash").json()["results"]
+        paged = [
+            self.search(self.superuser, "?q=crash&limit=1&offset=%d" % offset).json()[
+                "results"
+            ][0]
+            for offset in range(len(ranked))
+        ]
+        self.assertEqual(paged, ranked)
+
+    def test_invalid_parameters_are_rejected(self):
+        for query in ("?q=", "?q=%22%29", "?q=crash&kind=user", "?q=crash&project=x"):
+            self.assertEqual(self.search(self.member, query).status_code, 400, query)
+
+    def test_fts_syntax_is_quoted(self):
+        self.assertEqual(
+            build_match_query('crash OR "x* NEAR(a'), '"crash" "OR" "x" "NEAR" "a"'
+        )
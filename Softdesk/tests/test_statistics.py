@@ -0,0 +1,35 @@
+from Softdesk.models import Issue
+from Softdesk.tests.base import ProjectTestCase
+
+
+class FinishedIssueTests(ProjectTestCase):
+    project_name = "Statistics"
+
+    def test_issue_created_finished_finishes_when_created(self):
+        issue = self.create_issue(status=Issue.FINISHED_STATUS)
+        issue.refresh_from_db()
+        self.assertEqual(issue.time_finished, issue.time_created)
+
+    def test_issue_finished_later_finishes_after_creation(self):
+        issue = self.create_issue(status="To Do")
+        self.assertIsNone(issue.time_finished)
+        issue.status = Issue.FINISHED_STATUS
+        issue.save()
+        issue.refresh_from_db()
+        self.assertGreater(issue.time_finished, issue.time_created)
+
+    def test_bulk_imported_finished_issue_finishes_when_created(self):
+        response = self.client.post(
+            "/projects/%d/issues/bulk/" % self.project.id,
+            [{"title": "Done", "priority": "LOW", "tag": "TASK", "status": "Finished"}],
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        issue = Issue.objects.get(project=self.project)
+        self.assertEqual(issue.time_finished, issue.time_created)
+
+    def test_median_time_to_finish_of_issue_created_finished_is_zero(self):
+        self.create_issue(status=Issue.FINISHED_STATUS)
+        response = self.client.get("/projects/%d/stats/" % self.project.id)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["median_time_to_finish"], 0)
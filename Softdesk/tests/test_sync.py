@@ -0,0 +1,150 @@
+from django.test import TestCase
+
+from accounts.models import User
+from Softdesk.models import Change, Comment, Contributor, Issue, Project
+from Softdesk.tests.base import client_for
+
+
+class SyncTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.member = User.objects.create(username="member")
+        cls.leaver = User.objects.create(username="leaver")
+        cls.outsider = User.objects.create(username="outsider")
+        cls.superuser = User.objects.create(username="admin", is_superuser=True)
+        cls.project = Project.objects.create(
+            name="Synced", description="d", project_type="BACKEND", author=cls.member
+        )
+        Contributor.objects.create(user=cls.member, project=cls.project)
+        Contributor.objects.create(user=cls.leaver, project=cls.project)
+        cls.issue = Issue.objects.create(
+            title="Issue",
+            priority="LOW",
+            tag="BUG",
+            project=cls.project,
+            author=cls.member,
+            assigned_to=cls.member,
+        )
+        cls.comments = [
+            Comment.objects.create(
+                text="Comment %d" % number, issue=cls.issue, author=cls.member
+            )
+            for number in range(2)
+        ]
+        cls.other = Project.objects.create(
+            name="Other", description="d", project_type="BACKEND", author=cls.outsider
+        )
+        Contributor.objects.create(user=cls.outsider, project=cls.other)
+
+    def sync(self, user, query=""):
+        return client_for(user).get("/sync/" + query)
+
+    def changes(self, user, since=0):
+        response = self.sync(user, "?since=%d" % since)
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertFalse(body["has_more"])
+        return [
+            (change["kind"], change["id"], change["deleted"])
+            for change in body["changes"]
+        ]
+
+    def cursor(self):
+        return Change.objects.order_by("-id").values_list("id", flat=True).first()
+
+    def test_users_read_the_changes_of_their_projects(self):
+        response = self.sync(self.member)
+        body = response.json()
+        self.assertEqual(body["cursor"], body["changes"][-1]["seq"])
+        self.assertEqual(
+            [(change["kind"], change["id"]) for change in body["changes"]],
+            [
+                ("project", self.project.id),
+                ("contributor", self.member.id),
+                ("contributor", self.leaver.id),
+                ("issue", self.issue.id),
+                ("comment", self.comments[0].id),
+                ("comment", self.comments[1].id),
+            ],
+        )
+        self.assertEqual(body["changes"][3]["data"]["title"], "Issue")
+        self.assertEqual(
+            self.changes(self.outsider),
+            [
+                ("project", self.other.id, False),
+                ("contributor", self.outsider.id, False),
+            ],
+        )
+        self.assertEqual(len(self.changes(self.superuser)), 8)
+
+    def test_pages_follow_the_cursor(self):
+        seen = []
+        cursor, has_more = 0, True
+        while has_more:
+            body = self.sync(self.member, "?since=%d&limit=4" % cursor).json()
+            self.assertLessEqual(len(body["changes"]), 4)
+            seen += [change["seq"] for change in body["changes"]]
+            cursor, has_more = body["cursor"], body["has_more"]
+        self.assertEqual(len(seen), 6)
+        self.assertEqual(seen, sorted(seen))
+        self.assertEqual(self.changes(self.member, cursor), [])
+
+    def test_an_edit_supersedes_the_earlier_changes_of_an_object(self):
+        cursor = self.cursor()
+        issue = Issue.objects.get(pk=self.issue.pk)
+        for title in ("First", "Second"):
+            issue.title = title
+            issue.save()
+        self.assertEqual(
+            self.changes(self.member, cursor)[-1], ("issue", self.issue.id, False)
+        )
+        self.assertEqual(
+            Change.objects.filter(kind="issue", object_id=self.issue.id).count(), 1
+        )
+
+    def test_deleted_comments_leave_tombstones(self):
+        cursor = self.cursor()
+        comment_id = self.comments[0].id
+        self.comments[0].delete()
+        self.assertEqual(
+            self.changes(self.member, cursor)[-1], ("comment", comment_id, True)
+        )
+
+    def test_the_tombstone_of_an_issue_stands_for_its_comments(self):
+        cursor = self.cursor()
+        Issue.objects.get(pk=self.issue.pk).delete()
+        self.assertEqual(
+            self.changes(self.member, cursor), [("issue", self.issue.id, True)]
+        )
+        self.assertFalse(Change.objects.filter(kind="comment").exists())
+
+    def test_a_removed_member_alone_reads_the_tombstone_of_the_project(self):
+        cursor = self.cursor()
+        Contributor.objects.get(user=self.leaver, project=self.project).delete()
+        self.assertEqual(
+            self.changes(self.leaver, cursor), [("project", self.project.id, True)]
+        )
+        self.assertEqual(
+            self.changes(self.member, cursor), [("contributor", self.leaver.id, True)]
+        )
+        # Later changes of the project are no longer visible to them
+        Issue.objects.get(pk=self.issue.pk).save()
+        self.assertEqual(len(self.changes(self.leaver, cursor)), 1)
+
+    def test_deleting_a_project_leaves_its_tombstones_only(self):
+        cursor = self.cursor()
+        Project.objects.get(pk=self.project.pk).delete()
+        for user in (self.member, self.leaver):
+            self.assertEqual(
+                self.changes(user, cursor), [("project", self.project.id, True)]
+            )
+        self.assertEqual(
+            self.changes(self.superuser, cursor), [("project", self.project.id, True)]
+        )
+        self.assertEqual(
+            Change.objects.filter(project_id=self.project.id, user_id=None).count(), 1
+        )
+
+    def test_invalid_parameters_are_rejected(self):
+        for query in ("?since=x", "?limit=x"):
+            self.assertEqual(self.sync(self.member, query).status_code, 400, query)
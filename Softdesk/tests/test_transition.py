@@ -0,0 +1,91 @@
+from django.test import override_settings
+
+from accounts.models import User
+from Softdesk.models import Contributor, Issue
+from Softdesk.tests.base import ProjectTestCase
+
+
+class TransitionTests(ProjectTestCase):
+    project_name = "Transition"
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.other = User.objects.create(username="other")
+        Contributor.objects.create(user=cls.other, project=cls.project)
+        cls.mine = [
+            cls.create_issue("Mine %d" % number, priority=priority)
+            for number, priority in enumerate(["LOW", "HIGH", "HIGH"])
+        ]
+        cls.theirs = cls.create_issue(
+            "Theirs", priority="HIGH", author=cls.other, assigned_to=cls.other
+        )
+
+    def setUp(self):
+        super().setUp()
+        self.path = "/projects/%d/issues/transition/" % self.project.id
+
+    def transition(self, data):
+        return self.client.post(self.path, data, format="json")
+
+    def test_issues_selected_by_ids_are_changed(self):
+        response = self.transition(
+            {
+                "ids": [self.mine[0].id, self.theirs.id, 999999],
+                "status": Issue.FINISHED_STATUS,
+                "assigned_to": self.other.id,
+            }
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(),
+            {"updated": 1, "forbidden": [self.theirs.id], "not_found": [999999]},
+        )
+        issue = Issue.objects.get(pk=self.mine[0].pk)
+        self.assertEqual(issue.status, Issue.FINISHED_STATUS)
+        self.assertEqual(issue.assigned_to_id, self.other.id)
+        self.assertIsNotNone(issue.time_finished)
+        # Only their author may change an issue
+        self.assertEqual(Issue.objects.get(pk=self.theirs.pk).status, "To Do")
+
+    def test_issues_selected_by_a_filter_are_changed(self):
+        response = self.transition(
+            {"filter": {"priority": "HIGH"}, "status": "In Progress"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["updated"], 2)
+        self.assertEqual(
+            sorted(
+                Issue.objects.filter(status="In Progress").values_list("id", flat=True)
+            ),
+            [self.mine[1].id, self.mine[2].id],
+        )
+
+    def test_reopening_clears_the_finish_time(self):
+        self.transition({"ids": [self.mine[0].id], "status": Issue.FINISHED_STATUS})
+        finished = Issue.objects.get(pk=self.mine[0].pk).time_finished
+        # Finishing again keeps the first finish time
+        self.transition({"ids": [self.mine[0].id], "status": Issue.FINISHED_STATUS})
+        self.assertEqual(Issue.objects.get(pk=self.mine[0].pk).time_finished, finished)
+        self.transition({"ids": [self.mine[0].id], "status": "To Do"})
+        self.assertIsNone(Issue.objects.get(pk=self.mine[0].pk).time_finished)
+
+    def test_a_selector_and_a_change_are_required(self):
+        for data in (
+            {"status": "To Do"},
+            {"ids": [self.mine[0].id], "filter": {"tag": "BUG"}, "status": "To Do"},
+            {"ids": [self.mine[0].id]},
+        ):
+            self.assertEqual(self.transition(data).status_code, 400, data)
+
+    def test_an_empty_filter_is_rejected(self):
+        response = self.transition({"filter": {}, "status": Issue.FINISHED_STATUS})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("filter", response.json())
+        self.assertFalse(Issue.objects.filter(status=Issue.FINISHED_STATUS).exists())
+
+    @override_settings(SOFTDESK_BULK_TRANSITION_MAX_ROWS=2)
+    def test_filters_matching_too_many_issues_are_rejected(self):
+        response = self.transition({"filter": {"tag": "BUG"}, "status": "To Do"})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("filter", response.json())
@@ -2,14 +2,17 @@ from django.urls import path, include
 from rest_framework_nested import routers
 
 
+from Softdesk import async_views
 from Softdesk.views import (
     ProjectViewSet,
     IssueViewSet,
     CommentViewSet,
     ContributorViewSet,
+    DetailCacheStatsView,
+    SearchView,
+    SyncView,
 )
 
-
 router = routers.SimpleRouter()
 
 router.register(r"projects", ProjectViewSet)
@@ -27,7 +30,40 @@ issues_router = routers.NestedSimpleRouter(projects_router, r"issues", lookup="i
 issues_router.register(r"comments", CommentViewSet, basename="comments")
 
 
+# Read endpoints served without blocking the event loop when running under ASGI
+async_urlpatterns = [
+    path("projects/", async_views.project_list, name="async-projects-list"),
+    path(
+        "projects/<int:pk>/", async_views.project_detail, name="async-projects-detail"
+    ),
+    path(
+        "projects/<int:project_pk>/issues/",
+        async_views.issue_list,
+        name="async-issues-list",
+    ),
+    path(
+        "projects/<int:project_pk>/issues/<int:pk>/",
+        async_views.issue_detail,
+        name="async-issues-detail",
+    ),
+    path(
+        "projects/<int:project_pk>/issues/<int:issue_pk>/comments/",
+        async_views.comment_list,
+        name="async-comments-list",
+    ),
+    path(
+        "projects/<int:project_pk>/issues/<int:issue_pk>/comments/<int:pk>/",
+        async_views.comment_detail,
+        name="async-comments-detail",
+    ),
+]
+
+
 urlpatterns = [
+    path("async/", include(async_urlpatterns)),
+    path("cache/stats/", DetailCacheStatsView.as_view(), name="detail-cache-stats"),
+    path("search/", SearchView.as_view(), name="search"),
+    path("sync/", SyncView.as_view(), name="sync"),
     path("", include(router.urls)),
     path("", include(projects_router.urls)),
     path("", include(issues_router.urls)),
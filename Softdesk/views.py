@@ -1,9 +1,46 @@
+import hashlib
+import uuid
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import DateTimeField, Max, Value
+from django.db.models.functions import Coalesce
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.response import Response
+from rest_framework.generics import GenericAPIView
+from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.views import APIView
 from rest_framework.viewsets import ModelViewSet
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
-from Softdesk.permissions import IsContributor, AuthorOrReadOnly
+from Softdesk.fieldsets import SparseQuerysetMixin
+from Softdesk.filters import CounterRangeFilter, StableOrderingFilter
+from Softdesk.pagination import OptionalKeysetPagination
+from Softdesk.permissions import (
+    IsContributor,
+    AuthorOrReadOnly,
+    get_contributor_project_ids,
+)
 
 
+from accounts.models import User
 from .models import Project, Issue, Comment, Contributor
+from .cache import detail_cache
+from .changes import read_changes, record_changes
+from .db import serialized_create
+from .events import publish_event
+from .exports import CSV_EXPORT_FIELDS, export_project
+from .parsers import FastJSONParser, NDJSONParser
+from .renderers import CSVRenderer, FastJSONRenderer, NDJSONRenderer
+from .search import SearchResults, build_match_query
+from .statistics import compute_project_statistics, get_project_rollup
+from .signals import counter_changes, touch_projects
+from .streaming import csv_lines, iterate_rows, ndjson_lines
 
 from .serializers import (
     ProjectListSerializer,
@@ -12,10 +49,24 @@ from .serializers import (
     ContributorSerializer,
     ProjectDetailSerializer,
     IssueDetailSerializer,
+    IssueImportSerializer,
+    IssueTransitionSerializer,
     CommentDetailSerializer,
+    FEED_SERIALIZERS,
 )
 
 
+def get_batch_size(request, default):
+    """
+    Return the batch size requested with `?batch_size=`, bounded by the configured default.
+    """
+    try:
+        batch_size = int(request.query_params.get("batch_size", default))
+    except ValueError:
+        raise ValidationError({"batch_size": "A valid integer is required."})
+    return max(1, min(batch_size, default))
+
+
 class MultipleSerializerMixin:
     """
     A mixin class that provides dynamic serializer selection based on the view action.
@@ -44,7 +95,59 @@ class MultipleSerializerMixin:
         return self.serializer_class
 
 
-class ProjectViewSet(MultipleSerializerMixin, ModelViewSet):
+class ConditionalRetrieveMixin:
+    """
+    A mixin class answering conditional GET requests on detail views and caching their payloads.
+
+    The ETag of a response is derived from the version token of the object, which changes whenever the
+    object or its embedded children change, and from the query string and negotiated media type that
+    shape the representation. A request whose If-None-Match matches gets a 304 straight after the
+    object lookup and permission checks, without running the serializer or its child queries.
+    Otherwise the serialized payload is read from the detail cache, and only built on a miss.
+
+    Methods:
+        retrieve(request): Returns the serialized object, or 304 if the client copy is current.
+        get_variant(): Returns a digest of what shapes the representation besides the object.
+        get_etag(instance, variant): Returns the ETag of the object's current representation.
+    """
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        variant = self.get_variant()
+        etag = self.get_etag(instance, variant)
+        if_none_match = request.META.get("HTTP_IF_NONE_MATCH")
+        if if_none_match and (
+            if_none_match.strip() == "*" or etag in parse_etags(if_none_match)
+        ):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+        serializer_class = self.get_serializer_class()
+        data = detail_cache.get(serializer_class, instance, variant)
+        if data is None:
+            data = self.get_serializer(instance).data
+            detail_cache.set(serializer_class, instance, variant, data)
+        return Response(data, headers={"ETag": etag})
+
+    def get_variant(self):
+        request = self.request
+        return hashlib.blake2b(
+            "|".join(
+                [
+                    request.get_host(),
+                    request.META.get("QUERY_STRING", ""),
+                    request.accepted_media_type or "",
+                ]
+            ).encode("utf-8"),
+            digest_size=8,
+        ).hexdigest()
+
+    def get_etag(self, instance, variant):
+        return quote_etag("%s-%s-%s" % (instance.pk, instance.version.hex, variant))
+
+
+class ProjectViewSet(
+    SparseQuerysetMixin, ConditionalRetrieveMixin, MultipleSerializerMixin, ModelViewSet
+):
     """
     A viewset for managing Project instances.
 
@@ -56,25 +159,43 @@ class ProjectViewSet(MultipleSerializerMixin, ModelViewSet):
         queryset (queryset): The initial queryset for retrieving projects.
         serializer_class (serializer): The serializer class for listing projects.
         detail_serializer_class (serializer): The serializer class for detailed project views.
+        pagination_class (class): Limit/offset pagination, with opt-in keyset pagination.
+        keyset_ordering (tuple): The default ordering used by keyset pagination.
+        sparse_required_fields (tuple): Loaded with any `?fields=`, the version makes the ETag.
+        filter_backends (list): Sorting with `?ordering=` and counter ranges with `?min_/max_<counter>=`.
+        ordering_fields (list): The fields projects can be sorted on.
+        counter_filter_fields (list): The counters projects can be filtered on.
 
     Methods:
-        get_queryset(): Returns a queryset filtered to include projects where the user is a contributor.
+        get_queryset(): Returns a queryset filtered to include projects where the user is a contributor,
+            reusing the membership already loaded by the permission checks.
         perform_create(serializer): Customizes project creation to include the project's author as a contributor.
+        export(request, pk): Streams the project's issues and comments as NDJSON or CSV.
+        stats(request, pk): Returns the issue statistics of the project.
     """
 
     permission_classes = [AuthorOrReadOnly, IsContributor, IsAuthenticated]
     queryset = Project.objects.all()
     serializer_class = ProjectListSerializer
     detail_serializer_class = ProjectDetailSerializer
+    pagination_class = OptionalKeysetPagination
+    keyset_ordering = ("id",)
+    sparse_required_fields = ("version",)
+    filter_backends = [StableOrderingFilter, CounterRangeFilter]
+    ordering_fields = ["id", "issue_count", "open_issue_count"]
+    counter_filter_fields = ["issue_count", "open_issue_count"]
 
     def get_queryset(self):
         user = self.request.user
         if user.is_superuser:
             project_list = Project.objects.all()
         else:
-            project_list = Project.objects.filter(contributors__user=user)
-        return project_list
+            project_list = Project.objects.filter(
+                id__in=get_contributor_project_ids(self.request)
+            )
+        return project_list.order_by(*self.keyset_ordering)
 
+    @serialized_create
     def perform_create(self, serializer):
         # Save the project instance and get the created object
         project = serializer.save(author=self.request.user)
@@ -82,8 +203,80 @@ class ProjectViewSet(MultipleSerializerMixin, ModelViewSet):
         # Creation of contributor object using the related_name attribute contributors
         project.contributors.create(user=project.author)
 
+    @action(
+        detail=True, methods=["get"], renderer_classes=[NDJSONRenderer, CSVRenderer]
+    )
+    def export(self, request, *args, **kwargs):
+        """
+        Stream every issue of the project, with its comments, as NDJSON (default) or CSV (`?format=csv`).
+
+        `?comments=inline|separate|none` chooses whether comments are nested in their issue (NDJSON
+        only, the NDJSON default) or emitted as records of their own (the CSV default).
+        `?since=<ISO 8601 timestamp>` only exports the records created from that time on.
+        """
+        project = self.get_object()
+        output = request.accepted_renderer.format
+        comments = request.query_params.get(
+            "comments", "inline" if output == "ndjson" else "separate"
+        )
+        if comments not in ("inline", "separate", "none"):
+            raise ValidationError({"comments": "Expected inline, separate or none."})
+        if comments == "inline" and output == "csv":
+            raise ValidationError({"comments": "CSV exports cannot inline comments."})
+        since = request.query_params.get("since")
+        if since is not None:
+            since = parse_datetime(since)
+            if since is None:
+                raise ValidationError({"since": "Expected an ISO 8601 timestamp."})
+            if timezone.is_naive(since):
+                since = timezone.make_aware(since, timezone.utc)
+
+        records = export_project(
+            project.id,
+            comments=comments,
+            since=since,
+            chunk_size=settings.SOFTDESK_STREAM_CHUNK_SIZE,
+        )
+        if output == "csv":
+            content = csv_lines(records, CSV_EXPORT_FIELDS)
+        else:
+            content = ndjson_lines(records)
+        response = StreamingHttpResponse(
+            content, content_type=request.accepted_renderer.media_type
+        )
+        response["Content-Disposition"] = 'attachment; filename="project-%d.%s"' % (
+            project.id,
+            output,
+        )
+        return response
+
+    @action(detail=True, methods=["get"])
+    def stats(self, request, *args, **kwargs):
+        """
+        Return the issue counts of the project by status, priority, tag and assignee, the open and
+        finished counts and the median time to finish, computed with aggregate queries.
+
+        With `?rollup=true` the precomputed statistics are served instead, refreshed when issues changed
+        and they are older than SOFTDESK_STATS_ROLLUP_MAX_AGE seconds.
+        """
+        project = self.get_object()
+        if request.query_params.get("rollup", "").lower() in ("1", "true", "yes"):
+            rollup = get_project_rollup(
+                project.id, settings.SOFTDESK_STATS_ROLLUP_MAX_AGE
+            )
+            data = dict(
+                rollup.data, stale=rollup.is_stale, time_computed=rollup.time_computed
+            )
+        else:
+            data = dict(
+                compute_project_statistics(project.id), time_computed=timezone.now()
+            )
+        return Response(dict(data, project=project.id))
 
-class IssueViewSet(MultipleSerializerMixin, ModelViewSet):
+
+class IssueViewSet(
+    SparseQuerysetMixin, ConditionalRetrieveMixin, MultipleSerializerMixin, ModelViewSet
+):
     """
     A viewset for managing Issue instances within a Project.
 
@@ -95,28 +288,212 @@ class IssueViewSet(MultipleSerializerMixin, ModelViewSet):
         queryset (queryset): The initial queryset for retrieving issues.
         serializer_class (serializer): The serializer class for listing issues.
         detail_serializer_class (serializer): The serializer class for detailed issue views.
+        pagination_class (class): Limit/offset pagination, with opt-in keyset pagination.
+        keyset_ordering (tuple): The default ordering used by keyset pagination.
+        sparse_required_fields (tuple): Loaded with any `?fields=`, the version makes the ETag.
+        filter_backends (list): Sorting with `?ordering=` and counter ranges with `?min_/max_<counter>=`.
+        ordering_fields (list): The fields issues can be sorted on.
+        counter_filter_fields (list): The counters issues can be filtered on.
 
     Methods:
         get_queryset(): Returns a queryset filtered to include issues within the specified project.
         perform_create(serializer): Customizes issue creation to associate it with the project and set the author.
+        bulk(request): Imports a JSON array or NDJSON body of issues in batched inserts.
+        transition(request): Applies a status and/or assignee change to many issues with one UPDATE.
     """
 
     permission_classes = [AuthorOrReadOnly, IsContributor, IsAuthenticated]
     queryset = Issue.objects.all()
     serializer_class = IssueListSerializer
     detail_serializer_class = IssueDetailSerializer
+    pagination_class = OptionalKeysetPagination
+    keyset_ordering = ("time_created", "id")
+    sparse_required_fields = ("version",)
+    filter_backends = [StableOrderingFilter, CounterRangeFilter]
+    ordering_fields = ["time_created", "comment_count"]
+    counter_filter_fields = ["comment_count"]
 
     def get_queryset(self):
-        return Issue.objects.filter(project_id=self.kwargs["project_pk"])
+        return Issue.objects.filter(project_id=self.kwargs["project_pk"]).order_by(
+            *self.keyset_ordering
+        )
 
+    @serialized_create
     def perform_create(self, serializer):
         project_id = self.kwargs["project_pk"]
         project = Project.objects.get(id=project_id)
         # Save the project instance and get the created object
         serializer.save(author=self.request.user, project=project)
 
-
-class CommentViewSet(MultipleSerializerMixin, ModelViewSet):
+    @action(
+        detail=False, methods=["post"], parser_classes=[FastJSONParser, NDJSONParser]
+    )
+    def bulk(self, request, *args, **kwargs):
+        """
+        Import many issues into the project in one request.
+
+        The body is a JSON array or an NDJSON stream of issues. Every row is validated first, with a
+        single query for all referenced assignees; if any row is invalid nothing is written and the
+        errors are returned per row. Otherwise the issues are written with bulk_create in batches of
+        `?batch_size=` (at most SOFTDESK_BULK_BATCH_SIZE) inside one transaction.
+        """
+        rows = request.data
+        if not isinstance(rows, list):
+            raise ValidationError({"detail": "Expected a list of issues."})
+        if len(rows) > settings.SOFTDESK_BULK_IMPORT_MAX_ROWS:
+            raise ValidationError(
+                {
+                    "detail": "At most %d issues can be imported at once."
+                    % settings.SOFTDESK_BULK_IMPORT_MAX_ROWS
+                }
+            )
+        batch_size = get_batch_size(request, settings.SOFTDESK_BULK_BATCH_SIZE)
+        project_id = self.kwargs["project_pk"]
+        if not Project.objects.filter(pk=project_id).exists():
+            raise NotFound()
+
+        child = IssueImportSerializer()
+        validated = []
+        errors = []
+        for row in rows:
+            try:
+                validated.append(child.run_validation(row))
+                errors.append(None)
+            except ValidationError as exc:
+                validated.append(None)
+                errors.append(exc.detail)
+
+        assignee_ids = {
+            row.get("assigned_to", request.user.id) for row in validated if row
+        }
+        known_ids = set(
+            User.objects.filter(id__in=assignee_ids).values_list("id", flat=True)
+        )
+        for index, row in enumerate(validated):
+            if row and row.get("assigned_to", request.user.id) not in known_ids:
+                errors[index] = {"assigned_to": ["Invalid pk - object does not exist."]}
+
+        row_errors = [
+            {"row": index, "errors": error}
+            for index, error in enumerate(errors)
+            if error
+        ]
+        if row_errors:
+            return Response(
+                {"created": 0, "errors": row_errors}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        now = timezone.now()
+        issues = [
+            Issue(
+                project_id=project_id,
+                author_id=request.user.id,
+                assigned_to_id=row.pop("assigned_to", request.user.id),
+                time_created=now,
+                **row,
+            )
+            for row in validated
+        ]
+        for issue in issues:
+            issue.sync_time_finished()
+        open_issues = sum(issue.is_open for issue in issues)
+        with transaction.atomic():
+            # bulk_create does not set the ids on SQLite, the new issues are those after the last id
+            last_id = Issue.objects.aggregate(last=Max("id"))["last"] or 0
+            Issue.objects.bulk_create(issues, batch_size=batch_size)
+            touch_projects(
+                project_id,
+                **counter_changes(
+                    issue_count=len(issues), open_issue_count=open_issues
+                ),
+            )
+            created = list(
+                Issue.objects.filter(project_id=project_id, id__gt=last_id).values_list(
+                    "id", flat=True
+                )
+            )
+            record_changes("issue", project_id, created, supersede=False)
+            publish_event("issues.created", {"ids": created}, project_id)
+        return Response({"created": len(issues)}, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=["post"])
+    def transition(self, request, *args, **kwargs):
+        """
+        Move many issues of the project to a new status and/or assignee.
+
+        The issues are selected by `ids` or by `filter`. Their authors are read with a single query to
+        check permissions for the whole batch, then the issues the user authored are changed with one
+        UPDATE ... WHERE id IN (...). The response only summarizes the outcome.
+        """
+        serializer = IssueTransitionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        limit = settings.SOFTDESK_BULK_TRANSITION_MAX_ROWS
+
+        candidates = self.get_queryset()
+        if "ids" in data:
+            candidates = candidates.filter(id__in=data["ids"])
+        else:
+            candidates = candidates.filter(**data["filter"])
+        rows = list(candidates.values_list("id", "author_id", "status")[: limit + 1])
+        if len(rows) > limit:
+            raise ValidationError(
+                {"filter": "The filter matches more than %d issues." % limit}
+            )
+
+        user_id = request.user.id
+        allowed = [pk for pk, author_id, _ in rows if author_id == user_id]
+        forbidden = [pk for pk, author_id, _ in rows if author_id != user_id]
+        found = {pk for pk, _, _ in rows}
+        not_found = [pk for pk in data.get("ids", []) if pk not in found]
+
+        changes = {}
+        if "status" in data:
+            changes["status"] = data["status"]
+            if data["status"] == Issue.FINISHED_STATUS:
+                # Keep the finish time of issues that were already finished
+                changes["time_finished"] = Coalesce(
+                    "time_finished", Value(timezone.now(), output_field=DateTimeField())
+                )
+            else:
+                changes["time_finished"] = None
+        if "assigned_to" in data:
+            changes["assigned_to"] = data["assigned_to"]
+        open_delta = 0
+        if "status" in data:
+            # The open issue counter moves by the allowed issues that changed side
+            now_open = data["status"] != Issue.FINISHED_STATUS
+            open_delta = sum(
+                now_open - (issue_status != Issue.FINISHED_STATUS)
+                for _, author_id, issue_status in rows
+                if author_id == user_id
+            )
+        updated = 0
+        if allowed:
+            with transaction.atomic():
+                updated = Issue.objects.filter(id__in=allowed).update(
+                    version=uuid.uuid4(), **changes
+                )
+                touch_projects(
+                    self.kwargs["project_pk"],
+                    **counter_changes(open_issue_count=open_delta),
+                )
+                record_changes("issue", self.kwargs["project_pk"], allowed)
+                publish_event(
+                    "issues.updated",
+                    {"ids": allowed},
+                    self.kwargs["project_pk"],
+                    allowed,
+                )
+            detail_cache.invalidate(Issue, *allowed)
+        return Response(
+            {"updated": updated, "forbidden": forbidden, "not_found": not_found}
+        )
+
+
+class CommentViewSet(
+    SparseQuerysetMixin, ConditionalRetrieveMixin, MultipleSerializerMixin, ModelViewSet
+):
     """
     A viewset for managing Comment instances within an Issue.
 
@@ -128,28 +505,77 @@ class CommentViewSet(MultipleSerializerMixin, ModelViewSet):
         queryset (queryset): The initial queryset for retrieving comments.
         serializer_class (serializer): The serializer class for listing comments.
         detail_serializer_class (serializer): The serializer class for detailed comment views.
+        pagination_class (class): Limit/offset pagination, with opt-in keyset pagination.
+        keyset_ordering (tuple): The ordering used by keyset pagination.
+        sparse_required_fields (tuple): Loaded with any `?fields=`, the version makes the ETag.
 
     Methods:
         get_queryset(): Returns a queryset filtered to include comments within the specified issue.
         perform_create(serializer): Customizes comment creation to associate it with the issue and set the author.
+        stream(request): Streams the full comment history of the issue as NDJSON.
     """
 
     permission_classes = [AuthorOrReadOnly, IsContributor, IsAuthenticated]
     queryset = Comment.objects.all()
     serializer_class = CommentListSerializer
     detail_serializer_class = CommentDetailSerializer
+    pagination_class = OptionalKeysetPagination
+    keyset_ordering = ("time_created", "id")
+    sparse_required_fields = ("version",)
 
     def get_queryset(self):
-        return Comment.objects.filter(issue_id=self.kwargs["issue_pk"])
+        # The issue must belong to the project of the URL, the one the permissions checked
+        return Comment.objects.filter(
+            issue_id=self.kwargs["issue_pk"],
+            issue__project_id=self.kwargs["project_pk"],
+        ).order_by(*self.keyset_ordering)
 
+    @serialized_create
     def perform_create(self, serializer):
         issue_id = self.kwargs["issue_pk"]
-        issue = Issue.objects.get(id=issue_id)
+        issue = Issue.objects.filter(
+            id=issue_id, project_id=self.kwargs["project_pk"]
+        ).first()
+        if issue is None:
+            raise NotFound()
         # Save the project instance and get the created object
         issue = serializer.save(author=self.request.user, issue=issue)
 
-
-class ContributorViewSet(MultipleSerializerMixin, ModelViewSet):
+    @action(
+        detail=False,
+        methods=["get"],
+        renderer_classes=[NDJSONRenderer, FastJSONRenderer],
+    )
+    def stream(self, request, *args, **kwargs):
+        """
+        Stream every comment of the issue, oldest first, as one JSON object per line.
+
+        Rows are read with a chunked iterator and written to the response as they are read, so memory
+        stays flat whatever the number of comments.
+        """
+        # Checked before streaming starts, as an empty stream would be a 200
+        if not Issue.objects.filter(
+            id=self.kwargs["issue_pk"], project_id=self.kwargs["project_pk"]
+        ).exists():
+            raise NotFound()
+        rows = iterate_rows(
+            self.get_queryset(),
+            {
+                "id": "id",
+                "text": "text",
+                "author": "author_id",
+                "time_created": "time_created",
+                "unique_identifier": "unique_identifier",
+                "issue": "issue_id",
+            },
+            chunk_size=settings.SOFTDESK_STREAM_CHUNK_SIZE,
+        )
+        return StreamingHttpResponse(
+            ndjson_lines(rows), content_type=NDJSONRenderer.media_type
+        )
+
+
+class ContributorViewSet(SparseQuerysetMixin, MultipleSerializerMixin, ModelViewSet):
     """
     A viewset for managing Contributor instances within a Project.
 
@@ -178,8 +604,164 @@ class ContributorViewSet(MultipleSerializerMixin, ModelViewSet):
         queryset = Contributor.objects.filter(project=project_id)
         return queryset
 
+    @serialized_create
     def perform_create(self, serializer):
         project_id = self.kwargs["project_pk"]
         project = Project.objects.get(id=project_id)
         # Save the project instance and get the created object
         serializer.save(project=project)
+
+
+class DetailCacheStatsView(APIView):
+    """
+    A view exposing the counters of the detail payload cache, for sizing it.
+
+    The counters are those of the process serving the request.
+
+    Attributes:
+        permission_classes (list): Only staff users may read the counters.
+    """
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, *args, **kwargs):
+        return Response(
+            dict(
+                detail_cache.stats(),
+                alias=detail_cache.alias,
+                timeout=detail_cache.timeout,
+            )
+        )
+
+
+class SearchView(GenericAPIView):
+    """
+    A view for full-text search over issue titles and descriptions and comment texts.
+
+    The search runs on the SQLite FTS5 index, scoped to the projects the user contributes to (every
+    project for superusers), and returns limit/offset pages of results ranked by relevance.
+    Query parameters: `q` (required), `kind` (issue or comment) and `project` to narrow the search.
+
+    Attributes:
+        permission_classes (list): The permission classes required for searching.
+        pagination_class (class): The pagination applied to the ranked results.
+    """
+
+    permission_classes = [IsAuthenticated]
+    pagination_class = LimitOffsetPagination
+
+    def get(self, request, *args, **kwargs):
+        match = build_match_query(request.query_params.get("q", ""))
+        if not match:
+            raise ValidationError({"q": "This query parameter is required."})
+        kinds = ("issue", "comment")
+        kind = request.query_params.get("kind")
+        if kind is not None:
+            if kind not in kinds:
+                raise ValidationError({"kind": "Expected issue or comment."})
+            kinds = (kind,)
+
+        project_ids = None
+        if not request.user.is_superuser:
+            project_ids = get_contributor_project_ids(request)
+        project = request.query_params.get("project")
+        if project is not None:
+            try:
+                project = int(project)
+            except ValueError:
+                raise ValidationError({"project": "A valid integer is required."})
+            if project_ids is not None and project not in project_ids:
+                project_ids = []
+            else:
+                project_ids = [project]
+
+        results = SearchResults(match, project_ids, kinds)
+        page = self.paginate_queryset(results)
+        return self.get_paginated_response(page)
+
+
+class SyncView(APIView):
+    """
+    A view returning the changes made to the projects of the user after a cursor, for incremental sync.
+
+    `?since=` is the cursor returned by the previous sync (0, the default, reads every change) and
+    `?limit=` the page size, at most SOFTDESK_SYNC_PAGE_SIZE. Each change names the kind and id of an
+    object and its project, and tells whether the object was deleted or else gives its current
+    representation, read with one query per kind. A client applies the pages until `has_more` is
+    false and keeps the last `cursor` for its next sync. Contributors are identified by their user;
+    when the user joins a project, the contributor change naming them is the signal to download the
+    project in full, for its earlier changes precede the cursor. Objects deleted with their parent
+    have no tombstone of their own: the tombstone of an issue also deletes its comments, and that of
+    a project everything in it.
+
+    Attributes:
+        permission_classes (list): The permission classes required for syncing.
+        models (dict): The model of each kind of object represented with FEED_SERIALIZERS.
+    """
+
+    permission_classes = [IsAuthenticated]
+    models = {"project": Project, "issue": Issue, "comment": Comment}
+
+    def get(self, request, *args, **kwargs):
+        try:
+            since = int(request.query_params.get("since", 0))
+        except ValueError:
+            raise ValidationError({"since": "A valid integer is required."})
+        page_size = settings.SOFTDESK_SYNC_PAGE_SIZE
+        try:
+            limit = int(request.query_params.get("limit", page_size))
+        except ValueError:
+            raise ValidationError({"limit": "A valid integer is required."})
+        limit = max(1, min(limit, page_size))
+
+        project_ids = None
+        if not request.user.is_superuser:
+            project_ids = get_contributor_project_ids(request)
+        changes, has_more = read_changes(request.user.id, project_ids, since, limit)
+        data = self.get_representations(changes)
+        return Response(
+            {
+                "cursor": changes[-1].id if changes else since,
+                "has_more": has_more,
+                "changes": [
+                    {
+                        "seq": change.id,
+                        "kind": change.kind,
+                        "id": change.object_id,
+                        "project": change.project_id,
+                        "deleted": (change.kind, change.object_id) not in data,
+                        "data": data.get((change.kind, change.object_id)),
+                    }
+                    for change in changes
+                ],
+            }
+        )
+
+    def get_representations(self, changes):
+        """
+        Return the representations of the objects that the changes did not delete, by kind and id.
+
+        Objects deleted since their change was read are left out, and so reported deleted.
+        """
+        ids = {}
+        for change in changes:
+            if not change.deleted:
+                ids.setdefault(change.kind, set()).add(change.object_id)
+        data = {
+            ("contributor", change.object_id): {
+                "user": change.object_id,
+                "project": change.project_id,
+            }
+            for change in changes
+            if change.kind == "contributor" and not change.deleted
+        }
+        for kind, (serializer_class, options) in FEED_SERIALIZERS.items():
+            if kind not in ids:
+                continue
+            objects = self.models[kind].objects.filter(id__in=ids[kind]).order_by("id")
+            serializer = serializer_class(
+                objects, many=True, context={"request": self.request}, **options
+            )
+            for representation in serializer.data:
+                data[kind, representation["id"]] = representation
+        return data
@@ -0,0 +1,116 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import User
+
+# The user fields needed by authentication and the permission classes, in model order as expected by
+# Model.from_db; the other fields of the request user are deferred and loaded on first access
+CACHED_USER_FIELDS = tuple(
+    field.attname
+    for field in User._meta.concrete_fields
+    if field.attname in {"id", "username", "is_active", "is_staff", "is_superuser"}
+)
+
+
+class UserCache:
+    """
+    Bounded, per-process LRU cache of the user fields needed to authenticate a request.
+
+    Entries expire after `ttl` seconds, which bounds how long another process may keep serving fields
+    that changed; in this process they are dropped as soon as the user is saved or deleted.
+
+    Entries are keyed by user id alone and invalidated by the post_save / post_delete signals. Writes
+    that send no signal, such as `User.objects.filter(...).update(is_active=False)` or raw SQL, are
+    not seen: the old fields are served for up to `ttl` seconds, so such code should call
+    invalidate() or clear() itself. A key holding a token or password version would not help, as a
+    cached entry is served without reading the user row the version lives in.
+
+    Attributes:
+        max_size (int): The number of users kept, 0 disables the cache.
+        ttl (float): The lifetime of an entry, in seconds.
+
+    Methods:
+        - get(user_id): Returns the cached field values of the user or None.
+        - set(user_id, values): Stores the field values of a user.
+        - invalidate(user_id): Drops the entry of a user.
+        - clear(): Drops every entry.
+    """
+
+    def __init__(self, max_size, ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            expires, values = entry
+            if expires < time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return values
+
+    def set(self, user_id, values):
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + self.ttl, values)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+user_cache = UserCache(
+    settings.SOFTDESK_AUTH_USER_CACHE_SIZE, settings.SOFTDESK_AUTH_USER_CACHE_TTL
+)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that does not query the user table for every request.
+
+    The fields of CACHED_USER_FIELDS are read once per user and kept in `user_cache`; each request
+    gets a fresh User instance built from them, as if it had been loaded with `.only()`.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        values = user_cache.get(user_id)
+        if values is None:
+            values = (
+                User.objects.filter(**{api_settings.USER_ID_FIELD: user_id})
+                .values_list(*CACHED_USER_FIELDS)
+                .first()
+            )
+            if values is None:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found")
+            user_cache.set(user_id, values)
+
+        user = User.from_db(DEFAULT_DB_ALIAS, CACHED_USER_FIELDS, values)
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return user
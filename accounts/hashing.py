@@ -0,0 +1,98 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+def _init_worker(initializer=None, initargs=()):
+    """
+    Set Django up in a pool process, so that the hashers read the project settings.
+
+    The process inherits DJANGO_SETTINGS_MODULE from the environment of the parent.
+    """
+    import django
+
+    django.setup()
+    if initializer is not None:
+        initializer(*initargs)
+
+
+def _make_password(password):
+    return hashers.make_password(password)
+
+
+def _verify_password(password, encoded):
+    must_update = []
+    valid = hashers.check_password(
+        password, encoded, setter=lambda raw: must_update.append(True)
+    )
+    return valid, bool(must_update)
+
+
+class PasswordHashingPool:
+    """
+    Runs password hashing and verification on a bounded pool of processes.
+
+    PBKDF2 is CPU bound: run on the request workers, a burst of logins or signups delays every other
+    request they serve. With `workers` > 0 the work is sent to that many processes, and at most
+    `max_pending` hashing calls may wait for them at a time, the callers over that bound blocking until
+    a slot frees up. With `workers` = 0 everything runs inline, as Django does by default.
+
+    Attributes:
+        workers (int): The number of processes, 0 to hash on the calling thread.
+        max_pending (int): The number of hashing calls submitted to the pool at a time.
+
+    Methods:
+        - make_password(password): Returns the encoded hash of a password.
+        - verify_password(password, encoded): Returns whether the password matches the encoded hash,
+            and whether the hash should be upgraded to the preferred hasher settings.
+        - shutdown(): Stops the processes of the pool.
+    """
+
+    def __init__(self, workers, max_pending, initializer=None, initargs=()):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.initializer = initializer
+        self.initargs = initargs
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max(max_pending, 1))
+        self._executor = None
+
+    @property
+    def executor(self):
+        with self._lock:
+            if self._executor is None:
+                # Forking a threaded request worker could copy locks held by its other threads
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(self.initializer, self.initargs),
+                )
+            return self._executor
+
+    def run(self, function, *args):
+        if self.workers <= 0:
+            return function(*args)
+        with self._slots:
+            return self.executor.submit(function, *args).result()
+
+    def make_password(self, password):
+        return self.run(_make_password, password)
+
+    def verify_password(self, password, encoded):
+        return self.run(_verify_password, password, encoded)
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+
+password_pool = PasswordHashingPool(
+    settings.SOFTDESK_PASSWORD_HASHING_WORKERS,
+    settings.SOFTDESK_PASSWORD_HASHING_MAX_PENDING,
+)
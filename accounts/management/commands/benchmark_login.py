@@ -0,0 +1,178 @@
+import os
+import statistics
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model, hashers
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.test import Client
+from django.test.utils import (
+    override_settings,
+    setup_test_environment,
+    teardown_test_environment,
+)
+
+from accounts import hashing
+
+# Also imported by the pool processes to unpickle configure_hasher, before Django is set up: models
+# must not be imported at module level
+BENCHMARK_HASHER = (
+    "accounts.management.commands.benchmark_login.BenchmarkPasswordHasher"
+)
+
+
+class BenchmarkPasswordHasher(hashers.PBKDF2PasswordHasher):
+    """PBKDF2 with the iteration count under benchmark."""
+
+
+def configure_hasher(iterations):
+    """Hash with BenchmarkPasswordHasher at the given iteration count, in the pool processes too."""
+    BenchmarkPasswordHasher.iterations = iterations
+    settings.PASSWORD_HASHERS = [BENCHMARK_HASHER]
+    hashers.get_hashers.cache_clear()
+    hashers.get_hashers_by_algorithm.cache_clear()
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+class Command(BaseCommand):
+    """
+    Measure the throughput of the login endpoint for several hasher iteration counts, with passwords
+    verified inline and on the password hashing pool.
+
+    Each run logs in `--requests` times from `--concurrency` threads through the WSGI handler, against
+    a throwaway test database. A probe thread meanwhile sends requests that do no hashing, to show how
+    much the logins delay the rest of the traffic served by the same worker.
+    """
+
+    help = "Benchmark login throughput for different password hasher settings."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--iterations",
+            default="10000,100000,%d" % hashers.PBKDF2PasswordHasher.iterations,
+            help="Comma separated PBKDF2 iteration counts.",
+        )
+        parser.add_argument(
+            "--workers",
+            default="0,%d" % (os.cpu_count() or 1),
+            help="Comma separated pool sizes, 0 verifying passwords inline.",
+        )
+        parser.add_argument("--concurrency", type=int, default=8)
+        parser.add_argument("--requests", type=int, default=64)
+
+    def handle(self, *args, **options):
+        iteration_counts = [int(value) for value in options["iterations"].split(",")]
+        pool_sizes = [int(value) for value in options["workers"].split(",")]
+        concurrency = options["concurrency"]
+        User = get_user_model()
+
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        default_pool = hashing.password_pool
+        try:
+            self.stdout.write(
+                "%10s %8s %10s %10s %10s %12s"
+                % ("iterations", "workers", "logins/s", "p50 ms", "p99 ms", "probe p99")
+            )
+            for iterations in iteration_counts:
+                with override_settings(PASSWORD_HASHERS=[BENCHMARK_HASHER]):
+                    configure_hasher(iterations)
+                    User.objects.all().delete()
+                    encoded = hashers.make_password("benchmark-password")
+                    User.objects.bulk_create(
+                        User(username="benchmark-%d" % index, password=encoded)
+                        for index in range(concurrency)
+                    )
+                    for workers in pool_sizes:
+                        hashing.password_pool = hashing.PasswordHashingPool(
+                            workers,
+                            settings.SOFTDESK_PASSWORD_HASHING_MAX_PENDING,
+                            initializer=configure_hasher,
+                            initargs=(iterations,),
+                        )
+                        try:
+                            self.warm_up(hashing.password_pool)
+                            result = self.run(concurrency, options["requests"])
+                        finally:
+                            hashing.password_pool.shutdown()
+                        self.stdout.write(
+                            "%10d %8d %10.1f %10.1f %10.1f %12.1f"
+                            % ((iterations, workers) + result)
+                        )
+        finally:
+            hashing.password_pool = default_pool
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+    @staticmethod
+    def warm_up(pool):
+        """Start the pool processes before timing, so that their startup is not measured."""
+        threads = [
+            threading.Thread(target=pool.make_password, args=("warm-up",))
+            for _ in range(max(pool.workers, 1))
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    def run(self, concurrency, requests):
+        latencies = []
+        probe_latencies = []
+        errors = []
+        done = threading.Event()
+
+        def login(index, count):
+            client = Client()
+            body = {
+                "username": "benchmark-%d" % index,
+                "password": "benchmark-password",
+            }
+            for _ in range(count):
+                start = time.perf_counter()
+                response = client.post("/login/", body, content_type="application/json")
+                latencies.append(time.perf_counter() - start)
+                if response.status_code != 200:
+                    errors.append(response.status_code)
+                    break
+            connections.close_all()
+
+        def probe():
+            client = Client()
+            while not done.is_set():
+                start = time.perf_counter()
+                client.get("/projects/")
+                probe_latencies.append(time.perf_counter() - start)
+                time.sleep(0.005)
+            connections.close_all()
+
+        per_thread = max(requests // concurrency, 1)
+        threads = [
+            threading.Thread(target=login, args=(index, per_thread))
+            for index in range(concurrency)
+        ]
+        prober = threading.Thread(target=probe)
+        prober.start()
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        done.set()
+        prober.join()
+        if errors:
+            raise CommandError("Logins failed with status %s." % errors[0])
+
+        return (
+            len(latencies) / elapsed,
+            statistics.median(latencies) * 1000,
+            percentile(latencies, 0.99) * 1000,
+            percentile(probe_latencies, 0.99) * 1000,
+        )
@@ -1,9 +1,17 @@
-from rest_framework import serializers
+from rest_framework import exceptions, serializers
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework_simplejwt.settings import api_settings
+from Softdesk.fieldsets import SparseFieldsetMixin
+from Softdesk.instrumentation import TimedRepresentationMixin
+from . import hashing
 from .models import User
+from django.contrib.auth.models import update_last_login
 from django.contrib.auth.password_validation import validate_password
 
 
-class RegisterSerializer(serializers.ModelSerializer):
+class RegisterSerializer(
+    TimedRepresentationMixin, SparseFieldsetMixin, serializers.ModelSerializer
+):
     """
     Serializer for user registration.
 
@@ -62,12 +70,11 @@ class RegisterSerializer(serializers.ModelSerializer):
             User: The newly created User instance.
         """
         del validated_data["password2"]
-        user = User.objects.create(**validated_data)
-
-        user.set_password(validated_data["password"])
-        user.save()
-
-        return user
+        # Hash first so that the user is written with a single INSERT
+        validated_data["password"] = hashing.password_pool.make_password(
+            validated_data["password"]
+        )
+        return User.objects.create(**validated_data)
 
     def validate_age(self, value):
         """
@@ -87,7 +94,9 @@ class RegisterSerializer(serializers.ModelSerializer):
         return value
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(
+    TimedRepresentationMixin, SparseFieldsetMixin, serializers.ModelSerializer
+):
     """
     Serializer for user details.
 
@@ -96,6 +105,8 @@ class UserSerializer(serializers.ModelSerializer):
     privacy choices.
     """
 
+    sparse_required_fields = ("can_be_contacted", "can_data_be_shared")
+
     class Meta:
         model = User
         fields = ["id", "username", "age", "email", "first_name", "last_name"]
@@ -112,17 +123,79 @@ class UserSerializer(serializers.ModelSerializer):
         """
         """Take into account privacy choices of the users"""
         data = super().to_representation(instance)
+        hidden = []
         if not instance.can_be_contacted:
-            data["email"] = None
+            hidden.append("email")
         if not instance.can_data_be_shared:
-            data["username"] = None
-            data["age"] = None
-            data["first_name"] = None
-            data["last_name"] = None
+            hidden += ["username", "age", "first_name", "last_name"]
+        for name in hidden:
+            # Left out of a sparse fieldset
+            if name in data:
+                data[name] = None
         return data
 
 
-class UserListSerializer(serializers.ModelSerializer):
+class UserListSerializer(
+    TimedRepresentationMixin, SparseFieldsetMixin, serializers.ModelSerializer
+):
     class Meta:
         model = User
         fields = ["id", "username", "age"]
+
+
+class LoginSerializer(TokenObtainPairSerializer):
+    """
+    Serializer for user login, returning a pair of JWT tokens.
+
+    It behaves like TokenObtainPairSerializer, but verifies the password through the password hashing
+    pool instead of Django's authentication backends, so that the hashing can run off the request
+    worker.
+    """
+
+    def validate(self, attrs):
+        """
+        Check the credentials and issue the tokens.
+
+        Args:
+            attrs (dict): The username and password.
+
+        Returns:
+            dict: The refresh and access tokens.
+
+        Raises:
+            AuthenticationFailed: If the credentials are wrong or the account is inactive.
+        """
+        self.user = self.authenticate(attrs[self.username_field], attrs["password"])
+        if not api_settings.USER_AUTHENTICATION_RULE(self.user):
+            raise exceptions.AuthenticationFailed(
+                self.error_messages["no_active_account"], "no_active_account"
+            )
+
+        refresh = self.get_token(self.user)
+        data = {"refresh": str(refresh), "access": str(refresh.access_token)}
+        if api_settings.UPDATE_LAST_LOGIN:
+            update_last_login(None, self.user)
+        return data
+
+    def authenticate(self, username, password):
+        """
+        Return the user matching the credentials, or None.
+
+        Like Django's ModelBackend, an unknown username still costs a password hash so that it cannot
+        be told apart from a wrong password by timing, and a hash made with outdated hasher settings is
+        upgraded on a successful login.
+        """
+        try:
+            user = User._default_manager.get_by_natural_key(username)
+        except User.DoesNotExist:
+            hashing.password_pool.make_password(password)
+            return None
+        valid, must_update = hashing.password_pool.verify_password(
+            password, user.password
+        )
+        if not valid:
+            return None
+        if must_update:
+            user.password = hashing.password_pool.make_password(password)
+            user.save(update_fields=["password"])
+        return user
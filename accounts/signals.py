@@ -0,0 +1,14 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .authentication import user_cache
+from .models import User
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def user_changed(sender, instance, **kwargs):
+    user_cache.invalidate(instance.pk)
+    # A request may have cached the old fields while the write was not committed yet
+    transaction.on_commit(lambda: user_cache.invalidate(instance.pk))
@@ -1,3 +1,131 @@
-# from django.test import TestCase
+from django.test import TestCase
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import AccessToken
 
-# Create your tests here.
+from Softdesk import benchmarks
+from Softdesk.benchmarks import Endpoint
+
+from .authentication import CachedJWTAuthentication, UserCache, user_cache
+from .models import User
+
+# The password of the users of the benchmark dataset
+PASSWORD = "softdesk-dataset"
+
+
+def signup(values):
+    return {
+        "username": "signup-%d" % values["request"],
+        "password": "Benchmark-password-42",
+        "password2": "Benchmark-password-42",
+        "age": 30,
+        "can_be_contacted": True,
+        "can_data_be_shared": False,
+        "email": "signup-%d@example.com" % values["request"],
+        "first_name": "Bench",
+        "last_name": "Mark",
+    }
+
+
+class AccountsEndpointBenchmark(benchmarks.BenchmarkTestCase):
+    urlconf = "accounts.urls"
+    endpoints = [
+        Endpoint(
+            "signup",
+            "post",
+            "/signup/",
+            2,
+            data=signup,
+            user=None,
+            status=201,
+        ),
+        Endpoint(
+            "login",
+            "post",
+            "/login/",
+            2,
+            data=lambda values: {
+                "username": values["author_username"],
+                "password": PASSWORD,
+            },
+            user=None,
+        ),
+        Endpoint(
+            "token_refresh",
+            "post",
+            "/refresh/",
+            0,
+            data=lambda values: {"refresh": values["refresh"]},
+            user=None,
+        ),
+        Endpoint("user-list", "get", "/users/", 3),
+        Endpoint("user-detail", "get", "/users/{author}/", 2),
+        Endpoint(
+            "user-detail",
+            "patch",
+            "/users/{author}/",
+            4,
+            data={"first_name": "Benchmark"},
+        ),
+    ]
+
+
+class UserCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username="cached", first_name="Cached")
+
+    def setUp(self):
+        user_cache.clear()
+        self.token = AccessToken.for_user(self.user)
+
+    def authenticate(self):
+        return CachedJWTAuthentication().get_user(self.token)
+
+    def test_users_are_read_once(self):
+        with self.assertNumQueries(1):
+            self.authenticate()
+        with self.assertNumQueries(0):
+            user = self.authenticate()
+        self.assertEqual((user.pk, user.username), (self.user.pk, "cached"))
+        # The other fields are deferred, not lost
+        with self.assertNumQueries(1):
+            self.assertEqual(user.first_name, "Cached")
+
+    def test_saving_a_user_drops_its_entry(self):
+        self.authenticate()
+        user = User.objects.get(pk=self.user.pk)
+        user.is_active = False
+        user.save()
+        with self.assertNumQueries(1), self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+    def test_deleting_a_user_drops_its_entry(self):
+        self.authenticate()
+        User.objects.get(pk=self.user.pk).delete()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+    def test_requests_of_a_deactivated_user_are_rejected(self):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION="Bearer %s" % self.token)
+        self.assertEqual(client.get("/users/").status_code, 200)
+        user = User.objects.get(pk=self.user.pk)
+        user.is_active = False
+        user.save()
+        self.assertEqual(client.get("/users/").status_code, 401)
+
+    def test_the_cache_is_bounded_and_entries_expire(self):
+        cache = UserCache(max_size=2, ttl=60)
+        for user_id in (1, 2, 3):
+            cache.set(user_id, (user_id,))
+        self.assertIsNone(cache.get(1))
+        self.assertEqual(cache.get(3), (3,))
+
+        cache = UserCache(max_size=2, ttl=-1)
+        cache.set(1, (1,))
+        self.assertIsNone(cache.get(1))
+
+        cache = UserCache(max_size=0, ttl=60)
+        cache.set(1, (1,))
+        self.assertIsNone(cache.get(1))
@@ -1,9 +1,8 @@
 from django.urls import path, include
-from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
+from rest_framework_simplejwt.views import TokenRefreshView
 from rest_framework_nested import routers
 
-from accounts.views import RegisterView, UserViewSet
-
+from accounts.views import LoginView, RegisterView, UserViewSet
 
 router = routers.SimpleRouter()
 
@@ -13,7 +12,7 @@ users_router = routers.NestedSimpleRouter(router, r"users", lookup="user")
 
 urlpatterns = [
     path("signup/", RegisterView.as_view(), name="signup"),
-    path("login/", TokenObtainPairView.as_view(), name="login"),
+    path("login/", LoginView.as_view(), name="login"),
     path("refresh/", TokenRefreshView.as_view(), name="token_refresh"),
     path("", include(users_router.urls)),
     path("", include(router.urls)),
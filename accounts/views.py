@@ -1,10 +1,12 @@
 from .models import User
 from rest_framework import generics
 from rest_framework.permissions import IsAuthenticated
-from accounts.serializers import RegisterSerializer, UserSerializer
+from accounts.serializers import LoginSerializer, RegisterSerializer, UserSerializer
 from rest_framework.viewsets import ModelViewSet
 from rest_framework import status
 from rest_framework.response import Response
+from rest_framework_simplejwt.views import TokenObtainPairView
+from Softdesk.fieldsets import SparseQuerysetMixin
 
 
 class RegisterView(generics.CreateAPIView):
@@ -12,7 +14,11 @@ class RegisterView(generics.CreateAPIView):
     serializer_class = RegisterSerializer
 
 
-class UserViewSet(ModelViewSet):
+class LoginView(TokenObtainPairView):
+    serializer_class = LoginSerializer
+
+
+class UserViewSet(SparseQuerysetMixin, ModelViewSet):
     permission_classes = [IsAuthenticated]
     queryset = User.objects.all()
     serializer_class = UserSerializer
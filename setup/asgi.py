@@ -13,4 +13,9 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'setup.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Imported once the applications are loaded: the event streams are served in front of Django
+from Softdesk.events import EventStreamDispatcher  # noqa: E402
+
+application = EventStreamDispatcher(django_application)
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/3.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 from datetime import timedelta
 
@@ -48,6 +49,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # First, so that it measures the whole request
+    "Softdesk.instrumentation.InstrumentationMiddleware",
+    "Softdesk.profiling.ProfilingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -88,6 +92,57 @@ DATABASES = {
     }
 }
 
+# Database profile, "production" tunes SQLite for concurrent requests
+SOFTDESK_DB_PROFILE = os.environ.get("SOFTDESK_DB_PROFILE", "development")
+
+# PRAGMAs applied to every new SQLite connection
+SOFTDESK_SQLITE_PRAGMAS = {}
+
+# Run the creations of the API one at a time on a writer thread per process, with retries
+SOFTDESK_WRITE_QUEUE = False
+SOFTDESK_WRITE_QUEUE_RETRIES = 5
+SOFTDESK_WRITE_QUEUE_BACKOFF = 0.05
+
+# Share of the requests measured by InstrumentationMiddleware, from 0 (none) to 1 (all)
+SOFTDESK_INSTRUMENTATION_SAMPLE_RATE = 1.0
+
+# Let superusers profile single requests with `X-Profile: 1` or `?profile=1`
+SOFTDESK_PROFILING = os.environ.get("SOFTDESK_PROFILING", "") == "1"
+# Directory of the profile dumps, and the number of dumps kept there
+SOFTDESK_PROFILE_DIR = BASE_DIR / "profiles"
+SOFTDESK_PROFILE_RING_SIZE = 50
+
+if SOFTDESK_DB_PROFILE == "production":
+    DATABASES["default"]["CONN_MAX_AGE"] = 600
+    SOFTDESK_SQLITE_PRAGMAS = {
+        # Readers no longer block the writer, nor the writer the readers
+        "journal_mode": "WAL",
+        # Durable at checkpoints only, safe from corruption in WAL mode
+        "synchronous": "NORMAL",
+        # Milliseconds waited for a lock before failing with "database is locked"
+        "busy_timeout": 5000,
+        "mmap_size": 256 * 1024 * 1024,
+    }
+    SOFTDESK_WRITE_QUEUE = True
+    SOFTDESK_INSTRUMENTATION_SAMPLE_RATE = 0.01
+
+
+# Cache
+# https://docs.djangoproject.com/en/3.2/topics/cache/
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "softdesk",
+        "OPTIONS": {"MAX_ENTRIES": 10000},
+    },
+}
+
+# Cache of the serialized project, issue and comment detail payloads
+SOFTDESK_DETAIL_CACHE_ALIAS = "default"
+SOFTDESK_DETAIL_CACHE_TIMEOUT = 300
+SOFTDESK_DETAIL_CACHE_TRACKED_KEYS = 10000
+
 
 # Password validation
 # https://docs.djangoproject.com/en/3.2/ref/settings/#auth-password-validators
@@ -136,10 +191,78 @@ REST_FRAMEWORK = {
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.LimitOffsetPagination",
     "PAGE_SIZE": 10,
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "accounts.authentication.CachedJWTAuthentication",
+    ),
+    # orjson when it is installed, DRF's stdlib JSON otherwise
+    "DEFAULT_RENDERER_CLASSES": (
+        "Softdesk.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "Softdesk.parsers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
     ),
 }
 
+# Number of users whose authentication fields are cached per process, 0 disables the cache
+SOFTDESK_AUTH_USER_CACHE_SIZE = 10000
+
+# Lifetime of a cached user, in seconds, bounding staleness across processes and after writes that
+# send no signal, such as queryset.update()
+SOFTDESK_AUTH_USER_CACHE_TTL = 60
+
+# Number of processes hashing and verifying passwords for signup and login, 0 to hash inline
+SOFTDESK_PASSWORD_HASHING_WORKERS = 0
+
+# Number of hashing calls that may be submitted to the processes at a time, the others wait
+SOFTDESK_PASSWORD_HASHING_MAX_PENDING = 32
+
+# Maximum number of issues embedded in a project detail response, the rest is paginated
+SOFTDESK_EMBEDDED_ISSUES_LIMIT = 20
+
+# Number of latest comments embedded in an issue detail response
+SOFTDESK_EMBEDDED_COMMENTS_LIMIT = 20
+
+# Number of rows fetched at a time by the streaming endpoints
+SOFTDESK_STREAM_CHUNK_SIZE = 2000
+
+# Largest number of rows accepted by one bulk import and the size of its insert batches
+SOFTDESK_BULK_IMPORT_MAX_ROWS = 50000
+SOFTDESK_BULK_BATCH_SIZE = 1000
+
+# Largest number of issues changed by one bulk transition
+SOFTDESK_BULK_TRANSITION_MAX_ROWS = 1000
+
+# How long, in seconds, the precomputed statistics of a project are served after its issues changed
+SOFTDESK_STATS_ROLLUP_MAX_AGE = 300
+
+# Largest number of changes returned by one sync request, also the default
+SOFTDESK_SYNC_PAGE_SIZE = 500
+
+# Events kept in memory for the event stream clients that reconnect with Last-Event-ID
+SOFTDESK_EVENTS_REPLAY_SIZE = 1000
+# Events queued for a slow event stream client before its stream is closed, for it to resume
+SOFTDESK_EVENTS_QUEUE_SIZE = 100
+# Seconds between the keepalive comments sent on idle event streams
+SOFTDESK_EVENTS_KEEPALIVE = 15
+# Seconds the events of a stream are still kept after it closed, for its client to resume it
+SOFTDESK_EVENTS_RESUME_WINDOW = 60
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {"console": {"class": "logging.StreamHandler"}},
+    "loggers": {
+        # One JSON record per sampled request
+        "Softdesk.instrumentation": {
+            "handlers": ["console"],
+            "level": "INFO",
+            "propagate": False,
+        },
+    },
+}
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=500),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),